@@ -84,7 +84,84 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 REST_FRAMEWORK = {
-    'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+    'DEFAULT_RENDERER_CLASSES': ['tarot.renderers.FastJSONRenderer'],
     'DEFAULT_AUTHENTICATION_CLASSES': [],
     'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.AllowAny'],
 }
+
+# Pre-shuffled deck pool (see tarot/pool.py)
+TAROT_SHUFFLE_POOL = {
+    'ENABLED': os.environ.get('TAROT_SHUFFLE_POOL_ENABLED', 'True') == 'True',
+    'SIZE': int(os.environ.get('TAROT_SHUFFLE_POOL_SIZE', '32')),
+    'LOW_WATER': int(os.environ.get('TAROT_SHUFFLE_POOL_LOW_WATER', '8')),
+    'REFILL_THREADS': int(os.environ.get('TAROT_SHUFFLE_POOL_THREADS', '1')),
+}
+
+# POST /api/readings/batch/: most readings per request, and per transaction
+TAROT_READING_BATCH_MAX = int(os.environ.get('TAROT_READING_BATCH_MAX', '5000'))
+TAROT_READING_BATCH_CHUNK = int(os.environ.get('TAROT_READING_BATCH_CHUNK', '500'))
+
+# Per-process cache of each deck's cards (see tarot/catalog.py).
+# SHARED_VERSION invalidates it across processes through CACHES, which must
+# then be a shared backend; unset, it is on exactly when CACHES is shared.
+# With the default local-memory CACHES it is off, so edits made from another
+# process (seed_deck, the admin in another worker) reach running servers
+# only when they restart; until then catalog ETags keep matching old data.
+TAROT_CATALOG_CACHE = {
+    'ENABLED': os.environ.get('TAROT_CATALOG_CACHE_ENABLED', 'True') == 'True',
+    'SHARED_VERSION': (
+        os.environ['TAROT_CATALOG_SHARED_VERSION'] == 'True'
+        if 'TAROT_CATALOG_SHARED_VERSION' in os.environ else None
+    ),
+}
+
+# Default shuffle generator (see tarot/rng.py): 'mersenne' readings can be
+# redrawn from their seed, 'system' uses the OS CSPRNG. Decks can override.
+TAROT_SHUFFLE_RNG = os.environ.get('TAROT_SHUFFLE_RNG', 'mersenne')
+
+# Write a ReadingCard row per drawn card. Readings also store the seed they
+# were drawn with, so high-volume deployments can turn this off and let
+# the detail endpoint redraw the cards instead.
+TAROT_PERSIST_READING_CARDS = os.environ.get('TAROT_PERSIST_READING_CARDS', 'True') == 'True'
+
+# Store each finished reading's rendered response and serve it from there
+# (see tarot/snapshots.py). Only readings whose ReadingCard rows are stored
+# get one, so with TAROT_PERSIST_READING_CARDS off, seeded readings are
+# redrawn on every request rather than snapshotted.
+TAROT_READING_SNAPSHOTS = os.environ.get('TAROT_READING_SNAPSHOTS', 'True') == 'True'
+
+# Background interpretation queue (see tarot/jobs.py). When enabled, readings
+# return with interpretations pending until run_interpretation_worker fills them.
+TAROT_INTERPRETATION_QUEUE = {
+    'ENABLED': os.environ.get('TAROT_INTERPRETATION_QUEUE_ENABLED', 'False') == 'True',
+    'INTERPRETER': os.environ.get('TAROT_INTERPRETER', 'tarot.readings.interpret_stub'),
+    'CONCURRENCY': int(os.environ.get('TAROT_INTERPRETATION_CONCURRENCY', '2')),
+    'MAX_ATTEMPTS': int(os.environ.get('TAROT_INTERPRETATION_MAX_ATTEMPTS', '3')),
+    'RETRY_DELAY': float(os.environ.get('TAROT_INTERPRETATION_RETRY_DELAY', '5')),
+    'LEASE': float(os.environ.get('TAROT_INTERPRETATION_LEASE', '300')),
+    'POLL_INTERVAL': 1.0,
+}
+
+# LRU + Postgres cache in front of the interpreter (see tarot/interpretation_cache.py)
+TAROT_INTERPRETATION_CACHE = {
+    'ENABLED': os.environ.get('TAROT_INTERPRETATION_CACHE_ENABLED', 'False') == 'True',
+    'LRU_SIZE': int(os.environ.get('TAROT_INTERPRETATION_CACHE_LRU_SIZE', '2048')),
+    'MAX_ROWS': int(os.environ.get('TAROT_INTERPRETATION_CACHE_MAX_ROWS', '100000')),
+    'PRUNE_EVERY': 200,
+}
+
+# Local LLM for interpretations (see tarot/ollama.py); used when TAROT_INTERPRETER
+# is 'tarot.ollama.interpret'
+TAROT_OLLAMA = {
+    'URL': os.environ.get('OLLAMA_URL', 'http://ollama:11434'),
+    'MODEL': os.environ.get('OLLAMA_MODEL', 'mistral'),
+    'TIMEOUT': float(os.environ.get('OLLAMA_TIMEOUT', '120')),
+}
+
+# GET /api/readings/<id>/stream/ (see tarot/streaming.py)
+TAROT_READING_STREAM = {
+    'KEEPALIVE': float(os.environ.get('TAROT_STREAM_KEEPALIVE', '15')),
+    'BUFFER_TOKENS': int(os.environ.get('TAROT_STREAM_BUFFER_TOKENS', '256')),
+    'POLL_INTERVAL': 0.5,
+    'RETRY_MS': 2000,
+}
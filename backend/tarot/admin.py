@@ -1,10 +1,13 @@
 from django.contrib import admin
-from .models import Deck, Card, Spread, SpreadPosition, Reading, ReadingCard
+from .models import (
+    Deck, Card, Spread, SpreadPosition, Reading, ReadingCard, InterpretationJob,
+    CachedInterpretation, ReadingSnapshot,
+)
 
 
 @admin.register(Deck)
 class DeckAdmin(admin.ModelAdmin):
-    list_display = ('name', 'created_at')
+    list_display = ('name', 'shuffle_rng', 'created_at')
     search_fields = ('name',)
 
 
@@ -35,7 +38,7 @@ class SpreadPositionAdmin(admin.ModelAdmin):
 class ReadingCardInline(admin.TabularInline):
     model = ReadingCard
     extra = 0
-    readonly_fields = ('card', 'position', 'is_reversed', 'interpretation')
+    readonly_fields = ('card', 'position', 'is_reversed', 'interpretation', 'interpretation_status')
 
 
 @admin.register(Reading)
@@ -51,5 +54,26 @@ class ReadingAdmin(admin.ModelAdmin):
 
 @admin.register(ReadingCard)
 class ReadingCardAdmin(admin.ModelAdmin):
-    list_display = ('reading', 'card', 'position', 'is_reversed')
-    list_filter = ('is_reversed', 'position__spread')
+    list_display = ('reading', 'card', 'position', 'is_reversed', 'interpretation_status')
+    list_filter = ('is_reversed', 'interpretation_status', 'position__spread')
+
+
+@admin.register(InterpretationJob)
+class InterpretationJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'reading_card', 'status', 'attempts', 'run_after', 'updated_at')
+    list_filter = ('status',)
+    readonly_fields = ('reading_card', 'last_error', 'created_at', 'updated_at')
+
+
+@admin.register(CachedInterpretation)
+class CachedInterpretationAdmin(admin.ModelAdmin):
+    list_display = ('key', 'interpreter_version', 'hits', 'last_used_at')
+    list_filter = ('interpreter_version',)
+    readonly_fields = ('key', 'interpreter_version', 'hits', 'created_at', 'last_used_at')
+
+
+@admin.register(ReadingSnapshot)
+class ReadingSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('reading', 'version', 'created_at')
+    list_filter = ('version',)
+    readonly_fields = ('reading', 'version', 'body', 'compact_body', 'created_at')
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TarotConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tarot'
+
+    def ready(self):
+        # Connect the catalog cache's invalidation receivers
+        from . import catalog  # noqa: F401
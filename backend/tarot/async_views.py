@@ -0,0 +1,137 @@
+"""
+Async versions of the reading create and detail endpoints, for serving
+under ASGI (config/asgi.py).
+
+They take and return the same bodies as ReadingCreateView and
+ReadingDetailView, but are plain Django async views. Lookups use the async
+ORM. The shuffle and the transactional write run in worker threads, so
+the event loop is never blocked while a request waits on them.
+
+    POST /api/async/readings/
+    GET  /api/async/readings/<id>/
+
+Finished readings are served from their snapshot (see tarot/snapshots.py).
+
+reading_stream serves GET /api/readings/<id>/stream/ (see tarot/streaming.py).
+It needs ASGI: under WSGI the whole stream is buffered before it is sent.
+"""
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+
+from .catalog import get_deck_catalog
+from .fast_serializers import reading_data
+from .http_cache import (
+    IMMUTABLE,
+    NO_CACHE,
+    if_none_match,
+    make_etag,
+    not_modified,
+    set_cache_headers,
+    variant,
+)
+from .models import Deck, Spread, Reading
+from .pool import get_shuffle_pool
+from .readings import drawn_cards_for, save_reading, shuffle_for_reading
+from .renderers import FastJSONRenderer
+from .serializers import ReadingRequestSerializer, deck_spread_mismatch
+from .shuffle import DeckChangedError
+from .snapshots import SNAPSHOT_VERSION, aget_snapshot_body, is_finished
+from .streaming import parse_last_event_id, reading_events
+from .views import DeckChanged
+
+
+def _json(data, status: int = 200) -> HttpResponse:
+    # Rendered as the DRF views render, so both paths return identical bodies
+    return HttpResponse(FastJSONRenderer().render(data), content_type='application/json', status=status)
+
+
+@csrf_exempt
+@require_POST
+async def reading_create(request):
+    try:
+        payload = json.loads(request.body)
+    except ValueError as exc:
+        return _json({'detail': f'JSON parse error - {exc}'}, status=400)
+
+    request_serializer = ReadingRequestSerializer(data=payload)
+    if not request_serializer.is_valid():
+        return _json(request_serializer.errors, status=400)
+    data = request_serializer.validated_data
+
+    deck = await Deck.objects.annotate(card_count=Count('cards')).filter(id=data['deck_id']).afirst()
+    spread = await Spread.objects.prefetch_related('positions').filter(id=data['spread_id']).afirst()
+    errors = {}
+    if deck is None:
+        errors['deck_id'] = ['Deck not found.']
+    if spread is None:
+        errors['spread_id'] = ['Spread not found.']
+    if not errors:
+        mismatch = deck_spread_mismatch(deck, spread)
+        if mismatch:
+            errors['non_field_errors'] = [mismatch]
+    if errors:
+        return _json(errors, status=400)
+
+    catalog = await sync_to_async(get_deck_catalog)(deck.id)
+    reading = Reading(deck=deck, spread=spread, question=data['question'])
+    drawn = await asyncio.to_thread(shuffle_for_reading, reading, catalog, get_shuffle_pool())
+    await sync_to_async(save_reading)(reading, catalog, drawn)
+
+    return _json(reading_data(reading), status=201)
+
+
+@require_GET
+async def reading_detail(request, pk: int):
+    etag = make_etag('reading', pk, SNAPSHOT_VERSION, variant('application/json'))
+    if if_none_match(request, etag, exists=False):
+        return not_modified(etag, IMMUTABLE)
+
+    body = await aget_snapshot_body(pk)
+    if body is not None:
+        if if_none_match(request, etag):
+            return not_modified(etag, IMMUTABLE)
+        return set_cache_headers(HttpResponse(body, content_type='application/json'), etag, IMMUTABLE)
+
+    reading = await (
+        Reading.objects
+        .select_related('deck', 'spread')
+        .prefetch_related('spread__positions', 'cards__card', 'cards__position')
+        .filter(pk=pk)
+        .afirst()
+    )
+    if reading is None:
+        return _json({'detail': 'No Reading matches the given query.'}, status=404)
+
+    try:
+        await sync_to_async(drawn_cards_for)(reading)
+    except DeckChangedError:
+        return _json({'detail': DeckChanged.default_detail}, status=409)
+    if is_finished(reading):
+        if if_none_match(request, etag):
+            return not_modified(etag, IMMUTABLE)
+        return set_cache_headers(_json(reading_data(reading)), etag, IMMUTABLE)
+    return set_cache_headers(_json(reading_data(reading)), None, NO_CACHE)
+
+
+@require_GET
+async def reading_stream(request, pk: int):
+    reading = await Reading.objects.select_related('deck', 'spread').filter(pk=pk).afirst()
+    if reading is None:
+        return _json({'detail': 'No Reading matches the given query.'}, status=404)
+
+    # EventSource sends Last-Event-ID when it reconnects; the query
+    # parameter lets a fresh connection resume too
+    resume = parse_last_event_id(
+        request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    )
+    return StreamingHttpResponse(
+        reading_events(reading, resume),
+        content_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
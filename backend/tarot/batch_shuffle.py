@@ -0,0 +1,141 @@
+"""
+Vectorised version of the shuffle ritual, for running many decks at once.
+
+Decks are rows of a 2-D ``(n_decks, deck_size)`` array of card ids, with
+orientation held in a boolean matrix of the same shape. Every pass draws
+all of its random numbers for the whole batch up front and moves cards
+with NumPy gather/scatter, so there is no Python-level loop per deck.
+
+This is for fairness analysis and precomputation — the request path
+uses tarot/shuffle.py. Per-card results match that module statistically,
+not draw for draw.
+"""
+import numpy as np
+
+from .shuffle import RIFFLE_GSR, RIFFLE_MODES, RIFFLE_WEIGHTED, RITUAL
+
+
+def batch_overhand(cards: np.ndarray, reversed: np.ndarray, rng: np.random.Generator):
+    """
+    One overhand pass on every deck: 3–12 card packets taken from the top
+    and stacked in reverse, each with a 20% chance of being flipped.
+    """
+    n_decks, n = cards.shape
+    max_packets = -(-n // 3)
+    sizes = rng.integers(3, 13, size=(n_decks, max_packets), dtype=np.int32)
+    ends = np.cumsum(sizes, axis=1, dtype=np.int32)
+    starts = ends - sizes
+    flips = rng.random((n_decks, max_packets), dtype=np.float32) < 0.20
+
+    # Packet number for every position: count the packet starts at or before it
+    boundary = np.zeros((n_decks, n), dtype=np.int32)
+    rows, packets = np.nonzero((starts > 0) & (starts < n))
+    boundary[rows, starts[rows, packets]] = 1
+    packet = np.cumsum(boundary, axis=1, dtype=np.int32)
+
+    packet_start = _gather(starts, packet)
+    packet_end = np.minimum(_gather(ends, packet), n)
+    packet_flipped = _gather(flips, packet)
+
+    position = np.arange(n, dtype=np.int32)
+    dest = np.where(
+        packet_flipped,
+        packet_end - 1 - position,
+        position - packet_start,
+    )
+    dest += n - packet_end
+    return _scatter(cards, dest), _scatter(reversed ^ packet_flipped, dest)
+
+
+def batch_riffle(cards: np.ndarray, reversed: np.ndarray, rng: np.random.Generator,
+                 mode: str = RIFFLE_WEIGHTED):
+    """
+    One riffle pass on every deck. 'weighted' splits at the middle ±5
+    cards, 'gsr' splits binomially; either way the halves are interleaved
+    uniformly at random, which is what the weighted drop in
+    tarot/shuffle.py produces.
+    """
+    if mode not in RIFFLE_MODES:
+        raise ValueError(f'Unknown riffle mode {mode!r}.')
+    n_decks, n = cards.shape
+    if n < 4:
+        return cards.copy(), reversed.copy()
+
+    if mode == RIFFLE_GSR:
+        split = rng.binomial(n, 0.5, size=n_decks)
+    else:
+        split = np.clip(n // 2 + rng.integers(-5, 6, size=n_decks), 1, n - 1)
+    split = split.astype(np.int32)[:, None]
+
+    # The left half fills a uniformly random set of `split` output slots:
+    # the slots holding the `split` lowest-ranked of n random keys. Selecting
+    # by rank rather than comparing with the split-th key takes exactly
+    # `split` slots even when keys tie.
+    keys = rng.random((n_decks, n), dtype=np.float32)
+    order = np.argsort(keys, axis=1).astype(np.int32)
+    from_left = _scatter(np.broadcast_to(np.arange(n, dtype=np.int32) < split, (n_decks, n)), order)
+    source = np.where(
+        from_left,
+        np.cumsum(from_left, axis=1, dtype=np.int32) - 1,
+        split + np.cumsum(~from_left, axis=1, dtype=np.int32) - 1,
+    )
+    return _gather(cards, source), _gather(reversed, source)
+
+
+def batch_cut(cards: np.ndarray, reversed: np.ndarray, rng: np.random.Generator):
+    """Cut every deck at a random point in the middle 35–65% range."""
+    n_decks, n = cards.shape
+    if n < 4:
+        return cards.copy(), reversed.copy()
+
+    cut_point = rng.integers(int(n * 0.35), int(n * 0.65) + 1, size=(n_decks, 1), dtype=np.int32)
+    source = np.arange(n, dtype=np.int32) + cut_point
+    source[source >= n] -= n
+    return _gather(cards, source), _gather(reversed, source)
+
+
+def _row_offsets(n_decks: int, n: int) -> np.ndarray:
+    return (np.arange(n_decks, dtype=np.intp) * n)[:, None]
+
+
+def _gather(values: np.ndarray, index: np.ndarray) -> np.ndarray:
+    """Row-wise values[row, index[row, j]] — take_along_axis on a flat view."""
+    n_decks, n = values.shape
+    return values.ravel()[index + _row_offsets(n_decks, n)]
+
+
+def _scatter(values: np.ndarray, dest: np.ndarray) -> np.ndarray:
+    """Row-wise out[row, dest[row, j]] = values[row, j]."""
+    n_decks, n = values.shape
+    out = np.empty_like(values)
+    out.ravel()[dest + _row_offsets(n_decks, n)] = values
+    return out
+
+
+def batch_full_shuffle(card_ids, n_decks: int, riffle: str = RIFFLE_WEIGHTED,
+                       rng: np.random.Generator | None = None):
+    """
+    Run the full ritual (see tarot.shuffle.RITUAL) on n_decks copies of
+    the deck, all starting upright.
+
+    Returns ``(cards, reversed)``: an ``(n_decks, len(card_ids))`` array
+    of card ids in drawn order and a boolean matrix of orientations.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    card_ids = np.asarray(card_ids)
+    n = card_ids.size
+
+    # Shuffle positions rather than ids, then look the ids up once at the end
+    positions = np.broadcast_to(np.arange(n, dtype=np.int32), (n_decks, n)).copy()
+    reversed = np.zeros((n_decks, n), dtype=bool)
+
+    passes = {
+        'overhand': lambda p, r: batch_overhand(p, r, rng),
+        'riffle': lambda p, r: batch_riffle(p, r, rng, riffle),
+        'cut': lambda p, r: batch_cut(p, r, rng),
+    }
+    for name, repetitions in RITUAL:
+        for _ in range(repetitions):
+            positions, reversed = passes[name](positions, reversed)
+    return card_ids[positions], reversed
@@ -0,0 +1,193 @@
+"""
+Per-process cache of each deck's cards.
+
+Drawing a reading needs every card id in the deck but only a few full
+cards, and decks change rarely. DeckCatalog holds a deck's packed id deck
+and its Card records, built once per process and then shared by every
+reading until the catalog version moves on.
+
+With the cache disabled the draw runs in two phases instead: the catalog
+holds only the ids (one id-only query), and DeckCatalog.cards fetches the
+full rows for just the drawn ids (one in_bulk query).
+
+A cached catalog also memoises tables derived from its cards, such as the
+stub interpretations for each spread (see readings.stub_table), which go
+stale along with it.
+
+Saving or deleting a Card, Deck, Spread or SpreadPosition bumps the
+version once its transaction commits (see the receivers at the bottom).
+That reaches the current process directly. Other processes see it only
+if SHARED_VERSION is on: the version is then also kept under a key in
+Django's cache, which must be a shared backend (Redis, Memcached,
+database). Left as None, it is on exactly when CACHES['default'] is one.
+
+Without a shared version, edits made from another process (seed_deck, the
+admin in another worker, a shell) don't reach running servers until they
+restart: they keep drawing from the old cards and answer catalog ETags
+with 304s for the old data.
+
+Configured by the TAROT_CATALOG_CACHE setting:
+
+    TAROT_CATALOG_CACHE = {
+        'ENABLED': True,
+        'SHARED_VERSION': None,   # True, False, or None for "if CACHES is shared"
+    }
+"""
+import secrets
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Card, Deck, Spread, SpreadPosition
+from .shuffle import PackedDeck, build_deck, deck_fingerprint
+
+DEFAULTS = {
+    'ENABLED': True,
+    'SHARED_VERSION': None,
+}
+
+VERSION_CACHE_KEY = 'tarot:catalog-version'
+
+# Cache backends private to one process, which can't share the version
+PROCESS_LOCAL_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+class DeckCatalog:
+    """
+    A deck's card ids, ordered by primary key, packed for shuffling. Seeds
+    are replayed against this order, which `fingerprint` identifies (see
+    shuffle.deck_fingerprint).
+
+    A cached catalog also holds every Card record, and stub_tables holds
+    stub interpretation tables by spread id. Both are shared between
+    requests, so treat them as read-only.
+    """
+    __slots__ = ('deck_id', 'version', 'packed', 'fingerprint', 'stub_tables', '_by_id')
+
+    def __init__(self, deck_id: int, version, packed: PackedDeck,
+                 cards: list[Card] | None = None):
+        self.deck_id = deck_id
+        self.version = version
+        self.packed = packed
+        self.fingerprint = deck_fingerprint(packed)
+        self.stub_tables: dict[int, dict] = {}
+        self._by_id = None if cards is None else {card.id: card for card in cards}
+
+    @property
+    def cached(self) -> bool:
+        """Whether every Card record is held in memory."""
+        return self._by_id is not None
+
+    def all_cards(self) -> list[Card]:
+        """Every Card record in the deck; only for cached catalogs."""
+        return list(self._by_id.values())
+
+    def cards(self, ids) -> dict[int, Card]:
+        """The Card records for these ids, keyed by id."""
+        if self._by_id is None:
+            return Card.objects.in_bulk(list(ids))
+        return {card_id: self._by_id[card_id] for card_id in ids}
+
+    def __len__(self):
+        return len(self.packed)
+
+    def __repr__(self):
+        return f'DeckCatalog(deck {self.deck_id}, {len(self.packed)} cards, version {self.version})'
+
+
+_catalogs: dict[int, DeckCatalog] = {}
+_local_version = 0
+# Tells this process's local versions apart from other processes' and from
+# before a restart, which all count from 0
+_process_tag = secrets.token_hex(4)
+_lock = threading.Lock()
+
+
+def _config() -> dict:
+    return {**DEFAULTS, **getattr(settings, 'TAROT_CATALOG_CACHE', {})}
+
+
+def shared_version_enabled() -> bool:
+    """Whether the catalog version is shared with other processes through the cache."""
+    shared = _config()['SHARED_VERSION']
+    if shared is None:
+        return settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHES
+    return shared
+
+
+def catalog_version():
+    """The current catalog version; cached catalogs from other versions are stale."""
+    if shared_version_enabled():
+        cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+        return _local_version, cache.get(VERSION_CACHE_KEY, 0)
+    return _local_version
+
+
+def catalog_version_tag() -> str:
+    """
+    The catalog version as a string for HTTP ETags. Without SHARED_VERSION
+    it is only meaningful to this process, so other processes never match it.
+    """
+    if shared_version_enabled():
+        return str(catalog_version()[1])
+    return f'{_process_tag}.{_local_version}'
+
+
+def bump_catalog_version():
+    """Invalidate every cached catalog, in this process and (if shared) all others."""
+    global _local_version
+    with _lock:
+        _local_version += 1
+        _catalogs.clear()
+    if shared_version_enabled():
+        try:
+            cache.incr(VERSION_CACHE_KEY)
+        except ValueError:
+            # Key missing or evicted: any new value differs from what others hold
+            cache.set(VERSION_CACHE_KEY, 1, timeout=None)
+
+
+def get_deck_catalog(deck_id: int) -> DeckCatalog:
+    """The deck's catalog, from the cache if it is current."""
+    config = _config()
+    if not config['ENABLED']:
+        card_ids = Card.objects.filter(deck_id=deck_id).order_by('id').values_list('id', flat=True)
+        return DeckCatalog(deck_id, None, PackedDeck.from_ids(card_ids))
+    version = catalog_version()
+    catalog = _catalogs.get(deck_id)
+    if catalog is None or catalog.version != version:
+        # Read the version before loading, so a change that lands mid-load
+        # leaves this catalog already stale rather than cached as current
+        catalog = _catalogs[deck_id] = _load(deck_id, version)
+    return catalog
+
+
+def _load(deck_id: int, version) -> DeckCatalog:
+    cards = list(Card.objects.filter(deck_id=deck_id).order_by('id'))
+    return DeckCatalog(deck_id, version, build_deck(cards), cards)
+
+
+# ---------------------------------------------------------------------------
+# Invalidation
+# ---------------------------------------------------------------------------
+
+@receiver(post_save, sender=Card)
+@receiver(post_delete, sender=Card)
+@receiver(post_save, sender=Deck)
+@receiver(post_delete, sender=Deck)
+@receiver(post_save, sender=Spread)
+@receiver(post_delete, sender=Spread)
+@receiver(post_save, sender=SpreadPosition)
+@receiver(post_delete, sender=SpreadPosition)
+def _invalidate_catalogs(sender, using=None, **kwargs):
+    # Bump only once the change is visible to other connections. Bumping
+    # inside the transaction would let a concurrent load read the old rows
+    # under the new version and keep them as current.
+    transaction.on_commit(bump_catalog_version, using=using)
@@ -0,0 +1,84 @@
+"""
+The bootstrap catalog served at GET /api/catalog/: every deck, every
+spread with its positions, and every deck's cards, in one document:
+
+    {
+        "decks": [ ...as /api/decks/ ],
+        "spreads": [ ...as /api/spreads/ ],
+        "cards": { "<deck id>": [ ...as /api/decks/<id>/cards/ ] }
+    }
+
+The document is built once per catalog version (see catalog.py) and held
+in memory already encoded: plain, gzip and, if the brotli package is
+installed, brotli. Requests only pick an encoding.
+"""
+import gzip
+import threading
+from collections import defaultdict
+
+from .catalog import catalog_version_tag
+from .fast_serializers import card_data, deck_data, spread_data
+from .models import Card, Deck, Spread
+from .renderers import FastJSONRenderer
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+IDENTITY = 'identity'
+GZIP = 'gzip'
+BROTLI = 'br'
+
+
+class CatalogDocument:
+    __slots__ = ('version', 'bodies')
+
+    def __init__(self, version: str, body: bytes):
+        self.version = version
+        self.bodies = {
+            IDENTITY: body,
+            # mtime=0 keeps the bytes, and so the ETag, the same across processes
+            GZIP: gzip.compress(body, compresslevel=9, mtime=0),
+        }
+        if brotli is not None:
+            self.bodies[BROTLI] = brotli.compress(body, quality=11)
+
+    def __repr__(self):
+        sizes = ', '.join(f'{coding} {len(body)}' for coding, body in self.bodies.items())
+        return f'CatalogDocument(version {self.version}: {sizes} bytes)'
+
+
+_document: CatalogDocument | None = None
+_lock = threading.Lock()
+
+
+def available_encodings() -> list[str]:
+    """Content codings the document is held in, most compact first."""
+    return [BROTLI, GZIP] if brotli is not None else [GZIP]
+
+
+def get_catalog_document() -> CatalogDocument:
+    """The document for the current catalog version, built if need be."""
+    global _document
+    version = catalog_version_tag()
+    document = _document
+    if document is not None and document.version == version:
+        return document
+    with _lock:
+        if _document is None or _document.version != version:
+            # Like get_deck_catalog: the version is read before loading, so
+            # a change landing mid-build leaves this document already stale
+            _document = CatalogDocument(version, FastJSONRenderer().render(build_catalog()))
+        return _document
+
+
+def build_catalog() -> dict:
+    cards = defaultdict(list)
+    for card in Card.objects.order_by('deck_id', 'id'):
+        cards[str(card.deck_id)].append(card_data(card))
+    return {
+        'decks': [deck_data(deck) for deck in Deck.objects.all()],
+        'spreads': [spread_data(spread) for spread in Spread.objects.prefetch_related('positions')],
+        'cards': dict(cards),
+    }
@@ -0,0 +1,114 @@
+"""
+Plain-dict versions of the read serializers in serializers.py.
+
+Reading responses, and the deck and spread lists, have fixed shapes, so
+these build them directly from model attributes instead of going through
+ModelSerializer's field machinery. Each produces exactly what its
+counterpart does (the same keys, in the same order, with the same values),
+so a view can use either one. Keep the two in step when either changes.
+`?fields=` sparse fieldsets still go through the ModelSerializers.
+"""
+from rest_framework import serializers
+
+# Formats datetimes exactly as the ModelSerializers' DateTimeFields do
+_datetime = serializers.DateTimeField()
+
+
+def _format_datetime(value):
+    return _datetime.to_representation(value) if value is not None else None
+
+
+def deck_data(deck) -> dict:
+    """DeckSerializer(deck).data"""
+    return {
+        'id': deck.id,
+        'name': deck.name,
+        'description': deck.description,
+        'created_at': _format_datetime(deck.created_at),
+    }
+
+
+def card_data(card) -> dict:
+    """CardSerializer(card).data"""
+    return {
+        'id': card.id,
+        'name': card.name,
+        'number': card.number,
+        'arcana': card.arcana,
+        'suit': card.suit,
+        'keywords_upright': list(card.keywords_upright),
+        'keywords_reversed': list(card.keywords_reversed),
+        'meaning_upright': card.meaning_upright,
+        'meaning_reversed': card.meaning_reversed,
+        'image_filename': card.image_filename,
+    }
+
+
+def position_data(position) -> dict:
+    """SpreadPositionSerializer(position).data"""
+    return {
+        'id': position.id,
+        'position_number': position.position_number,
+        'name': position.name,
+        'description': position.description,
+        'thematic_note': position.thematic_note,
+    }
+
+
+def spread_data(spread) -> dict:
+    """SpreadSerializer(spread).data; prefetch the spread's positions."""
+    return {
+        'id': spread.id,
+        'name': spread.name,
+        'description': spread.description,
+        'num_cards': spread.num_cards,
+        'positions': [position_data(position) for position in spread.positions.all()],
+    }
+
+
+def reading_card_data(reading_card) -> dict:
+    """ReadingCardSerializer(reading_card).data"""
+    return {
+        'id': reading_card.id,
+        'card': card_data(reading_card.card),
+        'position': position_data(reading_card.position),
+        'is_reversed': reading_card.is_reversed,
+        'interpretation': reading_card.interpretation,
+        'interpretation_status': reading_card.interpretation_status,
+    }
+
+
+def reading_data(reading) -> dict:
+    """ReadingSerializer(reading).data"""
+    return {
+        'id': reading.id,
+        'deck': deck_data(reading.deck),
+        'spread': spread_data(reading.spread),
+        'question': reading.question,
+        'created_at': _format_datetime(reading.created_at),
+        'interpretation_status': reading.interpretation_status,
+        'cards': [reading_card_data(reading_card) for reading_card in reading.drawn_cards],
+    }
+
+
+def compact_reading_data(reading) -> dict:
+    """CompactReadingSerializer(reading).data"""
+    return {
+        'id': reading.id,
+        'deck': reading.deck_id,
+        'spread': reading.spread_id,
+        'question': reading.question,
+        'created_at': _format_datetime(reading.created_at),
+        'interpretation_status': reading.interpretation_status,
+        'cards': [
+            {
+                'id': reading_card.id,
+                'card': reading_card.card_id,
+                'position': reading_card.position_id,
+                'is_reversed': reading_card.is_reversed,
+                'interpretation': reading_card.interpretation,
+                'interpretation_status': reading_card.interpretation_status,
+            }
+            for reading_card in reading.drawn_cards
+        ],
+    }
@@ -0,0 +1,110 @@
+"""
+HTTP conditional caching for readings and the catalog endpoints.
+
+A finished reading never changes, so its ETag is built from the URL alone
+(the reading id, SNAPSHOT_VERSION and the representation asked for). It is
+sent with `Cache-Control: immutable`, and a matching If-None-Match is
+answered 304 before any database or serializer work. `If-None-Match: *`
+names no ETag, so it is only answered 304 once the reading is known to
+exist and be finished. Pending readings get
+`no-cache` and no ETag.
+
+Decks, spreads and cards carry the catalog version in their ETag (see
+catalog.catalog_version_tag). They are sent with `no-cache`, so clients
+revalidate every time, and the revalidation costs no query.
+"""
+import hashlib
+
+from django.http import HttpResponseNotModified
+from django.utils.http import parse_etags, quote_etag
+
+from .catalog import catalog_version_tag
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'public, no-cache'
+NO_CACHE = 'no-cache'
+
+
+def variant(media_type: str, fields: str = '') -> str:
+    """A short tag for one representation of a resource (format, indent, ?fields=)."""
+    return hashlib.sha1(f'{media_type}\x1f{fields}'.encode()).hexdigest()[:8]
+
+
+def request_variant(request) -> str:
+    """The variant a DRF request has negotiated."""
+    return variant(request.accepted_media_type, request.query_params.get('fields', ''))
+
+
+def make_etag(*parts) -> str:
+    return quote_etag('-'.join(str(part) for part in parts))
+
+
+def if_none_match(request, etag: str, exists: bool = True) -> bool:
+    """
+    Whether the request's If-None-Match matches the ETag (weak comparison,
+    as for GET). `*` matches only if a current representation is known to
+    exist, so pass exists=False when checking before the resource is loaded.
+    """
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    etags = parse_etags(header)
+    if '*' in etags:
+        return exists
+    return etag.removeprefix('W/') in {tag.removeprefix('W/') for tag in etags}
+
+
+def preferred_encoding(request, encodings: list[str]) -> str:
+    """
+    The content coding to send, from `encodings` (most preferred first),
+    by the request's Accept-Encoding q-values; 'identity' if none is accepted.
+    """
+    accepted = {}
+    for item in request.headers.get('Accept-Encoding', '').split(','):
+        coding, _, params = item.partition(';')
+        quality = 1.0
+        name, _, value = params.strip().partition('=')
+        if name.strip() == 'q':
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        if coding.strip():
+            accepted[coding.strip().lower()] = quality
+    best, best_quality = 'identity', 0.0
+    for encoding in encodings:
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def set_cache_headers(response, etag: str | None, cache_control: str):
+    if etag is not None:
+        response['ETag'] = etag
+    response['Cache-Control'] = cache_control
+    return response
+
+
+def not_modified(etag: str, cache_control: str) -> HttpResponseNotModified:
+    return set_cache_headers(HttpResponseNotModified(), etag, cache_control)
+
+
+class CatalogETagMixin:
+    """
+    For views of catalog data (decks, spreads, cards): an ETag naming the
+    catalog version, and a 304 without a query when the client has it.
+    """
+    etag_name = None
+
+    def get_etag_name(self) -> str:
+        return self.etag_name
+
+    def get(self, request, *args, **kwargs):
+        # The version is read before the query, so an edit landing mid-query
+        # leaves this ETag stale rather than naming the new data
+        etag = make_etag(self.get_etag_name(), catalog_version_tag(), request_variant(request))
+        if if_none_match(request, etag):
+            return not_modified(etag, REVALIDATE)
+        response = super().get(request, *args, **kwargs)
+        return set_cache_headers(response, etag, REVALIDATE)
@@ -0,0 +1,241 @@
+"""
+Two-tier cache in front of the interpretation backend.
+
+Generated interpretations are keyed by card, spread position, orientation,
+a fingerprint of the normalised question and the interpreter's version, so
+a repeated or common question on the same card skips the model entirely.
+The key also covers the card and position text an interpreter is given
+(meaning, keywords, description, thematic note), so editing a card in the
+admin stops its old interpretations from matching.
+Lookups try an in-process LRU first, then the CachedInterpretation table,
+which is shared by every process and survives restarts.
+
+An interpreter names its version with a `cache_version()` attribute (see
+tarot/ollama.py, which combines the model and prompt version). Change it
+whenever the output would change, and old entries stop matching and age
+out. Interpreters without one are keyed by their dotted path.
+
+The table is kept to MAX_ROWS by deleting the least recently used rows
+every PRUNE_EVERY writes. Hit and miss counters for this process are served
+at GET /api/interpretation-cache/.
+
+Configured by the TAROT_INTERPRETATION_CACHE setting:
+
+    TAROT_INTERPRETATION_CACHE = {
+        'ENABLED': False,
+        'LRU_SIZE': 2048,       # entries held in memory per process
+        'MAX_ROWS': 100000,     # rows kept in the table
+        'PRUNE_EVERY': 200,     # writes between evictions from the table
+    }
+"""
+import hashlib
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import CachedInterpretation
+
+DEFAULTS = {
+    'ENABLED': False,
+    'LRU_SIZE': 2048,
+    'MAX_ROWS': 100000,
+    'PRUNE_EVERY': 200,
+}
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def cache_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, 'TAROT_INTERPRETATION_CACHE', {})}
+
+
+def question_fingerprint(question: str) -> str:
+    """The question with case, punctuation and spacing normalised away."""
+    question = unicodedata.normalize('NFKC', question).casefold()
+    return _NON_WORD.sub(' ', question).strip()
+
+
+def prompt_inputs(reading_card) -> tuple[str, ...]:
+    """The card and position text an interpretation is drawn from, for its orientation."""
+    card, position = reading_card.card, reading_card.position
+    if reading_card.is_reversed:
+        meaning, keywords = card.meaning_reversed, card.keywords_reversed
+    else:
+        meaning, keywords = card.meaning_upright, card.keywords_upright
+    return (
+        card.name, meaning, '\x1e'.join(keywords),
+        position.name, position.description, position.thematic_note,
+    )
+
+
+def cache_key(reading_card, version: str) -> str:
+    parts = (
+        version,
+        str(reading_card.card_id),
+        str(reading_card.position_id),
+        'reversed' if reading_card.is_reversed else 'upright',
+        question_fingerprint(reading_card.reading.question),
+        *prompt_inputs(reading_card),
+    )
+    return hashlib.sha256('\x1f'.join(parts).encode()).hexdigest()
+
+
+class InterpretationCache:
+    """An LRU of interpretations by key, backed by the CachedInterpretation table."""
+
+    def __init__(self, lru_size: int, max_rows: int, prune_every: int):
+        self.lru_size = lru_size
+        self.max_rows = max_rows
+        self.prune_every = prune_every
+        self._lru: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.lru_hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.lru_evictions = 0
+        self.store_evictions = 0
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            text = self._lru.get(key)
+            if text is not None:
+                self._lru.move_to_end(key)
+                self.lru_hits += 1
+                return text
+
+        row = CachedInterpretation.objects.filter(key=key).values_list('id', 'interpretation').first()
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        row_id, text = row
+        CachedInterpretation.objects.filter(id=row_id).update(
+            hits=F('hits') + 1, last_used_at=timezone.now(),
+        )
+        with self._lock:
+            self.store_hits += 1
+            self._remember(key, text)
+        return text
+
+    def put(self, key: str, text: str, version: str):
+        with self._lock:
+            self._remember(key, text)
+            self._writes += 1
+            prune = self._writes % self.prune_every == 0
+        # Another process may have stored the same key meanwhile; either text will do
+        CachedInterpretation.objects.bulk_create(
+            [CachedInterpretation(key=key, interpreter_version=version, interpretation=text)],
+            ignore_conflicts=True,
+        )
+        if prune:
+            self.prune()
+
+    def prune(self) -> int:
+        """Delete the least recently used rows beyond max_rows."""
+        cutoff = (
+            CachedInterpretation.objects
+            .order_by('-last_used_at')
+            .values_list('last_used_at', flat=True)[self.max_rows:self.max_rows + 1]
+            .first()
+        )
+        if cutoff is None:
+            return 0
+        deleted, _ = CachedInterpretation.objects.filter(last_used_at__lte=cutoff).delete()
+        with self._lock:
+            self.store_evictions += deleted
+        return deleted
+
+    def _remember(self, key: str, text: str):
+        # Caller holds the lock
+        self._lru[key] = text
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+            self.lru_evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.lru_hits + self.store_hits + self.misses
+            return {
+                'lru_size': self.lru_size,
+                'lru_entries': len(self._lru),
+                'max_rows': self.max_rows,
+                'lru_hits': self.lru_hits,
+                'store_hits': self.store_hits,
+                'misses': self.misses,
+                'hit_rate': (self.lru_hits + self.store_hits) / lookups if lookups else None,
+                'lru_evictions': self.lru_evictions,
+                'store_evictions': self.store_evictions,
+            }
+
+
+class CachedInterpreter:
+    """Wraps an interpreter (ReadingCard -> str) so results come from the cache when they can."""
+
+    def __init__(self, interpreter, cache: InterpretationCache, version: str):
+        self.interpreter = interpreter
+        self.cache = cache
+        self.version = version
+
+    def __call__(self, reading_card) -> str:
+        key = cache_key(reading_card, self.version)
+        text = self.cache.get(key)
+        if text is None:
+            text = self.interpreter(reading_card)
+            self.cache.put(key, text, self.version)
+        return text
+
+    def stream(self, reading_card):
+        """Tokens as the interpreter streams them, or the cached text as one token."""
+        key = cache_key(reading_card, self.version)
+        text = self.cache.get(key)
+        if text is not None:
+            yield text
+            return
+        stream = getattr(self.interpreter, 'stream', None)
+        if stream is None:
+            text = self.interpreter(reading_card)
+            self.cache.put(key, text, self.version)
+            yield text
+            return
+        parts = []
+        for token in stream(reading_card):
+            parts.append(token)
+            yield token
+        self.cache.put(key, ''.join(parts), self.version)
+
+
+_cache: InterpretationCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_interpretation_cache() -> InterpretationCache | None:
+    """The process-wide cache, or None if it is disabled in settings."""
+    global _cache
+    config = cache_config()
+    if not config['ENABLED']:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = InterpretationCache(
+                    lru_size=config['LRU_SIZE'],
+                    max_rows=config['MAX_ROWS'],
+                    prune_every=config['PRUNE_EVERY'],
+                )
+    return _cache
+
+
+def with_cache(interpreter, path: str):
+    """The interpreter behind the cache if it is enabled, else unchanged."""
+    cache = get_interpretation_cache()
+    if cache is None:
+        return interpreter
+    version = getattr(interpreter, 'cache_version', None)
+    return CachedInterpreter(interpreter, cache, version() if version else path)
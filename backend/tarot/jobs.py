@@ -0,0 +1,212 @@
+"""
+Background interpretation queue, backed by Postgres.
+
+When the queue is enabled, a reading is created with every card's
+interpretation pending and one InterpretationJob per card. Worker processes
+(`manage.py run_interpretation_worker`) claim jobs with
+SELECT ... FOR UPDATE SKIP LOCKED, so any number of workers can run side
+by side with no broker. Each worker writes its interpretation back to the
+card.
+
+A claimed job is leased for LEASE seconds. If its worker dies, the job
+becomes claimable again once the lease runs out. A failed job is retried
+with exponential backoff until MAX_ATTEMPTS is reached, and then its card
+is marked failed. So is a job whose lease runs out on its last attempt,
+so an interpretation that kills its worker every time isn't retried forever.
+
+Configured by the TAROT_INTERPRETATION_QUEUE setting:
+
+    TAROT_INTERPRETATION_QUEUE = {
+        'ENABLED': False,
+        'INTERPRETER': 'tarot.readings.interpret_stub',  # ReadingCard -> str
+        'CONCURRENCY': 2,       # worker threads per process
+        'MAX_ATTEMPTS': 3,
+        'RETRY_DELAY': 5,       # seconds before the first retry, doubling
+        'LEASE': 300,           # seconds a claimed job stays claimed
+        'POLL_INTERVAL': 1.0,   # seconds between polls when idle
+    }
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .interpretation_cache import with_cache
+from .models import InterpretationJob, ReadingCard
+from .snapshots import snapshot_when_finished
+
+DEFAULTS = {
+    'ENABLED': False,
+    'INTERPRETER': 'tarot.readings.interpret_stub',
+    'CONCURRENCY': 2,
+    'MAX_ATTEMPTS': 3,
+    'RETRY_DELAY': 5,
+    'LEASE': 300,
+    'POLL_INTERVAL': 1.0,
+}
+
+
+def queue_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, 'TAROT_INTERPRETATION_QUEUE', {})}
+
+
+def queue_enabled() -> bool:
+    return queue_config()['ENABLED']
+
+
+def get_interpreter():
+    """
+    The configured interpreter: a callable from ReadingCard to text, behind
+    the interpretation cache if that is enabled.
+    """
+    path = queue_config()['INTERPRETER']
+    return with_cache(import_string(path), path)
+
+
+def enqueue_interpretations(reading_cards) -> list[InterpretationJob]:
+    """Queue a job for each (saved) reading card."""
+    return InterpretationJob.objects.bulk_create(
+        [InterpretationJob(reading_card=reading_card) for reading_card in reading_cards]
+    )
+
+
+def claim_jobs(limit: int = 1) -> list[InterpretationJob]:
+    """
+    Claim up to `limit` due jobs: pending ones past their backoff, and
+    running ones whose lease has expired. Rows other workers are claiming
+    right now are skipped rather than waited on.
+    """
+    now = timezone.now()
+    return _claim(
+        Q(status=InterpretationJob.STATUS_PENDING, run_after__lte=now)
+        | Q(status=InterpretationJob.STATUS_RUNNING, locked_until__lt=now),
+        limit,
+    )
+
+
+def claim_card_job(reading_card_id: int) -> InterpretationJob | None:
+    """
+    Claim one card's job for a client waiting on it, ignoring any retry
+    backoff. None if it is finished or another worker holds it.
+    """
+    jobs = _claim(
+        Q(reading_card_id=reading_card_id)
+        & (Q(status=InterpretationJob.STATUS_PENDING)
+           | Q(status=InterpretationJob.STATUS_RUNNING, locked_until__lt=timezone.now())),
+        1,
+    )
+    return jobs[0] if jobs else None
+
+
+def _claim(condition: Q, limit: int) -> list[InterpretationJob]:
+    config = queue_config()
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            InterpretationJob.objects
+            .select_for_update(skip_locked=True, of=('self',))
+            .select_related('reading_card__reading', 'reading_card__card', 'reading_card__position')
+            .filter(condition)
+            .order_by('run_after', 'id')[:limit]
+        )
+        # Only an expired lease makes a running job claimable: its worker
+        # died or hung, and on the last attempt that is a failure
+        abandoned = [
+            job for job in jobs
+            if job.status == InterpretationJob.STATUS_RUNNING and job.attempts >= config['MAX_ATTEMPTS']
+        ]
+        if abandoned:
+            _fail_abandoned(abandoned, now)
+            jobs = [job for job in jobs if job not in abandoned]
+        if not jobs:
+            return []
+        locked_until = now + timedelta(seconds=config['LEASE'])
+        InterpretationJob.objects.filter(id__in=[job.id for job in jobs]).update(
+            status=InterpretationJob.STATUS_RUNNING,
+            locked_until=locked_until,
+            attempts=F('attempts') + 1,
+            updated_at=now,
+        )
+    for job in jobs:
+        job.status = InterpretationJob.STATUS_RUNNING
+        job.locked_until = locked_until
+        job.attempts += 1
+    return jobs
+
+
+def _fail_abandoned(jobs: list[InterpretationJob], now):
+    """Mark locked jobs whose last attempt's lease ran out, and their cards, failed."""
+    InterpretationJob.objects.filter(id__in=[job.id for job in jobs]).update(
+        status=InterpretationJob.STATUS_FAILED,
+        locked_until=None,
+        last_error='Lease expired on the last attempt; the worker never finished.',
+        updated_at=now,
+    )
+    ReadingCard.objects.filter(id__in=[job.reading_card_id for job in jobs]).update(
+        interpretation_status=ReadingCard.INTERPRETATION_FAILED,
+    )
+    for reading_id in {job.reading_card.reading_id for job in jobs}:
+        snapshot_when_finished(reading_id)
+
+
+def run_job(job: InterpretationJob, interpreter=None) -> bool:
+    """
+    Interpret a claimed job's card and record the outcome. Returns whether
+    it succeeded.
+    """
+    interpreter = interpreter or get_interpreter()
+    try:
+        text = interpreter(job.reading_card)
+    except Exception as exc:
+        fail_job(job, exc)
+        return False
+    return complete_job(job, text)
+
+
+def complete_job(job: InterpretationJob, text: str) -> bool:
+    """Store a claimed job's interpretation. False if the claim was lost."""
+    with transaction.atomic():
+        # Matching on attempts skips the write if the lease ran out and
+        # another worker has since claimed the job
+        finished = InterpretationJob.objects.filter(id=job.id, attempts=job.attempts).update(
+            status=InterpretationJob.STATUS_DONE,
+            locked_until=None,
+            last_error='',
+            # auto_now doesn't fire on queryset updates
+            updated_at=timezone.now(),
+        )
+        if finished:
+            ReadingCard.objects.filter(id=job.reading_card_id).update(
+                interpretation=text,
+                interpretation_status=ReadingCard.INTERPRETATION_DONE,
+            )
+            snapshot_when_finished(job.reading_card.reading_id)
+    return bool(finished)
+
+
+def fail_job(job: InterpretationJob, exc: Exception):
+    """Schedule a retry of a claimed job, or mark its card failed if out of attempts."""
+    config = queue_config()
+    error = f'{type(exc).__name__}: {exc}'
+    now = timezone.now()
+    jobs = InterpretationJob.objects.filter(id=job.id, attempts=job.attempts)
+    if job.attempts < config['MAX_ATTEMPTS']:
+        delay = config['RETRY_DELAY'] * 2 ** (job.attempts - 1)
+        jobs.update(
+            status=InterpretationJob.STATUS_PENDING,
+            run_after=now + timedelta(seconds=delay),
+            locked_until=None,
+            last_error=error,
+            updated_at=now,
+        )
+        return
+    with transaction.atomic():
+        if jobs.update(status=InterpretationJob.STATUS_FAILED, locked_until=None,
+                       last_error=error, updated_at=now):
+            ReadingCard.objects.filter(id=job.reading_card_id).update(
+                interpretation_status=ReadingCard.INTERPRETATION_FAILED,
+            )
+            snapshot_when_finished(job.reading_card.reading_id)
@@ -0,0 +1,189 @@
+"""
+Measure the speed and randomness of the shuffle ritual (tarot/shuffle.py).
+
+Runs N full shuffles of an identity deck across a process pool and reports:
+
+    throughput            shuffles/sec over the whole run
+    position chi-square   card × position counts against a uniform spread
+    rising sequences      mean count per shuffle; (n + 1) / 2 for a uniform
+                          permutation, far from it when the deck is under-mixed
+    reversal rate         share of cards ending reversed, against what the
+                          overhand passes' per-packet flip chance predicts
+    adjacency retention   share of originally adjacent pairs still adjacent
+                          and in order; 1 / n for a uniform permutation
+
+The results are written as JSON so runs can be compared across changes to
+the shuffle.
+
+Usage:
+    docker compose exec backend python manage.py analyze_shuffle
+    docker compose exec backend python manage.py analyze_shuffle --shuffles 1000000 --workers 8 --output shuffle.json
+    docker compose exec backend python manage.py analyze_shuffle --seed 42 --riffle gsr
+"""
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tarot.shuffle import (
+    OVERHAND_FLIP_CHANCE,
+    RIFFLE_MODES,
+    RIFFLE_WEIGHTED,
+    RITUAL,
+    new_seed,
+    plan_full_shuffle,
+)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the shuffle ritual and check the randomness of its output.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--shuffles', type=int, default=100_000)
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--deck-size', type=int, default=78)
+        parser.add_argument('--riffle', choices=RIFFLE_MODES, default=RIFFLE_WEIGHTED)
+        parser.add_argument('--seed', type=int, default=None,
+                            help='Base seed, for a reproducible run.')
+        parser.add_argument('--output', default='shuffle_analysis.json',
+                            help='Where to write the JSON results.')
+
+    def handle(self, *args, **options):
+        n = options['deck_size']
+        total = options['shuffles']
+        workers = max(1, options['workers'])
+        if n < 2 or total < 1:
+            raise CommandError('Need at least 2 cards and 1 shuffle.')
+
+        # A few chunks per worker so an unlucky slow one doesn't hold up the end
+        chunk = max(1, math.ceil(total / (workers * 4)))
+        base_seed = options['seed'] if options['seed'] is not None else new_seed()
+        jobs = [
+            (n, min(chunk, total - start), options['riffle'], base_seed + i)
+            for i, start in enumerate(range(0, total, chunk))
+        ]
+
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            tallies = list(executor.map(_run_chunk, jobs))
+        elapsed = time.perf_counter() - started
+
+        results = _summarize(n, total, _merge(tallies))
+        results.update({
+            'riffle': options['riffle'],
+            'seed': base_seed,
+            'workers': workers,
+            'elapsed_seconds': round(elapsed, 3),
+            'shuffles_per_sec': round(total / elapsed, 1),
+        })
+
+        with open(options['output'], 'w') as f:
+            json.dump(results, f, indent=2)
+
+        position = results['position_chi_square']
+        rising = results['rising_sequences']
+        reversal = results['reversal_rate']
+        adjacency = results['adjacency_retention']
+        self.stdout.write(
+            f'{total} shuffles of {n} cards in {elapsed:.2f}s on {workers} workers — '
+            f'{results["shuffles_per_sec"]:,.0f} shuffles/sec'
+        )
+        self.stdout.write(
+            f'  position chi-square  {position["statistic"]:.1f} '
+            f'(df {position["df"]}, p {position["p_value"]:.3g})'
+        )
+        self.stdout.write(f'  rising sequences     {rising["mean"]:.2f} (uniform {rising["uniform"]:.2f})')
+        self.stdout.write(f'  reversal rate        {reversal["observed"]:.2%} (expected {reversal["expected"]:.2%})')
+        self.stdout.write(f'  adjacency retention  {adjacency["observed"]:.4f} (uniform {adjacency["uniform"]:.4f})')
+        self.stdout.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
+
+
+def _run_chunk(job: tuple[int, int, str, int]) -> dict:
+    """Shuffle an identity deck `count` times and tally the statistics."""
+    n, count, riffle, seed = job
+    rng = random.Random(seed)
+    positions = [0] * (n * n)  # positions[card * n + slot]
+    rising = rising_sq = reversed_count = adjacent = 0
+    slot_of = [0] * n
+    for _ in range(count):
+        for slot, move in enumerate(plan_full_shuffle(n, riffle, rng).moves):
+            card = move >> 1
+            positions[card * n + slot] += 1
+            slot_of[card] = slot
+            reversed_count += move & 1
+        # A rising sequence ends wherever card i + 1 lies above card i
+        sequences = 1
+        for card in range(n - 1):
+            gap = slot_of[card + 1] - slot_of[card]
+            if gap < 0:
+                sequences += 1
+            elif gap == 1:
+                adjacent += 1
+        rising += sequences
+        rising_sq += sequences * sequences
+    return {
+        'positions': positions,
+        'rising': rising,
+        'rising_sq': rising_sq,
+        'reversed': reversed_count,
+        'adjacent': adjacent,
+    }
+
+
+def _merge(tallies: list[dict]) -> dict:
+    merged = {key: 0 for key in ('rising', 'rising_sq', 'reversed', 'adjacent')}
+    merged['positions'] = [sum(cells) for cells in zip(*(t['positions'] for t in tallies))]
+    for tally in tallies:
+        for key in ('rising', 'rising_sq', 'reversed', 'adjacent'):
+            merged[key] += tally[key]
+    return merged
+
+
+def _summarize(n: int, total: int, tally: dict) -> dict:
+    expected = total / n
+    statistic = sum((count - expected) ** 2 for count in tally['positions']) / expected
+    df = (n - 1) ** 2
+
+    rising_mean = tally['rising'] / total
+    rising_var = max(0.0, tally['rising_sq'] / total - rising_mean ** 2)
+
+    # Each overhand pass flips a card with the packet's flip chance; the
+    # card ends reversed after an odd number of flips
+    overhand_passes = sum(times for name, times in RITUAL if name == 'overhand')
+    expected_reversed = (1 - (1 - 2 * OVERHAND_FLIP_CHANCE) ** overhand_passes) / 2
+
+    return {
+        'shuffles': total,
+        'deck_size': n,
+        'position_chi_square': {
+            'statistic': round(statistic, 3),
+            'df': df,
+            'p_value': _chi_square_p(statistic, df),
+        },
+        'rising_sequences': {
+            'mean': round(rising_mean, 4),
+            'stdev': round(math.sqrt(rising_var), 4),
+            'uniform': (n + 1) / 2,
+        },
+        'reversal_rate': {
+            'observed': round(tally['reversed'] / (total * n), 6),
+            'expected': round(expected_reversed, 6),
+            'flip_chance': OVERHAND_FLIP_CHANCE,
+            'overhand_passes': overhand_passes,
+        },
+        'adjacency_retention': {
+            'observed': round(tally['adjacent'] / (total * (n - 1)), 6),
+            'uniform': round(1 / n, 6),
+        },
+    }
+
+
+def _chi_square_p(statistic: float, df: int) -> float:
+    """Upper-tail p-value, by the Wilson–Hilferty normal approximation."""
+    scale = 2 / (9 * df)
+    z = ((statistic / df) ** (1 / 3) - (1 - scale)) / math.sqrt(scale)
+    return 0.5 * math.erfc(z / math.sqrt(2))
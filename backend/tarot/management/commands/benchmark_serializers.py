@@ -0,0 +1,101 @@
+"""
+Compare the ModelSerializers + JSONRenderer against the plain-dict
+serializers (tarot/fast_serializers.py) + FastJSONRenderer on the read
+endpoints' responses: requests/sec and CPU time per response for
+serializing and rendering, and whether the bytes are identical.
+
+The objects are loaded once, with the views' querysets, so database time
+is left out. Needs at least one reading (create one in the UI or with
+POST /api/readings/).
+
+Usage:
+    docker compose exec backend python manage.py benchmark_serializers
+    docker compose exec backend python manage.py benchmark_serializers --iterations 5000 --reading-id 42
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from tarot.fast_serializers import compact_reading_data, deck_data, reading_data, spread_data
+from tarot.models import Deck, Reading, Spread
+from tarot.readings import drawn_cards_for
+from tarot.renderers import FastJSONRenderer
+from tarot.shuffle import DeckChangedError
+from tarot.serializers import (
+    CompactReadingSerializer,
+    DeckSerializer,
+    ReadingSerializer,
+    SpreadSerializer,
+)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark ModelSerializer rendering against the plain-dict serializers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=2000,
+                            help='Responses rendered per endpoint and path.')
+        parser.add_argument('--reading-id', type=int, default=None,
+                            help='Reading to render (default: the latest).')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        decks = list(Deck.objects.all())
+        spreads = list(Spread.objects.prefetch_related('positions'))
+        readings = Reading.objects.select_related('deck', 'spread').prefetch_related(
+            'spread__positions', 'cards__card', 'cards__position',
+        )
+        reading = (
+            readings.filter(pk=options['reading_id']).first() if options['reading_id']
+            else readings.order_by('-id').first()
+        )
+        if reading is None:
+            raise CommandError('No reading to render; create one first.')
+        try:
+            drawn_cards_for(reading)
+        except DeckChangedError:
+                raise CommandError(f'Reading {reading.id} can no longer be redrawn: its deck has changed.')
+
+        cases = [
+            ('/api/decks/',
+             lambda: DeckSerializer(decks, many=True).data,
+             lambda: [deck_data(deck) for deck in decks]),
+            ('/api/spreads/',
+             lambda: SpreadSerializer(spreads, many=True).data,
+             lambda: [spread_data(spread) for spread in spreads]),
+            (f'/api/readings/{reading.id}/',
+             lambda: ReadingSerializer(reading).data,
+             lambda: reading_data(reading)),
+            (f'/api/readings/{reading.id}/?format=compact',
+             lambda: CompactReadingSerializer(reading).data,
+             lambda: compact_reading_data(reading)),
+        ]
+
+        mismatched = []
+        for name, serialize, fast_serialize in cases:
+            before_body, before = _time(lambda: JSONRenderer().render(serialize()), iterations)
+            after_body, after = _time(lambda: FastJSONRenderer().render(fast_serialize()), iterations)
+            identical = before_body == after_body
+            if not identical:
+                mismatched.append(name)
+            self.stdout.write(
+                f'{name}  ({len(before_body):,} bytes)\n'
+                f'  before: {before["rate"]:>9,.0f} req/s  {before["cpu_us"]:>8.1f} µs CPU/req\n'
+                f'  after:  {after["rate"]:>9,.0f} req/s  {after["cpu_us"]:>8.1f} µs CPU/req  '
+                f'({before["cpu_us"] / after["cpu_us"]:.1f}× less CPU)  '
+                f'identical bytes: {"yes" if identical else "NO"}'
+            )
+
+        if mismatched:
+            raise CommandError(f'Output differs for: {", ".join(mismatched)}')
+        self.stdout.write(self.style.SUCCESS('All responses are byte-identical.'))
+
+
+def _time(render, iterations: int) -> tuple[bytes, dict]:
+    body = render()  # warm up
+    wall, cpu = time.perf_counter(), time.process_time()
+    for _ in range(iterations):
+        render()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    return body, {'rate': iterations / wall, 'cpu_us': cpu / iterations * 1e6}
@@ -0,0 +1,106 @@
+"""
+Compare shuffle throughput of the pure-Python engine (tarot/shuffle.py)
+with the NumPy batch engine (tarot/batch_shuffle.py), checking that every
+NumPy deck is still a permutation of the deck. With --compare-rng,
+also time the pure-Python engine under each random number generator.
+
+Usage:
+    docker compose exec backend python manage.py benchmark_shuffle
+    docker compose exec backend python manage.py benchmark_shuffle --decks 1000000 --riffle gsr
+    docker compose exec backend python manage.py benchmark_shuffle --compare-rng
+"""
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tarot.rng import BufferedSystemRandom
+from tarot.shuffle import RIFFLE_MODES, RIFFLE_WEIGHTED, PackedDeck, full_shuffle
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the pure-Python shuffle against the NumPy batch engine.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--decks', type=int, default=200_000,
+                            help='Decks to shuffle with the NumPy engine.')
+        parser.add_argument('--python-decks', type=int, default=10_000,
+                            help='Decks to shuffle with the pure-Python engine.')
+        parser.add_argument('--deck-size', type=int, default=78)
+        parser.add_argument('--batch-size', type=int, default=20_000,
+                            help='Decks per NumPy batch (bounds memory use).')
+        parser.add_argument('--riffle', choices=RIFFLE_MODES, default=RIFFLE_WEIGHTED)
+        parser.add_argument('--compare-rng', action='store_true',
+                            help='Time the pure-Python engine with each RNG.')
+
+    def handle(self, *args, **options):
+        deck_size = options['deck_size']
+        riffle = options['riffle']
+
+        # -- Pure Python ---------------------------------------------------
+        deck = PackedDeck.from_ids(range(deck_size))
+        n_python = options['python_decks']
+        reversed_count = 0
+        started = time.perf_counter()
+        for _ in range(n_python):
+            reversed_count += sum(full_shuffle(deck, riffle).reversed)
+        python_elapsed = time.perf_counter() - started
+        python_rate = n_python / python_elapsed
+        self.stdout.write(
+            f'python: {n_python} decks in {python_elapsed:.2f}s — '
+            f'{python_rate:,.0f} shuffles/sec, '
+            f'reversed {reversed_count / (n_python * deck_size):.2%}'
+        )
+
+        if options['compare_rng']:
+            self._compare_rng(deck, n_python, riffle)
+
+        # -- NumPy batch ---------------------------------------------------
+        try:
+            import numpy as np
+            from tarot.batch_shuffle import batch_full_shuffle
+        except ImportError:
+            self.stdout.write(self.style.WARNING('NumPy is not installed — skipping the batch engine.'))
+            return
+
+        rng = np.random.default_rng()
+        card_ids = np.arange(deck_size)
+        n_batch = options['decks']
+        remaining = n_batch
+        reversed_count = 0
+        started = time.perf_counter()
+        while remaining > 0:
+            size = min(options['batch_size'], remaining)
+            cards, reversed = batch_full_shuffle(card_ids, size, riffle, rng)
+            # Every row must still be the whole deck, each card exactly once
+            broken = np.flatnonzero((np.sort(cards, axis=1) != card_ids).any(axis=1))
+            if broken.size:
+                raise CommandError(f'{broken.size} of {size} NumPy decks are not permutations of the deck.')
+            reversed_count += int(reversed.sum())
+            remaining -= size
+        batch_elapsed = time.perf_counter() - started
+        batch_rate = n_batch / batch_elapsed
+        self.stdout.write(
+            f'numpy:  {n_batch} decks in {batch_elapsed:.2f}s — '
+            f'{batch_rate:,.0f} shuffles/sec, '
+            f'reversed {reversed_count / (n_batch * deck_size):.2%}'
+        )
+
+        self.stdout.write(self.style.SUCCESS(f'Speed-up: {batch_rate / python_rate:.1f}×'))
+
+    def _compare_rng(self, deck, n, riffle):
+        generators = [
+            ('mersenne', random.Random()),
+            ('system (buffered)', BufferedSystemRandom()),
+            ('system (unbuffered)', random.SystemRandom()),
+        ]
+        baseline = None
+        for name, rng in generators:
+            started = time.perf_counter()
+            for _ in range(n):
+                full_shuffle(deck, riffle, rng)
+            rate = n / (time.perf_counter() - started)
+            baseline = baseline or rate
+            self.stdout.write(
+                f'  rng {name:<20} {rate:>10,.0f} shuffles/sec ({rate / baseline:.2f}× mersenne)'
+            )
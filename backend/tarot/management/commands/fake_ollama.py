@@ -0,0 +1,115 @@
+"""
+Serve a stand-in for Ollama's streaming /api/generate endpoint, for
+developing and measuring interpretation streaming without a model.
+
+Each request waits --first-token-delay seconds, then streams --tokens
+canned words at --rate tokens/sec as NDJSON, the way Ollama does.
+--fail-rate makes that share of requests error out, for testing retries.
+
+Usage:
+    docker compose exec backend python manage.py fake_ollama
+    docker compose exec backend python manage.py fake_ollama --port 11434 --rate 30 --first-token-delay 0.8
+
+Then point the backend at it (in .env):
+    TAROT_INTERPRETER=tarot.ollama.interpret
+    OLLAMA_URL=http://localhost:11434
+"""
+import json
+import random
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+WORDS = (
+    'the cards suggest a season of quiet change where what you have held '
+    'tightly asks to be released and a new path opens as you trust your '
+    'own steady judgement and the patience that has carried you this far'
+).split()
+
+
+class Command(BaseCommand):
+    help = 'Run a fake Ollama server that streams canned tokens at a set rate.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='0.0.0.0')
+        parser.add_argument('--port', type=int, default=11434)
+        parser.add_argument('--rate', type=float, default=20.0,
+                            help='Tokens per second.')
+        parser.add_argument('--first-token-delay', type=float, default=0.5,
+                            help='Seconds before the first token (prompt processing).')
+        parser.add_argument('--tokens', type=int, default=60,
+                            help='Tokens per response.')
+        parser.add_argument('--fail-rate', type=float, default=0.0,
+                            help='Share of requests that fail, 0–1.')
+
+    def handle(self, *args, **options):
+        handler = type('Handler', (_FakeOllamaHandler,), {'options': options})
+        server = ThreadingHTTPServer((options['host'], options['port']), handler)
+        server.daemon_threads = True
+        self.stdout.write(self.style.SUCCESS(
+            f'Fake Ollama on http://{options["host"]}:{options["port"]} — '
+            f'{options["rate"]:g} tokens/s after {options["first_token_delay"]:g}s'
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+class _FakeOllamaHandler(BaseHTTPRequestHandler):
+    options: dict
+
+    def do_GET(self):
+        if self.path != '/api/tags':
+            self.send_error(404)
+            return
+        self._send_json({'models': [{'name': 'fake:latest'}]})
+
+    def do_POST(self):
+        if self.path != '/api/generate':
+            self.send_error(404)
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        model = body.get('model', 'fake')
+        if random.random() < self.options['fail_rate']:
+            self._send_json({'error': 'fake failure'}, status=500)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.end_headers()
+        time.sleep(self.options['first_token_delay'])
+        interval = 1 / self.options['rate'] if self.options['rate'] > 0 else 0
+        try:
+            for i in range(self.options['tokens']):
+                word = WORDS[i % len(WORDS)]
+                token = (word.capitalize() if i == 0 else ' ' + word)
+                self._write_line({'model': model, 'created_at': _now(), 'response': token, 'done': False})
+                time.sleep(interval)
+            self._write_line({'model': model, 'created_at': _now(), 'response': '.', 'done': False})
+            self._write_line({'model': model, 'created_at': _now(), 'response': '', 'done': True})
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _write_line(self, obj: dict):
+        self.wfile.write(json.dumps(obj).encode() + b'\n')
+        self.wfile.flush()
+
+    def _send_json(self, obj: dict, status: int = 200):
+        payload = json.dumps(obj).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
@@ -0,0 +1,135 @@
+"""
+Load-test reading creation through the sync and async endpoints.
+
+Fires --requests POSTs at each endpoint with --concurrency in flight at a
+time, and reports throughput and latency percentiles for both. Point it
+at the server under test. To see what the async views gain, serve the ASGI
+app with uvicorn (see README):
+
+    POST /api/readings/          ReadingCreateView (sync)
+    POST /api/async/readings/    async_views.reading_create
+
+Usage:
+    docker compose exec backend python manage.py loadtest_readings
+    docker compose exec backend python manage.py loadtest_readings --url http://localhost:8001 --concurrency 200
+    docker compose exec backend python manage.py loadtest_readings --only async --requests 5000
+"""
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tarot.models import Deck, Spread
+
+ENDPOINTS = {
+    'sync': '/api/readings/',
+    'async': '/api/async/readings/',
+}
+
+
+class Command(BaseCommand):
+    help = 'Compare concurrent reading-creation capacity of the sync and async endpoints.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://localhost:8000',
+                            help='Base URL of the server under test.')
+        parser.add_argument('--requests', type=int, default=500,
+                            help='Requests per endpoint.')
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--deck-id', type=int, help='Defaults to the first deck.')
+        parser.add_argument('--spread-id', type=int, help='Defaults to the first spread.')
+        parser.add_argument('--only', choices=ENDPOINTS, help='Test just one endpoint.')
+
+    def handle(self, *args, **options):
+        deck_id = options['deck_id'] or Deck.objects.values_list('id', flat=True).order_by('id').first()
+        spread_id = options['spread_id'] or Spread.objects.values_list('id', flat=True).order_by('id').first()
+        if deck_id is None or spread_id is None:
+            raise CommandError('No deck or spread to read from — run seed_deck first.')
+        body = json.dumps({
+            'deck_id': deck_id,
+            'spread_id': spread_id,
+            'question': 'What does the load test hold?',
+        }).encode()
+
+        url = urlsplit(options['url'])
+        host, port = url.hostname, url.port or 80
+        names = [options['only']] if options['only'] else list(ENDPOINTS)
+
+        rates = {}
+        for name in names:
+            results = asyncio.run(_run(
+                host, port, ENDPOINTS[name], body,
+                options['requests'], max(1, options['concurrency']),
+            ))
+            rates[name] = self._report(name, results)
+
+        if len(rates) == 2 and rates['sync']:
+            self.stdout.write(self.style.SUCCESS(
+                f'async/sync throughput: {rates["async"] / rates["sync"]:.2f}×'
+            ))
+
+    def _report(self, name: str, results: dict) -> float:
+        latencies = sorted(results['latencies'])
+        ok = len(latencies)
+        rate = ok / results['elapsed'] if results['elapsed'] else 0.0
+
+        def percentile(p):
+            return latencies[min(ok - 1, int(p * ok))] * 1000 if ok else float('nan')
+
+        self.stdout.write(
+            f'{name:<5} {ok} ok, {results["errors"]} failed in {results["elapsed"]:.2f}s — '
+            f'{rate:,.1f} req/s, p50 {percentile(0.50):.0f}ms, '
+            f'p95 {percentile(0.95):.0f}ms, p99 {percentile(0.99):.0f}ms'
+        )
+        if results['first_error']:
+            self.stdout.write(self.style.WARNING(f'      first failure: {results["first_error"]}'))
+        return rate
+
+
+async def _run(host: str, port: int, path: str, body: bytes, total: int, concurrency: int) -> dict:
+    request = (
+        f'POST {path} HTTP/1.1\r\n'
+        f'Host: {host}:{port}\r\n'
+        'Content-Type: application/json\r\n'
+        f'Content-Length: {len(body)}\r\n'
+        'Connection: close\r\n\r\n'
+    ).encode() + body
+    results = {'latencies': [], 'errors': 0, 'first_error': None}
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                status = await _post(host, port, request)
+                error = None if status == 201 else f'HTTP {status}'
+            except OSError as exc:
+                error = str(exc) or type(exc).__name__
+            if error is None:
+                results['latencies'].append(time.perf_counter() - started)
+            else:
+                results['errors'] += 1
+                results['first_error'] = results['first_error'] or error
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    results['elapsed'] = time.perf_counter() - started
+    return results
+
+
+async def _post(host: str, port: int, request: bytes) -> int:
+    """Send one request on a fresh connection and return the status code."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(request)
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()  # drain the rest until the server closes
+    finally:
+        writer.close()
+    parts = status_line.split()
+    if len(parts) < 2 or not parts[1].isdigit():
+        raise ConnectionError(f'bad status line {status_line!r}')
+    return int(parts[1])
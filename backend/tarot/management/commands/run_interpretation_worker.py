@@ -0,0 +1,74 @@
+"""
+Run interpretation-queue workers (see tarot/jobs.py).
+
+Each worker thread claims one job at a time with SELECT ... FOR UPDATE SKIP
+LOCKED, so several processes can share the queue. Stop with Ctrl-C; jobs
+in flight then finish first.
+
+Usage:
+    docker compose exec backend python manage.py run_interpretation_worker
+    docker compose exec backend python manage.py run_interpretation_worker --concurrency 4
+    docker compose exec backend python manage.py run_interpretation_worker --once
+"""
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from tarot.jobs import claim_jobs, get_interpreter, queue_config, run_job
+
+
+class Command(BaseCommand):
+    help = 'Process queued reading interpretations.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=None,
+                            help='Worker threads (default: TAROT_INTERPRETATION_QUEUE CONCURRENCY).')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit once no jobs are due instead of polling.')
+
+    def handle(self, *args, **options):
+        config = queue_config()
+        concurrency = options['concurrency'] or config['CONCURRENCY']
+        interpreter = get_interpreter()
+        stop = threading.Event()
+        counts = {'done': 0, 'failed': 0}
+        counts_lock = threading.Lock()
+
+        def work():
+            try:
+                while not stop.is_set():
+                    close_old_connections()
+                    jobs = claim_jobs()
+                    if not jobs:
+                        if options['once']:
+                            return
+                        stop.wait(config['POLL_INTERVAL'])
+                        continue
+                    for job in jobs:
+                        ok = run_job(job, interpreter)
+                        with counts_lock:
+                            counts['done' if ok else 'failed'] += 1
+            finally:
+                connection.close()
+
+        self.stdout.write(f'Interpretation worker running {concurrency} threads')
+        threads = [
+            threading.Thread(target=work, name=f'interpretation-worker-{i}', daemon=True)
+            for i in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Stopping after jobs in flight...'))
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Interpreted {counts["done"]} cards, {counts["failed"]} attempts failed.'
+        ))
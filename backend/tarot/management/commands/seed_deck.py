@@ -7,6 +7,7 @@ Usage:
     docker compose exec backend python manage.py seed_deck --clear
 """
 from django.core.management.base import BaseCommand
+from tarot.catalog import shared_version_enabled
 from tarot.models import Deck, Card, Spread, SpreadPosition
 
 
@@ -848,6 +849,7 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
+        changed = options['clear']
         if options['clear']:
             self.stdout.write('Clearing existing data...')
             Deck.objects.filter(name='Rider-Waite').delete()
@@ -867,6 +869,7 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING('Rider-Waite deck already exists — skipping cards. Use --clear to reseed.'))
         else:
             self._seed_cards(deck)
+            changed = True
             self.stdout.write(self.style.SUCCESS(f'Created Rider-Waite deck with {deck.cards.count()} cards.'))
 
         # -- Spread --------------------------------------------------------
@@ -882,8 +885,14 @@ class Command(BaseCommand):
         else:
             for pos_data in THREE_CARD_SPREAD['positions']:
                 SpreadPosition.objects.create(spread=spread, **pos_data)
+            changed = True
             self.stdout.write(self.style.SUCCESS('Created Three Card spread with 3 positions.'))
 
+        if changed and not shared_version_enabled():
+            self.stdout.write(self.style.WARNING(
+                'The catalog version is not shared (see TAROT_CATALOG_CACHE), so running '
+                'backend processes keep their cached decks: restart them to serve these changes.'
+            ))
         self.stdout.write(self.style.SUCCESS('Done.'))
 
     def _seed_cards(self, deck):
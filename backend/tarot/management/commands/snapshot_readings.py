@@ -0,0 +1,117 @@
+"""
+Write snapshots for finished readings that don't have a current one, or
+check stored snapshots against the live serializers (see tarot/snapshots.py).
+
+Readings stored without card rows are not snapshotted (see
+readings.stores_cards).
+
+A check mismatch means either the fast serializers have drifted from the
+ModelSerializers or the reading's cards were edited after its snapshot was
+taken. Rewrite with --rewrite once the cause is known.
+
+Usage:
+    docker compose exec backend python manage.py snapshot_readings
+    docker compose exec backend python manage.py snapshot_readings --rewrite
+    docker compose exec backend python manage.py snapshot_readings --check
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Exists, OuterRef
+from rest_framework.renderers import JSONRenderer
+
+from tarot.models import Reading, ReadingCard, ReadingSnapshot
+from tarot.readings import drawn_cards_for
+from tarot.serializers import CompactReadingSerializer, ReadingSerializer
+from tarot.shuffle import DeckChangedError
+from tarot.snapshots import SNAPSHOT_VERSION, is_finished, render_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Backfill reading snapshots, or check them against the live serializers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Compare current snapshots with the live serializers; write nothing.')
+        parser.add_argument('--rewrite', action='store_true',
+                            help='Rewrite every snapshot, not just missing or outdated ones.')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        readings = Reading.objects.order_by('id')
+        if options['check']:
+            readings = readings.filter(snapshot__version=SNAPSHOT_VERSION).select_related('snapshot')
+        else:
+            # Readings stored without card rows are redrawn on request instead
+            readings = readings.filter(Exists(ReadingCard.objects.filter(reading=OuterRef('pk'))))
+            if not options['rewrite']:
+                readings = readings.exclude(snapshot__version=SNAPSHOT_VERSION)
+
+        written = skipped = checked = 0
+        mismatched = []
+        deck_changed = []
+        for batch in _batches(readings, options['batch_size'], deck_changed):
+            if options['check']:
+                mismatched += [reading.id for reading in batch if not _matches(reading)]
+                checked += len(batch)
+                continue
+            snapshots = [render_snapshot(reading) for reading in batch if is_finished(reading)]
+            skipped += len(batch) - len(snapshots)
+            ReadingSnapshot.objects.bulk_create(
+                snapshots,
+                update_conflicts=True,
+                unique_fields=['reading'],
+                update_fields=['version', 'body', 'compact_body'],
+            )
+            written += len(snapshots)
+            self.stdout.write(f'  {written} written…')
+
+        if deck_changed:
+            self.stdout.write(self.style.WARNING(
+                f'Skipped {len(deck_changed)} readings stored without card rows whose deck has changed '
+                f'since they were drawn: readings {", ".join(map(str, deck_changed[:20]))}'
+                f'{"…" if len(deck_changed) > 20 else ""}'
+            ))
+        if options['check']:
+            if mismatched:
+                raise CommandError(
+                    f'{len(mismatched)} of {checked} snapshots differ from the live serializers: '
+                    f'readings {", ".join(map(str, mismatched[:20]))}'
+                    f'{"…" if len(mismatched) > 20 else ""}'
+                )
+            self.stdout.write(self.style.SUCCESS(f'All {checked} snapshots match.'))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {written} snapshots; skipped {skipped} readings with pending interpretations.'
+        ))
+
+
+def _batches(readings, batch_size: int, deck_changed: list[int]):
+    """
+    The readings in batches, loaded with everything a snapshot renders.
+    Readings that can no longer be redrawn are left out and their ids
+    added to `deck_changed`.
+    """
+    readings = readings.select_related('deck', 'spread').prefetch_related(
+        'spread__positions', 'cards__card', 'cards__position',
+    )
+    last_id = 0
+    while True:
+        batch = list(readings.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            return
+        last_id = batch[-1].id
+        redrawable = []
+        for reading in batch:
+            try:
+                drawn_cards_for(reading)
+            except DeckChangedError:
+                deck_changed.append(reading.id)
+                continue
+            redrawable.append(reading)
+        yield redrawable
+
+
+def _matches(reading) -> bool:
+    snapshot = reading.snapshot
+    body = JSONRenderer().render(ReadingSerializer(reading).data).decode()
+    compact_body = JSONRenderer().render(CompactReadingSerializer(reading).data).decode()
+    return snapshot.body == body and snapshot.compact_body == compact_body
@@ -0,0 +1,123 @@
+"""
+Check that seeded readings regenerate to exactly the cards that were stored.
+
+Usage:
+    docker compose exec backend python manage.py verify_readings
+    docker compose exec backend python manage.py verify_readings --prune
+    docker compose exec backend python manage.py verify_readings --batch-size 1000
+
+Readings are loaded in id-ordered batches of --batch-size, so memory stays
+flat however many there are.
+
+--prune deletes the ReadingCard rows of every reading that verified, so
+those readings are served by redrawing from the seed (the migration path
+for turning TAROT_PERSIST_READING_CARDS off on an existing database).
+A redraw only has the stub interpretations, so readings that ever had an
+interpretation job, or whose stored interpretations differ from the stubs,
+keep their rows. Pruned readings made before deck fingerprints were
+recorded get the current deck's, so a later change to the deck is refused
+rather than redrawn into different cards.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from tarot.models import InterpretationJob, Reading, ReadingCard
+from tarot.catalog import get_deck_catalog
+from tarot.readings import regenerate_cards
+from tarot.shuffle import DeckChangedError
+
+
+class Command(BaseCommand):
+    help = 'Verify that seeded readings regenerate to their stored cards.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--prune',
+            action='store_true',
+            help='Delete the stored card rows of readings that verify and have only stub interpretations.',
+        )
+        parser.add_argument('--limit', type=int, help='Check at most this many readings.')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        readings = (
+            Reading.objects
+            .filter(seed__isnull=False)
+            .filter(Exists(ReadingCard.objects.filter(reading=OuterRef('pk'))))
+            .select_related('deck', 'spread')
+            .prefetch_related('cards', 'spread__positions')
+            .annotate(has_jobs=Exists(
+                InterpretationJob.objects.filter(reading_card__reading=OuterRef('pk')),
+            ))
+            .order_by('id')
+        )
+
+        verified: list[int] = []
+        mismatched: list[int] = []
+        # Verified readings whose rows can go: the redraw reproduces them in full
+        prunable: list[int] = []
+        # Prunable readings without a recorded deck fingerprint, by the one they verified against
+        unfingerprinted: dict[str, list[int]] = {}
+        for reading in _readings(readings, options['batch_size'], options['limit']):
+            try:
+                regenerated_cards = regenerate_cards(reading)
+            except DeckChangedError:
+                mismatched.append(reading.id)
+                self.stdout.write(self.style.ERROR(f'Reading {reading.id}: its deck has changed since it was drawn.'))
+                continue
+            stored = sorted(
+                (c.position_id, c.card_id, c.is_reversed, c.interpretation_status, c.interpretation)
+                for c in reading.cards.all()
+            )
+            regenerated = sorted(
+                (c.position.id, c.card.id, c.is_reversed, c.interpretation_status, c.interpretation)
+                for c in regenerated_cards
+            )
+            if [card[:3] for card in stored] != [card[:3] for card in regenerated]:
+                mismatched.append(reading.id)
+                self.stdout.write(self.style.ERROR(f'Reading {reading.id}: stored cards do not match its seed.'))
+                continue
+            verified.append(reading.id)
+            if stored == regenerated and not reading.has_jobs:
+                prunable.append(reading.id)
+                if not reading.deck_fingerprint:
+                    fingerprint = get_deck_catalog(reading.deck_id).fingerprint
+                    unfingerprinted.setdefault(fingerprint, []).append(reading.id)
+
+        self.stdout.write(
+            f'{len(verified)} verified, {len(mismatched)} mismatched; '
+            f'{len(verified) - len(prunable)} verified readings have interpretations a redraw would lose.'
+        )
+
+        if options['prune'] and prunable:
+            with transaction.atomic():
+                for fingerprint, reading_ids in unfingerprinted.items():
+                    Reading.objects.filter(id__in=reading_ids).update(deck_fingerprint=fingerprint)
+                deleted, _ = (
+                    ReadingCard.objects
+                    .filter(reading_id__in=prunable)
+                    # In case a job was queued since the check
+                    .exclude(reading__cards__interpretation_job__isnull=False)
+                    .delete()
+                )
+            self.stdout.write(self.style.WARNING(f'Pruned {deleted} card rows.'))
+
+        if mismatched:
+            raise CommandError(f'{len(mismatched)} readings do not match their seed.')
+        self.stdout.write(self.style.SUCCESS('Done.'))
+
+
+def _readings(readings, batch_size: int, limit: int | None):
+    """The readings (ordered by id), fetched a batch at a time, at most `limit` of them."""
+    last_id = 0
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = batch_size if remaining is None else min(batch_size, remaining)
+        batch = list(readings.filter(id__gt=last_id)[:size])
+        if not batch:
+            return
+        yield from batch
+        last_id = batch[-1].id
+        if remaining is not None:
+            remaining -= len(batch)
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tarot', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reading',
+            name='seed',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='reading',
+            name='shuffle_version',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tarot', '0002_reading_seed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deck',
+            name='shuffle_rng',
+            field=models.CharField(blank=True, choices=[('mersenne', 'Mersenne Twister (reproducible)'), ('system', 'OS CSPRNG (buffered)')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:31
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tarot', '0003_deck_shuffle_rng'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='readingcard',
+            name='interpretation_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], default='done', max_length=10),
+        ),
+        migrations.CreateModel(
+            name='InterpretationJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now)),
+                ('locked_until', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('reading_card', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='interpretation_job', to='tarot.readingcard')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'run_after'], name='tarot_inter_status_6b7d15_idx')],
+            },
+        ),
+    ]
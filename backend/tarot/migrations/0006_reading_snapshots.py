@@ -0,0 +1,24 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tarot', '0005_interpretation_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReadingSnapshot',
+            fields=[
+                ('reading', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='snapshot', serialize=False, to='tarot.reading')),
+                ('version', models.PositiveSmallIntegerField()),
+                ('body', models.TextField()),
+                ('compact_body', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 20:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tarot', '0006_reading_snapshots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reading',
+            name='deck_fingerprint',
+            field=models.CharField(blank=True, max_length=32),
+        ),
+    ]
@@ -1,10 +1,15 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.postgres.fields import ArrayField
 
+from .rng import RNG_CHOICES
+
 
 class Deck(models.Model):
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True)
+    # Generator used to shuffle this deck; blank uses settings.TAROT_SHUFFLE_RNG
+    shuffle_rng = models.CharField(max_length=20, choices=RNG_CHOICES, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -74,17 +79,58 @@ class Reading(models.Model):
     spread = models.ForeignKey(Spread, on_delete=models.PROTECT)
     question = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    # Seed + algorithm version the cards were drawn with (see tarot/shuffle.py).
+    # Null for readings made before seeds were recorded.
+    seed = models.BigIntegerField(null=True, blank=True)
+    shuffle_version = models.PositiveSmallIntegerField(null=True, blank=True)
+    # deck_fingerprint of the deck the seed was drawn from; redraws are refused
+    # once the deck changes. Blank for readings made before it was recorded.
+    deck_fingerprint = models.CharField(max_length=32, blank=True)
 
     def __str__(self):
         return f'Reading {self.id} ({self.created_at:%Y-%m-%d})'
 
+    @property
+    def drawn_cards(self):
+        """
+        The reading's cards: the ReadingCard rows, unless a list was set on
+        this instance (freshly created, or regenerated from the seed).
+        """
+        cards = getattr(self, '_drawn_cards', None)
+        return cards if cards is not None else self.cards.all()
+
+    @drawn_cards.setter
+    def drawn_cards(self, cards):
+        self._drawn_cards = list(cards)
+
+    @property
+    def interpretation_status(self):
+        """'pending' while any card awaits its interpretation, else 'failed' if any failed, else 'done'."""
+        statuses = {reading_card.interpretation_status for reading_card in self.drawn_cards}
+        for status in (ReadingCard.INTERPRETATION_PENDING, ReadingCard.INTERPRETATION_FAILED):
+            if status in statuses:
+                return status
+        return ReadingCard.INTERPRETATION_DONE
+
 
 class ReadingCard(models.Model):
+    INTERPRETATION_PENDING = 'pending'
+    INTERPRETATION_DONE = 'done'
+    INTERPRETATION_FAILED = 'failed'
+    INTERPRETATION_CHOICES = [
+        (INTERPRETATION_PENDING, 'Pending'),
+        (INTERPRETATION_DONE, 'Done'),
+        (INTERPRETATION_FAILED, 'Failed'),
+    ]
+
     reading = models.ForeignKey(Reading, on_delete=models.CASCADE, related_name='cards')
     card = models.ForeignKey(Card, on_delete=models.PROTECT)
     position = models.ForeignKey(SpreadPosition, on_delete=models.PROTECT)
     is_reversed = models.BooleanField(default=False)
     interpretation = models.TextField(blank=True)
+    interpretation_status = models.CharField(
+        max_length=10, choices=INTERPRETATION_CHOICES, default=INTERPRETATION_DONE,
+    )
 
     class Meta:
         unique_together = ('reading', 'position')
@@ -92,3 +138,75 @@ class ReadingCard(models.Model):
     def __str__(self):
         orientation = 'reversed' if self.is_reversed else 'upright'
         return f'{self.card.name} ({orientation}) at {self.position.name}'
+
+
+class InterpretationJob(models.Model):
+    """
+    A queued interpretation for one ReadingCard, claimed by the workers in
+    tarot/jobs.py with SELECT ... FOR UPDATE SKIP LOCKED.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    reading_card = models.OneToOneField(
+        ReadingCard, on_delete=models.CASCADE, related_name='interpretation_job',
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Not claimable before this (retry backoff)
+    run_after = models.DateTimeField(default=timezone.now)
+    # A running job whose worker hasn't finished by this is claimable again
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'run_after'])]
+
+    def __str__(self):
+        return f'Interpretation job {self.id} ({self.status})'
+
+
+class CachedInterpretation(models.Model):
+    """
+    The persistent tier of the interpretation cache (tarot/interpretation_cache.py):
+    one generated interpretation per key.
+    """
+    # sha256 of card, position, orientation, their text, question fingerprint and interpreter version
+    key = models.CharField(max_length=64, unique=True)
+    interpreter_version = models.CharField(max_length=200)
+    interpretation = models.TextField()
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Least recently used rows are evicted first
+    last_used_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f'Cached interpretation {self.key[:12]} ({self.interpreter_version})'
+
+
+class ReadingSnapshot(models.Model):
+    """
+    A finished reading's detail responses, rendered once and served as
+    stored (see tarot/snapshots.py).
+    """
+    reading = models.OneToOneField(
+        Reading, on_delete=models.CASCADE, primary_key=True, related_name='snapshot',
+    )
+    # Snapshots from another version of the response format are ignored
+    version = models.PositiveSmallIntegerField()
+    body = models.TextField()
+    compact_body = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'Snapshot of reading {self.reading_id} (v{self.version})'
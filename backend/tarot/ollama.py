@@ -0,0 +1,112 @@
+"""
+Interpretations from a local Ollama server.
+
+Set TAROT_INTERPRETER to 'tarot.ollama.interpret' to use it. The
+interpretation queue then calls interpret() once per card. The reading
+stream endpoint uses interpret.stream to relay tokens as Ollama generates
+them. Results can be cached in front of it (see tarot/interpretation_cache.py).
+
+Configured by the TAROT_OLLAMA setting:
+
+    TAROT_OLLAMA = {
+        'URL': 'http://ollama:11434',
+        'MODEL': 'mistral',
+        'TIMEOUT': 120,   # seconds to wait for each chunk
+    }
+
+For development without a model, `manage.py fake_ollama` serves the same
+API with canned tokens at a configurable rate.
+"""
+import json
+from collections.abc import Iterator
+from urllib.error import URLError
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+
+# Bump when build_prompt changes, so cached interpretations stop matching
+PROMPT_VERSION = 1
+
+DEFAULTS = {
+    'URL': 'http://ollama:11434',
+    'MODEL': 'mistral',
+    'TIMEOUT': 120,
+}
+
+
+class OllamaError(Exception):
+    pass
+
+
+def _config() -> dict:
+    return {**DEFAULTS, **getattr(settings, 'TAROT_OLLAMA', {})}
+
+
+def build_prompt(reading_card) -> str:
+    card, position = reading_card.card, reading_card.position
+    orientation = 'reversed' if reading_card.is_reversed else 'upright'
+    keywords = card.keywords_reversed if reading_card.is_reversed else card.keywords_upright
+    meaning = card.meaning_reversed if reading_card.is_reversed else card.meaning_upright
+    lines = [
+        'You are a thoughtful tarot reader. In three or four sentences, interpret one card '
+        'of a reading for the querent. Speak to them directly; do not repeat these instructions.',
+        '',
+        f'Question: {reading_card.reading.question}',
+        f'Position: {position.name} — {position.description}',
+        f'Card: {card.name} ({orientation})',
+        f'Traditional meaning: {meaning}',
+    ]
+    if keywords:
+        lines.append(f'Keywords: {", ".join(keywords)}')
+    if position.thematic_note:
+        lines.append(f'Note on this position: {position.thematic_note}')
+    return '\n'.join(lines)
+
+
+def stream_interpretation(reading_card) -> Iterator[str]:
+    """Yield the interpretation's tokens as Ollama generates them."""
+    config = _config()
+    request = Request(
+        f'{config["URL"].rstrip("/")}/api/generate',
+        data=json.dumps({
+            'model': config['MODEL'],
+            'prompt': build_prompt(reading_card),
+            'stream': True,
+        }).encode(),
+        headers={'Content-Type': 'application/json'},
+        method='POST',
+    )
+    try:
+        with urlopen(request, timeout=config['TIMEOUT']) as response:
+            # One JSON object per line until one says it's done
+            started = False
+            for line in response:
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                if chunk.get('error'):
+                    raise OllamaError(chunk['error'])
+                token = chunk.get('response', '')
+                if not started:
+                    token = token.lstrip()  # models often open with whitespace
+                if token:
+                    started = True
+                    yield token
+                if chunk.get('done'):
+                    return
+    except (URLError, OSError, ValueError) as exc:
+        raise OllamaError(f'Ollama request failed: {exc}') from exc
+    raise OllamaError('Ollama stream ended before it was done.')
+
+
+def interpret(reading_card) -> str:
+    return ''.join(stream_interpretation(reading_card))
+
+
+def cache_version() -> str:
+    """Identifies this model and prompt in the interpretation cache's keys."""
+    return f'ollama:{_config()["MODEL"]}:prompt-{PROMPT_VERSION}'
+
+
+interpret.stream = stream_interpretation
+interpret.cache_version = cache_version
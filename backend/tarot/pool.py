@@ -0,0 +1,174 @@
+"""
+Pool of pre-computed shuffles, kept topped up by background threads.
+
+Each deck gets a ring buffer of ready ShufflePlans for its current size
+and generator, each paired with the seed it was generated from (None for
+generators that can't be replayed). The reading view takes
+one instead of shuffling on the request thread; when a buffer runs low a
+refill is queued for the worker threads, so bursts of traffic are served
+from stock.
+
+Configured by the TAROT_SHUFFLE_POOL setting:
+
+    TAROT_SHUFFLE_POOL = {
+        'ENABLED': True,
+        'SIZE': 32,           # ready shuffles kept per deck
+        'LOW_WATER': 8,       # refill when fewer than this remain
+        'REFILL_THREADS': 1,
+    }
+"""
+import logging
+import queue
+import threading
+from collections import deque
+
+from django.conf import settings
+
+from .rng import RNG_MERSENNE, make_rng
+from .shuffle import ShufflePlan, plan_full_shuffle
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'SIZE': 32,
+    'LOW_WATER': 8,
+    'REFILL_THREADS': 1,
+}
+
+
+class _DeckBuffer:
+    __slots__ = ('deck_size', 'rng', 'ready', 'hits', 'misses')
+
+    def __init__(self, deck_size: int, rng: str, capacity: int):
+        self.deck_size = deck_size
+        self.rng = rng
+        self.ready: deque[tuple[int | None, ShufflePlan]] = deque(maxlen=capacity)
+        self.hits = 0
+        self.misses = 0
+
+
+class ShufflePool:
+    def __init__(self, size: int, low_water: int, refill_threads: int):
+        self.size = size
+        self.low_water = low_water
+        self.refill_threads = refill_threads
+        self._buffers: dict[int, _DeckBuffer] = {}
+        self._pending: set[int] = set()
+        self._lock = threading.Lock()
+        self._refills: queue.Queue = queue.Queue()
+        self._workers: list[threading.Thread] = []
+
+    def take(
+        self, deck_id: int, deck_size: int, rng: str = RNG_MERSENNE,
+    ) -> tuple[int | None, ShufflePlan] | None:
+        """
+        A ready (seed, plan) shuffle for the deck, or None on a miss.
+        Either way a refill is queued if the deck's buffer is running low.
+        For Mersenne Twister shuffles the plan is
+        plan_full_shuffle(deck_size, rng=Random(seed)); other generators
+        give a seed of None.
+        """
+        with self._lock:
+            buffer = self._buffers.get(deck_id)
+            if buffer is None or buffer.deck_size != deck_size or buffer.rng != rng:
+                # New deck, or its cards or generator changed since we stocked it
+                old = buffer
+                buffer = self._buffers[deck_id] = _DeckBuffer(deck_size, rng, self.size)
+                if old is not None:
+                    buffer.hits, buffer.misses = old.hits, old.misses
+            try:
+                shuffle = buffer.ready.popleft()
+                buffer.hits += 1
+            except IndexError:
+                shuffle = None
+                buffer.misses += 1
+            if len(buffer.ready) < self.low_water and deck_id not in self._pending:
+                self._pending.add(deck_id)
+                self._refills.put(deck_id)
+        self._ensure_workers()
+        return shuffle
+
+    def stats(self) -> dict:
+        with self._lock:
+            decks = {
+                deck_id: {
+                    'deck_size': buffer.deck_size,
+                    'rng': buffer.rng,
+                    'ready': len(buffer.ready),
+                    'hits': buffer.hits,
+                    'misses': buffer.misses,
+                }
+                for deck_id, buffer in self._buffers.items()
+            }
+        return {
+            'size': self.size,
+            'low_water': self.low_water,
+            'refill_threads': self.refill_threads,
+            'hits': sum(d['hits'] for d in decks.values()),
+            'misses': sum(d['misses'] for d in decks.values()),
+            'decks': decks,
+        }
+
+    def _ensure_workers(self):
+        workers = self._workers
+        if len(workers) >= self.refill_threads and all(worker.is_alive() for worker in workers):
+            return
+        with self._lock:
+            # Threads don't survive a fork, so a forked child starts its own
+            self._workers = [worker for worker in self._workers if worker.is_alive()]
+            while len(self._workers) < self.refill_threads:
+                worker = threading.Thread(
+                    target=self._refill_forever,
+                    name=f'shuffle-pool-{len(self._workers)}',
+                    daemon=True,
+                )
+                worker.start()
+                self._workers.append(worker)
+
+    def _refill_forever(self):
+        while True:
+            deck_id = self._refills.get()
+            try:
+                self._refill(deck_id)
+            except Exception:
+                # Takers just miss until the next refill; keep the thread alive
+                logger.exception('Shuffle pool refill for deck %s failed.', deck_id)
+            finally:
+                with self._lock:
+                    self._pending.discard(deck_id)
+
+    def _refill(self, deck_id: int):
+        while True:
+            with self._lock:
+                buffer = self._buffers.get(deck_id)
+                if buffer is None or len(buffer.ready) >= self.size:
+                    return
+                deck_size, rng_name = buffer.deck_size, buffer.rng
+            # Shuffle outside the lock so takers are never held up
+            seed, rng = make_rng(rng_name)
+            plan = plan_full_shuffle(deck_size, rng=rng)
+            with self._lock:
+                if self._buffers.get(deck_id) is buffer:
+                    buffer.ready.append((seed, plan))
+
+
+_pool: ShufflePool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_shuffle_pool() -> ShufflePool | None:
+    """The process-wide pool, or None if it is disabled in settings."""
+    global _pool
+    config = {**DEFAULTS, **getattr(settings, 'TAROT_SHUFFLE_POOL', {})}
+    if not config['ENABLED']:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ShufflePool(
+                    size=config['SIZE'],
+                    low_water=config['LOW_WATER'],
+                    refill_threads=config['REFILL_THREADS'],
+                )
+    return _pool
@@ -0,0 +1,249 @@
+"""
+Drawing cards for readings, turning them into ReadingCards, and redrawing
+them from a seed.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from .catalog import DeckCatalog, get_deck_catalog
+from .jobs import enqueue_interpretations, queue_enabled
+from .models import Reading, ReadingCard
+from .rng import make_rng, shuffle_rng_for
+from .shuffle import (
+    SHUFFLE_VERSION_FULL_PLAN,
+    SHUFFLE_VERSION_TOP_K,
+    PackedDeck,
+    draw_seeded,
+    draw_top,
+)
+from .snapshots import store_snapshots
+
+
+def shuffle_for_reading(reading, catalog: DeckCatalog, pool=None) -> PackedDeck:
+    """
+    Shuffle the reading's deck and draw the top card for each spread
+    position, recording the seed, shuffle version and deck fingerprint on
+    the reading.
+
+    Takes a pre-shuffled deck from `pool` if one is ready, otherwise
+    shuffles just far enough to know the top cards. Only card ids are
+    needed until the draw is known.
+    """
+    num_cards = reading.spread.num_cards
+    rng_name = shuffle_rng_for(reading.deck)
+    pooled = pool.take(catalog.deck_id, len(catalog), rng_name) if pool else None
+    if pooled is not None:
+        seed, plan = pooled
+        shuffle_version = SHUFFLE_VERSION_FULL_PLAN
+        drawn = plan.draw(catalog.packed, num_cards)
+    else:
+        seed, rng = make_rng(rng_name)
+        shuffle_version = SHUFFLE_VERSION_TOP_K
+        drawn = draw_top(catalog.packed, num_cards, rng=rng)
+    reading.seed = seed
+    reading.shuffle_version = shuffle_version if seed is not None else None
+    reading.deck_fingerprint = catalog.fingerprint if seed is not None else ''
+    return drawn
+
+
+def save_reading(reading, catalog: DeckCatalog, drawn) -> list[ReadingCard]:
+    """
+    Write a freshly drawn reading and (if stored) its cards in one
+    transaction, loading full card rows only for the drawn ids. With the
+    interpretation queue on, the cards are left pending and queued;
+    otherwise the reading is finished and, if its cards are stored, so is
+    its snapshot. Sets and returns reading.drawn_cards.
+    """
+    positions = list(reading.spread.positions.all())  # already ordered by position_number
+    cards_by_id = catalog.cards(card_id for card_id, _ in drawn)
+    pending = queue_enabled()
+    with transaction.atomic():
+        reading.save()
+        reading.drawn_cards = build_reading_cards(
+            reading, cards_by_id, positions, drawn, pending, stub_table(catalog, positions),
+        )
+        if stores_cards(reading):
+            ReadingCard.objects.bulk_create(reading.drawn_cards)
+            store_snapshots([reading])
+        if pending:
+            enqueue_interpretations(reading.drawn_cards)
+    return reading.drawn_cards
+
+
+def stores_cards(reading) -> bool:
+    """
+    Whether the reading's ReadingCard rows are written. Unseeded readings
+    can't be redrawn, and queued interpretations need a row to land in,
+    so those always are. Readings without card rows get no snapshot
+    either: it would take more space than the rows it replaces.
+    """
+    return settings.TAROT_PERSIST_READING_CARDS or reading.seed is None or queue_enabled()
+
+
+def create_readings(items, chunk_size: int = 500) -> list[Reading]:
+    """
+    Create readings for validated batch items ({deck, spread, question})
+    with bulk inserts, one transaction per chunk of `chunk_size` readings.
+    Each returned reading has its drawn_cards set.
+    """
+    catalogs: dict[int, DeckCatalog] = {}
+    created = []
+    for start in range(0, len(items), chunk_size):
+        readings, draws = [], []
+        wanted = defaultdict(set)
+        for item in items[start:start + chunk_size]:
+            deck = item['deck']
+            catalog = catalogs.get(deck.id)
+            if catalog is None:
+                catalog = catalogs[deck.id] = get_deck_catalog(deck.id)
+            reading = Reading(deck=deck, spread=item['spread'], question=item['question'])
+            drawn = shuffle_for_reading(reading, catalog)
+            wanted[deck.id].update(card_id for card_id, _ in drawn)
+            readings.append(reading)
+            draws.append(drawn)
+
+        # Full card rows for everything drawn in the chunk, one lookup per deck
+        cards_by_id = {}
+        for deck_id, card_ids in wanted.items():
+            cards_by_id.update(catalogs[deck_id].cards(card_ids))
+
+        pending = queue_enabled()
+        with transaction.atomic():
+            Reading.objects.bulk_create(readings)
+            stored, snapshotted = [], []
+            for reading, drawn in zip(readings, draws):
+                positions = list(reading.spread.positions.all())
+                reading.drawn_cards = build_reading_cards(
+                    reading, cards_by_id, positions, drawn, pending,
+                    stub_table(catalogs[reading.deck_id], positions),
+                )
+                if stores_cards(reading):
+                    stored += reading.drawn_cards
+                    snapshotted.append(reading)
+            ReadingCard.objects.bulk_create(stored)
+            if pending:
+                enqueue_interpretations(stored)
+            store_snapshots(snapshotted)
+        created += readings
+    return created
+
+
+def build_reading_cards(reading, cards_by_id, positions, drawn,
+                        pending: bool = False, stubs: dict | None = None) -> list[ReadingCard]:
+    """
+    Unsaved ReadingCards for each spread position, from the drawn
+    (card_id, is_reversed) pairs. Pending cards get no interpretation yet;
+    the others get the stub, looked up in `stubs` (see stub_table) if given.
+    """
+    reading_cards = []
+    for position, (card_id, is_reversed) in zip(positions, drawn):
+        card_obj = cards_by_id[card_id]
+        if pending:
+            interpretation = ''
+            status = ReadingCard.INTERPRETATION_PENDING
+        else:
+            interpretation = (
+                stubs[card_id, position.id, is_reversed] if stubs is not None
+                else stub_interpretation(card_obj, position, is_reversed)
+            )
+            status = ReadingCard.INTERPRETATION_DONE
+        reading_cards.append(ReadingCard(
+            reading=reading,
+            card=card_obj,
+            position=position,
+            is_reversed=is_reversed,
+            interpretation=interpretation,
+            interpretation_status=status,
+        ))
+    return reading_cards
+
+
+def drawn_cards_for(reading) -> list[ReadingCard]:
+    """
+    The reading's cards (reading.drawn_cards): its ReadingCard rows, or for
+    a seeded reading stored without them, a redraw from the seed, which is
+    then set as its drawn_cards. Raises DeckChangedError if the redraw is
+    refused (see regenerate_cards). Prefetch `cards` for many readings.
+    """
+    if reading.seed is not None and not reading.cards.all():
+        reading.drawn_cards = regenerate_cards(reading)
+    return list(reading.drawn_cards)
+
+
+def regenerate_cards(reading) -> list[ReadingCard]:
+    """
+    Redraw a seeded reading's cards. Raises DeckChangedError if the deck's
+    cards have changed since the reading was drawn. Readings made before
+    deck fingerprints were recorded are redrawn unchecked.
+    """
+    if reading.seed is None:
+        raise ValueError(f'Reading {reading.pk} has no recorded seed.')
+    catalog = get_deck_catalog(reading.deck_id)
+    positions = list(reading.spread.positions.all())
+    drawn = draw_seeded(
+        catalog.packed,
+        reading.spread.num_cards,
+        reading.seed,
+        reading.shuffle_version,
+        reading.deck_fingerprint or None,
+    )
+    cards_by_id = catalog.cards(card_id for card_id, _ in drawn)
+    return build_reading_cards(
+        reading, cards_by_id, positions, drawn, stubs=stub_table(catalog, positions),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Interpretation stub
+# ---------------------------------------------------------------------------
+
+def stub_interpretation(card, position, is_reversed: bool) -> str:
+    """
+    Template-based interpretation stored at reading creation time.
+    Replaced by LLM output in Phase 6.
+    """
+    orientation = 'reversed' if is_reversed else 'upright'
+    keywords = card.keywords_reversed if is_reversed else card.keywords_upright
+    meaning = card.meaning_reversed if is_reversed else card.meaning_upright
+    keyword_str = ', '.join(keywords[:3]) if keywords else ''
+
+    parts = [
+        f"{card.name} appears {orientation} in the {position.name} position "
+        f"— {position.description.lower().rstrip('.')}.",
+    ]
+    if keyword_str:
+        parts.append(f"Key themes: {keyword_str}.")
+    parts.append(meaning)
+    if position.thematic_note:
+        parts.append(position.thematic_note)
+
+    return ' '.join(parts)
+
+
+def stub_table(catalog: DeckCatalog, positions) -> dict | None:
+    """
+    Every stub interpretation for the catalog's deck in one spread, keyed by
+    (card_id, position_id, is_reversed). Built on first use and kept on the
+    catalog, so it is rebuilt when a card or spread position changes. None
+    for uncached catalogs, which don't hold every card.
+    """
+    if not catalog.cached or not positions:
+        return None
+    # positions must be the spread's full list: the table is kept per spread
+    spread_id = positions[0].spread_id
+    table = catalog.stub_tables.get(spread_id)
+    if table is None:
+        table = catalog.stub_tables[spread_id] = {
+            (card.id, position.id, is_reversed): stub_interpretation(card, position, is_reversed)
+            for card in catalog.all_cards()
+            for position in positions
+            for is_reversed in (False, True)
+        }
+    return table
+
+
+def interpret_stub(reading_card) -> str:
+    """The stub as an interpretation-queue interpreter (see tarot/jobs.py)."""
+    return stub_interpretation(reading_card.card, reading_card.position, reading_card.is_reversed)
@@ -0,0 +1,40 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer's output, encoded with orjson. The bytes match
+    JSONRenderer's: compact separators, non-ASCII left unescaped, U+2028 and
+    U+2029 escaped, and anything orjson doesn't handle natively (datetimes,
+    decimals, lazy strings...) converted by DRF's encoder. Floats that need an
+    exponent are the exception: orjson writes 1e16 where json writes 1e+16.
+    Indented output and data orjson can't encode (integers over 64 bits)
+    go through JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.ensure_ascii or not self.compact or \
+                self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=_ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+        return ret
+
+
+class CompactJSONRenderer(FastJSONRenderer):
+    """
+    JSON for the compact reading format: cards and positions are given by
+    id, to be resolved against the catalog the client already holds.
+    Selected with ?format=compact or Accept: application/vnd.tarot.compact+json.
+    """
+    media_type = 'application/vnd.tarot.compact+json'
+    format = 'compact'
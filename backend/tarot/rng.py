@@ -0,0 +1,118 @@
+"""
+Random number generators for shuffling.
+
+    'mersenne'  random.Random (Mersenne Twister) seeded per reading, so the
+                reading can be redrawn from its stored seed. The default.
+    'system'    BufferedSystemRandom: cryptographically secure, drawn from
+                os.urandom. Readings can't be redrawn, so their cards are
+                always stored.
+
+The default comes from the TAROT_SHUFFLE_RNG setting; a deck can override
+it with Deck.shuffle_rng.
+"""
+import os
+import random
+import threading
+import weakref
+from array import array
+
+from django.conf import settings
+
+from .shuffle import new_seed
+
+RNG_MERSENNE = 'mersenne'
+RNG_SYSTEM = 'system'
+RNG_CHOICES = [
+    (RNG_MERSENNE, 'Mersenne Twister (reproducible)'),
+    (RNG_SYSTEM, 'OS CSPRNG (buffered)'),
+]
+
+
+class BufferedSystemRandom(random.Random):
+    """
+    A random.Random backed by os.urandom, like random.SystemRandom, but
+    reading entropy in large blocks and serving it a 64-bit word at a time.
+    A full shuffle makes hundreds of small draws; SystemRandom pays a
+    system call for each one.
+
+    Not thread-safe: use one instance per thread (see make_rng). A forked
+    child process discards the entropy buffered before the fork, so parent
+    and child never deal the same words.
+    """
+
+    def __init__(self, block_words: int = 1024):
+        self._block_words = block_words
+        self._stream = iter(())
+        super().__init__()
+        _buffered.add(self)
+
+    def _discard_buffer(self):
+        self._stream = iter(())
+
+    def _word(self) -> int:
+        word = next(self._stream, None)
+        if word is None:
+            self._stream = iter(array('Q', os.urandom(8 * self._block_words)))
+            word = next(self._stream)
+        return word
+
+    def random(self) -> float:
+        # 53 random bits, like Random.random()
+        return (self._word() >> 11) * (1.0 / (1 << 53))
+
+    def getrandbits(self, k: int) -> int:
+        if k <= 64:
+            if k < 0:
+                raise ValueError('number of bits must be non-negative')
+            return self._word() >> (64 - k)
+        words = (k + 63) // 64
+        value = int.from_bytes(self.randbytes(8 * words), 'little')
+        return value >> (64 * words - k)
+
+    def randbytes(self, n: int) -> bytes:
+        if n > 8 * self._block_words:
+            return os.urandom(n)
+        return b''.join(self._word().to_bytes(8, 'little') for _ in range((n + 7) // 8))[:n]
+
+    def seed(self, *args, **kwargs):
+        """Ignored: there is no seed to set."""
+
+    def _notimplemented(self, *args, **kwargs):
+        raise NotImplementedError('System entropy source does not have state.')
+    getstate = setstate = _notimplemented
+
+
+_local = threading.local()
+
+# Every live instance, for discarding their buffers in forked children
+_buffered = weakref.WeakSet()
+
+
+def _discard_buffers_after_fork():
+    for rng in list(_buffered):
+        rng._discard_buffer()
+
+
+if hasattr(os, 'register_at_fork'):  # not on Windows
+    os.register_at_fork(after_in_child=_discard_buffers_after_fork)
+
+
+def shuffle_rng_for(deck) -> str:
+    """Which generator shuffles this deck."""
+    return deck.shuffle_rng or settings.TAROT_SHUFFLE_RNG
+
+
+def make_rng(name: str) -> tuple[int | None, random.Random]:
+    """
+    (seed, rng) for one shuffle. The seed is None for generators that
+    can't be replayed.
+    """
+    if name == RNG_MERSENNE:
+        seed = new_seed()
+        return seed, random.Random(seed)
+    if name == RNG_SYSTEM:
+        rng = getattr(_local, 'system_rng', None)
+        if rng is None:
+            rng = _local.system_rng = BufferedSystemRandom()
+        return None, rng
+    raise ValueError(f'Unknown shuffle RNG {name!r}.')
@@ -1,14 +1,60 @@
+from django.db.models import Count
 from rest_framework import serializers
 from .models import Deck, Card, Spread, SpreadPosition, Reading, ReadingCard
 
 
-class DeckSerializer(serializers.ModelSerializer):
+def parse_fields(value: str | None) -> set[str] | None:
+    """The ?fields= sparse fieldset: comma-separated names, dotted for nested fields."""
+    if not value:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class SparseFieldsMixin:
+    """
+    Drops the fields not asked for in context['fields'] (see parse_fields),
+    at any depth: 'cards.card.name' keeps just `name` in each card's `card`.
+    Naming a nested field without going further keeps all of its fields.
+    Unknown names, or dotted paths into fields that aren't serializers,
+    raise a ValidationError (a 400).
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested = self.context.get('fields')
+        if not requested:
+            return fields
+        path = self._field_path()
+        prefix = f'{path}.' if path else ''
+        names = set()
+        for name in requested:
+            if not name.startswith(prefix):
+                continue
+            first, *rest = name[len(prefix):].split('.')
+            field = fields.get(first)
+            if field is None or (rest and not isinstance(field, serializers.BaseSerializer)):
+                raise serializers.ValidationError({'fields': [f'Unknown field "{name}".']})
+            names.add(first)
+        if not names:
+            return fields
+        return {name: field for name, field in fields.items() if name in names}
+
+    def _field_path(self) -> str:
+        names, node = [], self
+        while node.parent is not None:
+            if node.field_name:
+                names.append(node.field_name)
+            node = node.parent
+        return '.'.join(reversed(names))
+
+
+class DeckSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Deck
         fields = ['id', 'name', 'description', 'created_at']
 
 
-class CardSerializer(serializers.ModelSerializer):
+class CardSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Card
         fields = [
@@ -19,13 +65,13 @@ class CardSerializer(serializers.ModelSerializer):
         ]
 
 
-class SpreadPositionSerializer(serializers.ModelSerializer):
+class SpreadPositionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = SpreadPosition
         fields = ['id', 'position_number', 'name', 'description', 'thematic_note']
 
 
-class SpreadSerializer(serializers.ModelSerializer):
+class SpreadSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     positions = SpreadPositionSerializer(many=True, read_only=True)
 
     class Meta:
@@ -33,47 +79,134 @@ class SpreadSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'description', 'num_cards', 'positions']
 
 
-class ReadingCardSerializer(serializers.ModelSerializer):
+class ReadingCardSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     card = CardSerializer(read_only=True)
     position = SpreadPositionSerializer(read_only=True)
 
     class Meta:
         model = ReadingCard
-        fields = ['id', 'card', 'position', 'is_reversed', 'interpretation']
+        fields = ['id', 'card', 'position', 'is_reversed', 'interpretation', 'interpretation_status']
 
 
-class ReadingSerializer(serializers.ModelSerializer):
+class ReadingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     deck = DeckSerializer(read_only=True)
     spread = SpreadSerializer(read_only=True)
-    cards = ReadingCardSerializer(many=True, read_only=True)
+    cards = ReadingCardSerializer(many=True, read_only=True, source='drawn_cards')
+    interpretation_status = serializers.CharField(read_only=True)
 
     class Meta:
         model = Reading
-        fields = ['id', 'deck', 'spread', 'question', 'created_at', 'cards']
+        fields = ['id', 'deck', 'spread', 'question', 'created_at', 'interpretation_status', 'cards']
 
 
-class ReadingCreateSerializer(serializers.Serializer):
+class CompactReadingCardSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    card = serializers.IntegerField(source='card_id', read_only=True)
+    position = serializers.IntegerField(source='position_id', read_only=True)
+
+    class Meta:
+        model = ReadingCard
+        fields = ['id', 'card', 'position', 'is_reversed', 'interpretation', 'interpretation_status']
+
+
+class CompactReadingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """
+    A reading with its deck, spread, cards and positions given by id, for
+    clients that hold the catalog (/api/decks/<id>/cards/, /api/spreads/).
+    """
+    deck = serializers.IntegerField(source='deck_id', read_only=True)
+    spread = serializers.IntegerField(source='spread_id', read_only=True)
+    cards = CompactReadingCardSerializer(many=True, read_only=True, source='drawn_cards')
+    interpretation_status = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Reading
+        fields = ['id', 'deck', 'spread', 'question', 'created_at', 'interpretation_status', 'cards']
+
+
+class ReadingRequestSerializer(serializers.Serializer):
+    """The fields of a reading request, without any database checks."""
     deck_id = serializers.IntegerField()
     spread_id = serializers.IntegerField()
     question = serializers.CharField(max_length=1000)
 
+
+def deck_spread_mismatch(deck, spread) -> str | None:
+    """Why the deck can't be used for the spread, if it can't."""
+    if deck.card_count < spread.num_cards:
+        return (
+            f'Deck "{deck.name}" has {deck.card_count} cards but spread '
+            f'"{spread.name}" requires {spread.num_cards}.'
+        )
+    return None
+
+
+class ReadingCreateSerializer(ReadingRequestSerializer):
+    """
+    Validates a reading request. The deck (annotated with card_count) and
+    the spread (with its positions prefetched) are loaded once here and
+    handed on as validated_data['deck'] and validated_data['spread'].
+    """
+
     def validate_deck_id(self, value):
-        if not Deck.objects.filter(id=value).exists():
+        self._deck = Deck.objects.annotate(card_count=Count('cards')).filter(id=value).first()
+        if self._deck is None:
             raise serializers.ValidationError('Deck not found.')
         return value
 
     def validate_spread_id(self, value):
-        if not Spread.objects.filter(id=value).exists():
+        self._spread = Spread.objects.prefetch_related('positions').filter(id=value).first()
+        if self._spread is None:
             raise serializers.ValidationError('Spread not found.')
         return value
 
     def validate(self, data):
-        deck = Deck.objects.get(id=data['deck_id'])
-        spread = Spread.objects.get(id=data['spread_id'])
-        card_count = deck.cards.count()
-        if card_count < spread.num_cards:
-            raise serializers.ValidationError(
-                f'Deck "{deck.name}" has {card_count} cards but spread '
-                f'"{spread.name}" requires {spread.num_cards}.'
-            )
+        deck, spread = self._deck, self._spread
+        mismatch = deck_spread_mismatch(deck, spread)
+        if mismatch:
+            raise serializers.ValidationError(mismatch)
+        data['deck'] = deck
+        data['spread'] = spread
         return data
+
+
+class ReadingBatchListSerializer(serializers.ListSerializer):
+    """
+    Validates a batch of reading requests, looking up each distinct deck and
+    spread once for the whole batch rather than once per item.
+    """
+
+    def to_internal_value(self, data):
+        items = super().to_internal_value(data)
+        decks = Deck.objects.annotate(card_count=Count('cards')).in_bulk(
+            {item['deck_id'] for item in items}
+        )
+        spreads = Spread.objects.prefetch_related('positions').in_bulk(
+            {item['spread_id'] for item in items}
+        )
+
+        errors = []
+        for item in items:
+            deck = decks.get(item['deck_id'])
+            spread = spreads.get(item['spread_id'])
+            item_errors = {}
+            if deck is None:
+                item_errors['deck_id'] = ['Deck not found.']
+            if spread is None:
+                item_errors['spread_id'] = ['Spread not found.']
+            if deck is not None and spread is not None:
+                mismatch = deck_spread_mismatch(deck, spread)
+                if mismatch:
+                    item_errors['non_field_errors'] = [mismatch]
+            item['deck'] = deck
+            item['spread'] = spread
+            errors.append(item_errors)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return items
+
+
+class ReadingBatchItemSerializer(ReadingRequestSerializer):
+    """One reading in a batch; use with many=True."""
+
+    class Meta:
+        list_serializer_class = ReadingBatchListSerializer
@@ -1,15 +1,211 @@
 """
 Shuffling algorithms that simulate physical card handling.
 
-A "deck" throughout this module is a list of dicts:
+The working representation is a PackedDeck: parallel compact arrays of
+card ids and orientation flags, so a shuffle pass moves machine integers
+around instead of allocating a dict per card.
+
+The original dict format is still accepted everywhere:
     [{'card_id': int, 'is_reversed': bool}, ...]
 
-All functions return a new list and do not mutate the input.
+Pass a list of dicts in and you get a list of dicts back; pass a
+PackedDeck in and you get a PackedDeck back.
+
+Every pass is first planned as a ShufflePlan — a permutation of deck
+positions plus an orientation-flip mask — and only then applied. Plans
+compose, so full_shuffle folds the whole ritual into one plan and
+touches the deck once. The same plan can be applied to any deck of the
+same size, or logged for audit.
+
+Every function takes an optional ``rng`` (a random.Random); without one
+it draws from the random module's global generator. Seeding the rng
+makes a shuffle reproducible — see draw_seeded.
+
+All functions return a new deck and do not mutate the input.
 """
+import hashlib
 import random
+import secrets
+from array import array
+from bisect import bisect
+from functools import lru_cache, wraps
+from math import exp, lgamma
+
+
+class PackedDeck:
+    """
+    Compact deck: ``card_ids[i]`` is the id of the card at position i
+    (0 = top), ``reversed[i]`` is 1 if that card is upside down.
+    """
+
+    __slots__ = ('card_ids', 'reversed')
+
+    def __init__(self, card_ids: array, reversed: bytearray):
+        if len(card_ids) != len(reversed):
+            raise ValueError('card_ids and reversed must be the same length.')
+        self.card_ids = card_ids
+        self.reversed = reversed
+
+    @classmethod
+    def from_ids(cls, card_ids) -> 'PackedDeck':
+        """Build an all-upright deck from an iterable of card ids."""
+        ids = list(card_ids)
+        return cls(_id_array(ids), bytearray(len(ids)))
+
+    @classmethod
+    def from_dicts(cls, deck: list[dict]) -> 'PackedDeck':
+        return cls(
+            _id_array([c['card_id'] for c in deck]),
+            bytearray(1 if c['is_reversed'] else 0 for c in deck),
+        )
+
+    def to_dicts(self) -> list[dict]:
+        return [
+            {'card_id': card_id, 'is_reversed': bool(rev)}
+            for card_id, rev in zip(self.card_ids, self.reversed)
+        ]
+
+    def copy(self) -> 'PackedDeck':
+        return PackedDeck(array(self.card_ids.typecode, self.card_ids), bytearray(self.reversed))
+
+    def __len__(self):
+        return len(self.card_ids)
+
+    def __iter__(self):
+        for card_id, rev in zip(self.card_ids, self.reversed):
+            yield card_id, bool(rev)
 
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PackedDeck(self.card_ids[index], self.reversed[index])
+        return self.card_ids[index], bool(self.reversed[index])
 
-def overhand_shuffle(deck: list[dict]) -> list[dict]:
+    def __eq__(self, other):
+        if not isinstance(other, PackedDeck):
+            return NotImplemented
+        return self.card_ids == other.card_ids and self.reversed == other.reversed
+
+    def __repr__(self):
+        return f'PackedDeck({len(self)} cards)'
+
+
+def _id_array(ids: list[int]) -> array:
+    # 'H' (2 bytes/card) covers every realistic catalog; fall back to a
+    # wider type rather than overflow if primary keys ever grow past it.
+    typecode = 'H' if not ids or max(ids) < 1 << 16 else 'Q'
+    return array(typecode, ids)
+
+
+def _accepts_dict_deck(func):
+    """
+    Let a PackedDeck-based pass also take and return the legacy
+    list-of-dicts format.
+    """
+    @wraps(func)
+    def wrapper(deck, *args, **kwargs):
+        if isinstance(deck, PackedDeck):
+            return func(deck, *args, **kwargs)
+        return func(PackedDeck.from_dicts(deck), *args, **kwargs).to_dicts()
+    return wrapper
+
+
+class ShufflePlan:
+    """
+    The effect of one or more shuffle passes on an n-card deck.
+
+    Output position i receives the card from input position ``order[i]``,
+    turned over if ``flips[i]`` is 1. Internally both are packed into one
+    list of ``(source << 1) | flip`` moves, so a card and its orientation
+    travel together through every pass.
+    """
+
+    __slots__ = ('moves',)
+
+    def __init__(self, moves: list[int]):
+        self.moves = moves
+
+    @classmethod
+    def identity(cls, n: int) -> 'ShufflePlan':
+        return cls(list(range(0, 2 * n, 2)))
+
+    @classmethod
+    def from_order(cls, order, flips=None) -> 'ShufflePlan':
+        """Build a plan from a permutation vector and optional flip mask."""
+        if flips is None:
+            return cls([source << 1 for source in order])
+        if len(order) != len(flips):
+            raise ValueError('order and flips must be the same length.')
+        return cls([(source << 1) | (flip & 1) for source, flip in zip(order, flips)])
+
+    @property
+    def order(self) -> array:
+        return array(_index_typecode(len(self)), [move >> 1 for move in self.moves])
+
+    @property
+    def flips(self) -> bytearray:
+        return bytearray([move & 1 for move in self.moves])
+
+    def then(self, other: 'ShufflePlan') -> 'ShufflePlan':
+        """The plan for applying self first and other second."""
+        if len(other) != len(self):
+            raise ValueError('Cannot compose plans for different deck sizes.')
+        moves = self.moves
+        return ShufflePlan([moves[move >> 1] ^ (move & 1) for move in other.moves])
+
+    def apply(self, deck: PackedDeck) -> PackedDeck:
+        if len(deck) != len(self):
+            raise ValueError(f'Plan is for {len(self)} cards, deck has {len(deck)}.')
+        card_ids, rev = deck.card_ids.tolist(), deck.reversed
+        return PackedDeck(
+            array(deck.card_ids.typecode, [card_ids[move >> 1] for move in self.moves]),
+            bytearray([rev[move >> 1] ^ (move & 1) for move in self.moves]),
+        )
+
+    def draw(self, deck: PackedDeck, k: int) -> PackedDeck:
+        """The top k cards of apply(deck), without building the rest."""
+        if len(deck) != len(self):
+            raise ValueError(f'Plan is for {len(self)} cards, deck has {len(deck)}.')
+        return _take(deck, self.moves[:k])
+
+    def as_dict(self) -> dict:
+        """JSON-friendly form, for logging or auditing a shuffle."""
+        return {'order': [move >> 1 for move in self.moves], 'flips': [move & 1 for move in self.moves]}
+
+    def __len__(self):
+        return len(self.moves)
+
+    def __eq__(self, other):
+        if not isinstance(other, ShufflePlan):
+            return NotImplemented
+        return self.moves == other.moves
+
+    def __repr__(self):
+        return f'ShufflePlan({len(self)} cards)'
+
+
+def _index_typecode(n: int) -> str:
+    return 'H' if n <= 1 << 16 else 'I'
+
+
+def _rng(rng: random.Random | None):
+    # The random module's functions share its hidden global Random instance
+    return random if rng is None else rng
+
+
+# ---------------------------------------------------------------------------
+# Pass planners
+#
+# Each pass is written once, as a function that shuffles a list of moves.
+# Run on the identity it yields that pass's own plan; run on an existing
+# plan's moves it composes the pass onto that plan with list slicing
+# rather than a per-card lookup.
+# ---------------------------------------------------------------------------
+
+# Chance that an overhand packet is physically flipped
+OVERHAND_FLIP_CHANCE = 0.20
+
+
+def plan_overhand(n: int, rng: random.Random | None = None) -> ShufflePlan:
     """
     One overhand shuffle pass — the most common real-world method.
 
@@ -20,96 +216,440 @@ def overhand_shuffle(deck: list[dict]) -> list[dict]:
     ~20% chance per packet that it gets physically flipped, reversing
     both the card orientations within it and their order.
     """
-    source = list(deck)
-    destination: list[dict] = []
+    return ShufflePlan(_overhand(ShufflePlan.identity(n).moves, _rng(rng)))
 
-    while source:
-        chunk_size = random.randint(3, 12)
-        chunk = source[:chunk_size]
-        source = source[chunk_size:]
 
-        if random.random() < 0.20:
+def _overhand(moves: list[int], rng: random.Random) -> list[int]:
+    # Packets are stacked bottom-up in the order they are taken, then the
+    # whole pile is turned over once so the last packet ends up on top.
+    # Unflipped packets go in back to front so that final reverse restores
+    # their order; flipped ones go in as-is so it reverses them.
+    n = len(moves)
+    result: list[int] = []
+    start = 0
+    while start < n:
+        end = start + _packet_size(rng)
+        packet = moves[start:end]
+        if rng.random() < OVERHAND_FLIP_CHANCE:
             # Flip the whole packet: reverse order + toggle each card's orientation
-            chunk = [
-                {'card_id': c['card_id'], 'is_reversed': not c['is_reversed']}
-                for c in reversed(chunk)
-            ]
+            packet = [move ^ 1 for move in packet]
+        else:
+            packet.reverse()
+        result += packet
+        start = end
+    result.reverse()
+    return result
+
+
+def _packet_size(rng: random.Random) -> int:
+    """
+    rng.randint(3, 12), minus randint's call overhead — it is drawn
+    once per packet, dozens of times per shuffle. Consumes exactly the
+    same random bits (4-bit rejection sampling), so seeded results match.
+    """
+    r = rng.getrandbits(4)
+    while r >= 10:
+        r = rng.getrandbits(4)
+    return 3 + r
 
-        destination = chunk + destination
 
-    return destination
+RIFFLE_WEIGHTED = 'weighted'
+RIFFLE_GSR = 'gsr'
+RIFFLE_MODES = (RIFFLE_WEIGHTED, RIFFLE_GSR)
 
 
-def riffle_shuffle(deck: list[dict]) -> list[dict]:
+def plan_riffle(n: int, mode: str = RIFFLE_WEIGHTED, rng: random.Random | None = None) -> ShufflePlan:
     """
     One riffle shuffle pass.
 
     Splits the deck roughly in half (±5 card variance), then interleaves
     the two halves with weighted randomness — not a perfect alternation,
     which is physically unrealistic anyway.
+
+    mode='gsr' uses the Gilbert–Shannon–Reeds model instead: a binomial
+    split, with the whole interleave pattern drawn in one batch.
     """
-    if len(deck) < 4:
-        return list(deck)
+    if mode not in RIFFLE_MODES:
+        raise ValueError(f'Unknown riffle mode {mode!r}.')
+    return ShufflePlan(_riffle(ShufflePlan.identity(n).moves, mode, _rng(rng)))
+
+
+def _riffle(moves: list[int], mode: str, rng: random.Random) -> list[int]:
+    n = len(moves)
+    if n < 4:
+        return list(moves)
+
+    if mode == RIFFLE_GSR:
+        split = bin(rng.getrandbits(n)).count('1')
+        # Every interleaving of the two halves is equally likely under GSR,
+        # which is the same as picking which output slots the left half fills.
+        left_slots = set(rng.sample(range(n), split))
+        from_left = [i in left_slots for i in range(n)]
+    else:
+        mid = n // 2
+        variance = rng.randint(-5, 5)
+        split = max(1, min(n - 1, mid + variance))
+        from_left = _weighted_interleave(split, n - split, rng)
 
-    mid = len(deck) // 2
-    variance = random.randint(-5, 5)
-    split = max(1, min(len(deck) - 1, mid + variance))
+    left = iter(moves[:split])
+    right = iter(moves[split:])
+    return [next(left) if take_left else next(right) for take_left in from_left]
 
-    left = list(deck[:split])
-    right = list(deck[split:])
-    result: list[dict] = []
 
+def _weighted_interleave(left: int, right: int, rng: random.Random) -> list[bool]:
+    """
+    Drop pattern for a riffle: True where the next card comes off the
+    left pile. Runs until one pile is empty; the rest drop in order.
+    """
+    pattern: list[bool] = []
     while left and right:
         # Weight toward the larger pile — that's where thumbs slip first
-        if random.random() < len(left) / (len(left) + len(right)):
-            result.append(left.pop(0))
+        if rng.random() < left / (left + right):
+            pattern.append(True)
+            left -= 1
         else:
-            result.append(right.pop(0))
-
-    result.extend(left)
-    result.extend(right)
-    return result
+            pattern.append(False)
+            right -= 1
+    pattern.extend([True] * left)
+    pattern.extend([False] * right)
+    return pattern
 
 
-def cut(deck: list[dict]) -> list[dict]:
+def plan_cut(n: int, rng: random.Random | None = None) -> ShufflePlan:
     """
     Cut the deck at a random point in the middle 35–65% range.
     The bottom portion moves to the top.
     """
-    if len(deck) < 4:
-        return list(deck)
+    return ShufflePlan(_cut(ShufflePlan.identity(n).moves, _rng(rng)))
+
+
+def _cut(moves: list[int], rng: random.Random) -> list[int]:
+    n = len(moves)
+    if n < 4:
+        return list(moves)
+
+    lo = int(n * 0.35)
+    hi = int(n * 0.65)
+    cut_point = rng.randint(lo, hi)
+    return moves[cut_point:] + moves[:cut_point]
 
-    lo = int(len(deck) * 0.35)
-    hi = int(len(deck) * 0.65)
-    cut_point = random.randint(lo, hi)
-    return deck[cut_point:] + deck[:cut_point]
 
+# The hand-shuffle ritual, as (pass, repetitions)
+RITUAL = (
+    ('overhand', 5),
+    ('riffle', 2),
+    ('cut', 1),
+    ('overhand', 2),
+    ('cut', 1),
+)
 
-def full_shuffle(deck: list[dict]) -> list[dict]:
+
+def plan_full_shuffle(n: int, riffle: str = RIFFLE_WEIGHTED,
+                      rng: random.Random | None = None) -> ShufflePlan:
     """
     Composite shuffle sequence that mimics a realistic hand-shuffle ritual:
 
         overhand × 5  →  riffle × 2  →  cut  →  overhand × 2  →  cut
 
-    Returns the shuffled deck.
+    `riffle` picks the riffle model ('weighted' or 'gsr'). The passes are
+    composed into a single plan; no intermediate deck is built.
     """
-    result = list(deck)
+    if riffle not in RIFFLE_MODES:
+        raise ValueError(f'Unknown riffle mode {riffle!r}.')
+    rng = _rng(rng)
+    passes = {
+        'overhand': _overhand,
+        'riffle': lambda moves, rng: _riffle(moves, riffle, rng),
+        'cut': _cut,
+    }
+    moves = ShufflePlan.identity(n).moves
+    for name, repetitions in RITUAL:
+        for _ in range(repetitions):
+            moves = passes[name](moves, rng)
+    return ShufflePlan(moves)
 
-    for _ in range(5):
-        result = overhand_shuffle(result)
-    for _ in range(2):
-        result = riffle_shuffle(result)
-    result = cut(result)
-    for _ in range(2):
-        result = overhand_shuffle(result)
-    result = cut(result)
 
-    return result
+# ---------------------------------------------------------------------------
+# Lazy top-k draw
+#
+# A spread only looks at the top few cards, so instead of shuffling the
+# whole deck we walk the ritual backwards from those output slots, asking
+# each pass only "which input slot lands here, and was it flipped?".
+# Each pass's randomness is sampled just around the cards being traced,
+# from the exact conditional distributions of the forward algorithm, so
+# the drawn cards are distributed exactly as full_shuffle(deck)[:k].
+# ---------------------------------------------------------------------------
+
+def trace_top(n: int, k: int, riffle: str = RIFFLE_WEIGHTED,
+              rng: random.Random | None = None) -> list[int]:
+    """
+    Moves for the top k cards of a full ritual on an n-card deck, in
+    ShufflePlan's ``(source << 1) | flip`` form: entry i says which
+    starting position ends up in slot i, and whether it ends up turned.
+    """
+    if riffle not in RIFFLE_MODES:
+        raise ValueError(f'Unknown riffle mode {riffle!r}.')
+    k = min(k, n)
+    rng = _rng(rng)
+    traced = {
+        'overhand': _trace_overhand,
+        'riffle': lambda positions, size, rng: _trace_riffle(positions, size, riffle, rng),
+        'cut': _trace_cut,
+    }
+    # moves[i] tracks slot i back through the passes seen so far
+    moves = list(range(0, 2 * k, 2))
+    for name, repetitions in reversed(RITUAL):
+        for _ in range(repetitions):
+            back = traced[name]([move >> 1 for move in moves], n, rng)
+            moves = [b ^ (move & 1) for b, move in zip(back, moves)]
+    return moves
+
+
+def _trace_cut(positions: list[int], n: int, rng: random.Random) -> list[int]:
+    if n < 4:
+        return [p << 1 for p in positions]
+    cut_point = rng.randint(int(n * 0.35), int(n * 0.65))
+    return [((p + cut_point) % n) << 1 for p in positions]
+
+
+def _trace_riffle(positions: list[int], n: int, mode: str, rng: random.Random) -> list[int]:
+    if n < 4:
+        return [p << 1 for p in positions]
+
+    if mode == RIFFLE_GSR:
+        split = bin(rng.getrandbits(n)).count('1')
+    else:
+        split = max(1, min(n - 1, n // 2 + rng.randint(-5, 5)))
+
+    # Both riffle models drop a uniformly random interleaving of the two
+    # halves. Walk the output slots we need in order: the number of left
+    # cards in each gap between them is hypergeometric, and each needed
+    # slot comes off the left pile with probability left / remaining.
+    left_remaining, right_remaining = split, n - split
+    lefts_before = 0
+    cursor = 0
+    back = {}
+    for p in sorted(positions):
+        gap = p - cursor
+        if gap:
+            took = _hypergeometric(left_remaining, right_remaining, gap, rng)
+            lefts_before += took
+            left_remaining -= took
+            right_remaining -= gap - took
+        if rng.random() * (left_remaining + right_remaining) < left_remaining:
+            back[p] = lefts_before << 1
+            lefts_before += 1
+            left_remaining -= 1
+        else:
+            back[p] = (split + p - lefts_before) << 1
+            right_remaining -= 1
+        cursor = p + 1
+    return [back[p] for p in positions]
+
+
+def _trace_overhand(positions: list[int], n: int, rng: random.Random) -> list[int]:
+    # Packets taken from the top of the input are stacked in reverse, so
+    # output slot j lies in the packet that covers input index n - 1 - j.
+    # Packet starts form a renewal process from index 0, so the packet
+    # covering m depends only on the distance from the last known start.
+    table = _cover_table(n)
+    back = {}
+    packet_start = packet_end = 0
+    flipped = False
+    for m in sorted(n - 1 - p for p in positions):
+        if m >= packet_end:
+            cumulative, outcomes = table[m - packet_end]
+            offset, size = outcomes[bisect(cumulative, rng.random() * cumulative[-1])]
+            packet_start = packet_end + offset
+            packet_end = min(n, packet_start + size)
+            flipped = rng.random() < OVERHAND_FLIP_CHANCE
+        if flipped:
+            back[n - 1 - m] = (m << 1) | 1
+        else:
+            back[n - 1 - m] = (packet_start + packet_end - 1 - m) << 1
+    return [back[p] for p in positions]
+
+
+@lru_cache(maxsize=None)
+def _cover_table(n: int) -> list[tuple[list[float], list[tuple[int, int]]]]:
+    """
+    For each distance d below a known packet start, the joint distribution
+    of the packet that covers that card: (offset of its start, its drawn
+    size), as a cumulative-weight list for bisecting.
+
+    A packet starts at offset o with renewal probability u[o]; its size is
+    uniform over 3–12 and it covers the card when o + size > d.
+    """
+    u = [0.0] * max(n, 1)
+    u[0] = 1.0
+    for d in range(3, n):
+        u[d] = sum(u[d - size] for size in range(3, min(d, 12) + 1)) / 10
+
+    table = []
+    for d in range(n):
+        cumulative: list[float] = []
+        outcomes: list[tuple[int, int]] = []
+        total = 0.0
+        for offset in range(max(0, d - 11), d + 1):
+            for size in range(max(3, d - offset + 1), 13):
+                total += u[offset]
+                cumulative.append(total)
+                outcomes.append((offset, size))
+        table.append((cumulative, outcomes))
+    return table
+
+
+def _hypergeometric(good: int, bad: int, draws: int, rng: random.Random) -> int:
+    """
+    How many of `draws` cards taken without replacement from good + bad
+    are good. Inverts the pmf outward from the mode, so the expected work
+    is proportional to the spread of the distribution, not its size.
+    """
+    lo, hi = max(0, draws - bad), min(draws, good)
+    if lo == hi:
+        return lo
+    total = good + bad
+    mode = min(hi, max(lo, (draws + 1) * (good + 1) // (total + 2)))
+
+    def pmf(x):
+        return exp(
+            _log_comb(good, x) + _log_comb(bad, draws - x) - _log_comb(total, draws)
+        )
+
+    u = rng.random() - pmf(mode)
+    left, right = mode - 1, mode + 1
+    p_left = p_right = pmf(mode)
+    while u > 0 and (left >= lo or right <= hi):
+        if right <= hi:
+            x = right - 1
+            p_right *= (good - x) * (draws - x) / ((x + 1) * (bad - draws + x + 1))
+            u -= p_right
+            if u <= 0:
+                return right
+            right += 1
+        if left >= lo:
+            x = left + 1
+            p_left *= x * (bad - draws + x) / ((good - x + 1) * (draws - x + 1))
+            u -= p_left
+            if u <= 0:
+                return left
+            left -= 1
+    # Only reachable through floating-point rounding in the tail
+    return mode
+
+
+def _log_comb(n: int, k: int) -> float:
+    return lgamma(n + 1) - lgamma(k + 1) - lgamma(n - k + 1)
+
+
+# ---------------------------------------------------------------------------
+# Deck-level passes
+# ---------------------------------------------------------------------------
+
+@_accepts_dict_deck
+def overhand_shuffle(deck: PackedDeck, rng: random.Random | None = None) -> PackedDeck:
+    """One overhand shuffle pass. See plan_overhand."""
+    return plan_overhand(len(deck), rng).apply(deck)
+
+
+@_accepts_dict_deck
+def riffle_shuffle(deck: PackedDeck, mode: str = RIFFLE_WEIGHTED,
+                   rng: random.Random | None = None) -> PackedDeck:
+    """One riffle shuffle pass. See plan_riffle."""
+    return plan_riffle(len(deck), mode, rng).apply(deck)
+
+
+@_accepts_dict_deck
+def cut(deck: PackedDeck, rng: random.Random | None = None) -> PackedDeck:
+    """Cut the deck once. See plan_cut."""
+    return plan_cut(len(deck), rng).apply(deck)
+
+
+@_accepts_dict_deck
+def full_shuffle(deck: PackedDeck, riffle: str = RIFFLE_WEIGHTED,
+                 rng: random.Random | None = None) -> PackedDeck:
+    """
+    The full hand-shuffle ritual (see plan_full_shuffle), applied to the
+    deck in one step. Returns the shuffled deck.
+    """
+    return plan_full_shuffle(len(deck), riffle, rng).apply(deck)
+
+
+@_accepts_dict_deck
+def draw_top(deck: PackedDeck, k: int, riffle: str = RIFFLE_WEIGHTED,
+             rng: random.Random | None = None) -> PackedDeck:
+    """
+    The top k cards of full_shuffle(deck), computed without shuffling the
+    rest of the deck (see trace_top). Cost grows with k, not deck size.
+    """
+    return _take(deck, trace_top(len(deck), k, riffle, rng))
+
+
+def _take(deck: PackedDeck, moves: list[int]) -> PackedDeck:
+    card_ids, rev = deck.card_ids, deck.reversed
+    return PackedDeck(
+        array(card_ids.typecode, [card_ids[move >> 1] for move in moves]),
+        bytearray([rev[move >> 1] ^ (move & 1) for move in moves]),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Seeded draws
+#
+# A reading stores its seed and the version of the algorithm that drew it,
+# so the same cards can be drawn again later. Never change what an
+# existing version does — add a new one.
+#
+# The draw also depends on the deck's exact card ids and their order, so a
+# reading records the deck's fingerprint too, and redrawing against a
+# changed deck is refused rather than returning different cards.
+# ---------------------------------------------------------------------------
+
+# Top k of plan_full_shuffle(n, rng=Random(seed)) — how pooled shuffles are made
+SHUFFLE_VERSION_FULL_PLAN = 1
+# trace_top(n, k, rng=Random(seed)) — the on-demand lazy draw
+SHUFFLE_VERSION_TOP_K = 2
+SHUFFLE_VERSIONS = (SHUFFLE_VERSION_FULL_PLAN, SHUFFLE_VERSION_TOP_K)
+
+
+class DeckChangedError(ValueError):
+    """The deck differs from the one a seeded draw was made from."""
+
+
+def new_seed() -> int:
+    """A fresh 63-bit seed (fits a signed BIGINT column)."""
+    return secrets.randbits(63)
+
+
+def deck_fingerprint(deck: PackedDeck) -> str:
+    """`<card count>:<hash of the card ids in order>` — what a seeded draw depends on."""
+    digest = hashlib.sha1(','.join(map(str, deck.card_ids)).encode()).hexdigest()
+    return f'{len(deck)}:{digest[:16]}'
+
+
+@_accepts_dict_deck
+def draw_seeded(deck: PackedDeck, k: int, seed: int, version: int,
+                fingerprint: str | None = None) -> PackedDeck:
+    """
+    Redraw the top k cards a given seed and algorithm version produced.
+    Given the deck_fingerprint recorded at the draw, raises DeckChangedError
+    if the deck is no longer that deck.
+    """
+    if fingerprint is not None and fingerprint != deck_fingerprint(deck):
+        raise DeckChangedError(
+            f'Deck is {deck_fingerprint(deck)}, but the seed was drawn from {fingerprint}.'
+        )
+    rng = random.Random(seed)
+    if version == SHUFFLE_VERSION_FULL_PLAN:
+        return plan_full_shuffle(len(deck), rng=rng).draw(deck, k)
+    if version == SHUFFLE_VERSION_TOP_K:
+        return draw_top(deck, k, rng=rng)
+    raise ValueError(f'Unknown shuffle version {version!r}.')
 
 
-def build_deck(cards) -> list[dict]:
+def build_deck(cards) -> PackedDeck:
     """
-    Convert a queryset of Card objects into the shuffle-ready list format.
+    Convert a queryset of Card objects into the shuffle-ready PackedDeck.
     All cards start upright; the shuffle algorithms introduce reversals.
     """
-    return [{'card_id': card.id, 'is_reversed': False} for card in cards]
+    return PackedDeck.from_ids(card.id for card in cards)
@@ -0,0 +1,119 @@
+"""
+Stored responses for finished readings.
+
+Once every card of a reading has its interpretation, the reading never
+changes again. Its detail responses (full and compact) are then rendered
+once, into a ReadingSnapshot row, and the detail endpoints serve those
+bytes with a single primary-key lookup instead of prefetching four tables
+and serializing.
+
+A snapshot is written when the reading is created if its interpretations
+are already there, otherwise when its last queued interpretation
+finishes. Readings stored without their ReadingCard rows (see
+readings.stores_cards) get none: a snapshot is larger than the rows.
+`manage.py snapshot_readings` backfills older readings and checks stored
+snapshots against the live serializers.
+
+Bump SNAPSHOT_VERSION whenever the reading response format changes:
+snapshots from other versions are ignored until they are rewritten.
+Turned off with TAROT_READING_SNAPSHOTS=False.
+"""
+from django.conf import settings
+from django.db import transaction
+
+from .fast_serializers import compact_reading_data, reading_data
+from .models import Reading, ReadingCard, ReadingSnapshot
+from .renderers import CompactJSONRenderer, FastJSONRenderer
+
+SNAPSHOT_VERSION = 1
+
+
+def snapshots_enabled() -> bool:
+    return getattr(settings, 'TAROT_READING_SNAPSHOTS', True)
+
+
+def is_finished(reading) -> bool:
+    return reading.interpretation_status != ReadingCard.INTERPRETATION_PENDING
+
+
+def render_snapshot(reading) -> ReadingSnapshot:
+    """An unsaved snapshot of a reading whose deck, spread and drawn cards are loaded."""
+    return ReadingSnapshot(
+        reading=reading,
+        version=SNAPSHOT_VERSION,
+        body=FastJSONRenderer().render(reading_data(reading)).decode(),
+        compact_body=CompactJSONRenderer().render(compact_reading_data(reading)).decode(),
+    )
+
+
+def store_snapshots(readings):
+    """Snapshot the finished readings among these freshly created ones."""
+    if not snapshots_enabled():
+        return
+    snapshots = [render_snapshot(reading) for reading in readings if is_finished(reading)]
+    if snapshots:
+        ReadingSnapshot.objects.bulk_create(snapshots)
+
+
+def snapshot_reading(reading_id: int) -> ReadingSnapshot | None:
+    """(Re)write a reading's snapshot if it is finished. None if it isn't."""
+    reading = (
+        Reading.objects
+        .select_related('deck', 'spread')
+        .prefetch_related('spread__positions', 'cards__card', 'cards__position')
+        .filter(pk=reading_id)
+        .first()
+    )
+    if reading is None or not reading.cards.all() or not is_finished(reading):
+        return None
+    snapshot = render_snapshot(reading)
+    ReadingSnapshot.objects.update_or_create(
+        reading_id=reading_id,
+        defaults={
+            'version': snapshot.version,
+            'body': snapshot.body,
+            'compact_body': snapshot.compact_body,
+        },
+    )
+    return snapshot
+
+
+def snapshot_when_finished(reading_id: int):
+    """
+    Snapshot the reading once the current transaction commits, if its last
+    pending interpretation has finished by then. Checking after the commit
+    means that of two cards finishing at once, the later one to commit
+    sees both.
+    """
+    if not snapshots_enabled():
+        return
+
+    def snapshot_if_finished():
+        pending = ReadingCard.objects.filter(
+            reading_id=reading_id, interpretation_status=ReadingCard.INTERPRETATION_PENDING,
+        )
+        if not pending.exists():
+            snapshot_reading(reading_id)
+
+    transaction.on_commit(snapshot_if_finished)
+
+
+def _snapshot_body_query(reading_id: int, compact: bool):
+    return ReadingSnapshot.objects.filter(
+        reading_id=reading_id, version=SNAPSHOT_VERSION,
+    ).values_list('compact_body' if compact else 'body', flat=True)
+
+
+def get_snapshot_body(reading_id: int, compact: bool = False) -> bytes | None:
+    """The stored detail response for the reading, if there is a current one."""
+    if not snapshots_enabled():
+        return None
+    body = _snapshot_body_query(reading_id, compact).first()
+    return body.encode() if body is not None else None
+
+
+async def aget_snapshot_body(reading_id: int, compact: bool = False) -> bytes | None:
+    if not snapshots_enabled():
+        return None
+    body = await _snapshot_body_query(reading_id, compact).afirst()
+    return body.encode() if body is not None else None
@@ -0,0 +1,278 @@
+"""
+Server-Sent Events for a reading's interpretations (GET /api/readings/<id>/stream/).
+
+Cards are streamed in position order. Each card's stream is one
+`position_start`, then any number of `token` events, then
+`position_done` (or `position_failed`). One `end` event closes the stream:
+
+    event: position_start   {"position": 2, "offset": 0}
+    event: token            {"position": 2, "offset": 0, "text": "The "}
+    event: position_done    {"position": 2, "length": 312, "ttft_ms": 840}
+    event: end              {"reading": 7, "ttft_ms": 840}
+
+A seeded reading stored without card rows is redrawn from its seed. If its
+deck has changed since, the stream is just
+`end {"reading": 7, "error": "deck_changed"}`.
+
+Where the card's interpretation comes from depends on its state:
+
+- Finished cards are sent whole.
+- A pending card is claimed from the interpretation queue (tarot/jobs.py).
+  Its tokens are relayed from the interpreter as they are generated, or
+  from interpret.stream if the interpreter has one (see tarot/ollama.py).
+- A card another worker holds is polled until it finishes.
+
+Generation runs in a thread that passes tokens through a bounded buffer.
+If the client disconnects, the thread keeps going and saves the text.
+
+Resuming: every event carries an id of `<position>:<offset>`, so a
+reconnecting EventSource's Last-Event-ID (or `?last_event_id=`) restarts
+the stream at that character. `position_start` gives the offset the card
+resumes from. Clients should truncate that position's text to the offset
+before appending tokens, because a card whose generation was lost restarts
+from 0. Comment lines are sent as keepalives while waiting.
+
+Configured by the TAROT_READING_STREAM setting:
+
+    TAROT_READING_STREAM = {
+        'KEEPALIVE': 15,        # seconds of silence before a keepalive comment
+        'BUFFER_TOKENS': 256,   # tokens buffered per connection
+        'POLL_INTERVAL': 0.5,   # seconds between checks on cards workers hold
+        'RETRY_MS': 2000,       # client reconnect delay
+    }
+"""
+import asyncio
+import json
+import logging
+import queue
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
+
+from .jobs import claim_card_job, complete_job, fail_job, get_interpreter
+from .models import ReadingCard
+from .readings import drawn_cards_for
+from .shuffle import DeckChangedError
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'KEEPALIVE': 15,
+    'BUFFER_TOKENS': 256,
+    'POLL_INTERVAL': 0.5,
+    'RETRY_MS': 2000,
+}
+
+
+def _config() -> dict:
+    return {**DEFAULTS, **getattr(settings, 'TAROT_READING_STREAM', {})}
+
+
+def sse(event: str, data: dict, event_id: str | None = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data, ensure_ascii=False)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def parse_last_event_id(value: str | None) -> tuple[int, int]:
+    """(position, offset) to resume from; (0, 0) starts at the beginning."""
+    try:
+        position, offset = (value or '').split(':')
+        return int(position), max(0, int(offset))
+    except ValueError:
+        return 0, 0
+
+
+def token_stream(interpreter):
+    """A ReadingCard -> token iterator for the interpreter."""
+    stream = getattr(interpreter, 'stream', None)
+    if stream is not None:
+        return stream
+    return lambda reading_card: iter((interpreter(reading_card),))
+
+
+class TokenRelay:
+    """
+    Runs one claimed job's generation in a thread, passing tokens to the
+    connection through a bounded queue. When the queue is full the
+    generator waits for the client. Once detached, it finishes on its own.
+    """
+    DONE = object()
+
+    def __init__(self, job, stream, buffer_size: int):
+        self.job = job
+        self.stream = stream
+        self.tokens: queue.Queue = queue.Queue(maxsize=buffer_size)
+        self._detached = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f'token-relay-{job.id}', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def detach(self):
+        self._detached.set()
+
+    def _run(self):
+        parts = []
+        try:
+            for token in self.stream(self.job.reading_card):
+                parts.append(token)
+                self._put(token)
+        except Exception as exc:
+            logger.warning('Interpretation job %s failed: %s', self.job.id, exc)
+            fail_job(self.job, exc)
+            self._put(exc)
+        else:
+            complete_job(self.job, ''.join(parts))
+            self._put(self.DONE)
+        finally:
+            connection.close()
+
+    def _put(self, item):
+        while not self._detached.is_set():
+            try:
+                self.tokens.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+
+class _CardState:
+    __slots__ = ('status', 'length', 'first_token_at')
+
+    def __init__(self):
+        self.status = ReadingCard.INTERPRETATION_PENDING
+        self.length = 0
+        self.first_token_at = None
+
+    def token_sent(self):
+        if self.first_token_at is None:
+            self.first_token_at = time.monotonic()
+
+
+async def reading_events(reading, resume: tuple[int, int] = (0, 0)):
+    """Async iterator of SSE messages for the reading's interpretations."""
+    config = _config()
+    stream = token_stream(get_interpreter())
+    opened = time.monotonic()
+    first_token_at = None
+    resume_position, resume_offset = resume
+
+    yield f'retry: {config["RETRY_MS"]}\n\n'
+
+    reading_cards = [
+        reading_card async for reading_card in
+        ReadingCard.objects
+        .filter(reading=reading)
+        .select_related('reading', 'card', 'position')
+        .order_by('position__position_number')
+    ]
+    if not reading_cards and reading.seed is not None:
+        # Seeded reading stored without card rows: redraw (with stub text)
+        try:
+            reading_cards = await sync_to_async(drawn_cards_for)(reading)
+        except DeckChangedError:
+            logger.warning('Reading %s: deck changed since it was drawn; not redrawing.', reading.id)
+            yield sse('end', {'reading': reading.id, 'error': 'deck_changed'})
+            return
+
+    for reading_card in reading_cards:
+        position = reading_card.position.position_number
+        if position < resume_position:
+            continue
+        offset = resume_offset if position == resume_position else 0
+        started = time.monotonic()
+        state = _CardState()
+        async for message in _card_events(reading_card, offset, state, stream, config):
+            yield message
+
+        if state.status == ReadingCard.INTERPRETATION_DONE:
+            done = {'position': position, 'length': state.length}
+            if state.first_token_at is not None:
+                done['ttft_ms'] = round((state.first_token_at - started) * 1000)
+                first_token_at = first_token_at or state.first_token_at
+            yield sse('position_done', done, f'{position}:{state.length}')
+        else:
+            yield sse('position_failed', {'position': position}, f'{position}:0')
+
+    end = {'reading': reading.id}
+    if first_token_at is not None:
+        end['ttft_ms'] = round((first_token_at - opened) * 1000)
+        logger.info('Reading %s stream: first token after %sms', reading.id, end['ttft_ms'])
+    yield sse('end', end)
+
+
+async def _card_events(reading_card, offset: int, state: _CardState, stream, config):
+    """One card's position_start and token messages; the outcome goes in `state`."""
+    position = reading_card.position.position_number
+    while True:
+        if reading_card.interpretation_status == ReadingCard.INTERPRETATION_DONE:
+            text = reading_card.interpretation
+            offset = min(offset, len(text))
+            yield sse('position_start', {'position': position, 'offset': offset}, f'{position}:{offset}')
+            if offset < len(text):
+                state.token_sent()
+                yield sse('token', {'position': position, 'offset': offset, 'text': text[offset:]},
+                          f'{position}:{len(text)}')
+            state.status, state.length = ReadingCard.INTERPRETATION_DONE, len(text)
+            return
+        if reading_card.interpretation_status == ReadingCard.INTERPRETATION_FAILED:
+            state.status = ReadingCard.INTERPRETATION_FAILED
+            return
+
+        job = await sync_to_async(claim_card_job)(reading_card.id)
+        if job is None:
+            # A worker holds it: wait for the row to change
+            waited = 0.0
+            while reading_card.interpretation_status == ReadingCard.INTERPRETATION_PENDING:
+                await asyncio.sleep(config['POLL_INTERVAL'])
+                await _refresh(reading_card)
+                waited += config['POLL_INTERVAL']
+                if waited >= config['KEEPALIVE']:
+                    waited = 0.0
+                    yield ': keepalive\n\n'
+            continue
+
+        # Generate here. The card's text restarts from the beginning
+        relay = TokenRelay(job, stream, config['BUFFER_TOKENS'])
+        relay.start()
+        offset = 0
+        yield sse('position_start', {'position': position, 'offset': 0}, f'{position}:0')
+        try:
+            while True:
+                try:
+                    item = await asyncio.to_thread(relay.tokens.get, True, config['KEEPALIVE'])
+                except queue.Empty:
+                    yield ': keepalive\n\n'
+                    continue
+                if item is TokenRelay.DONE:
+                    state.status, state.length = ReadingCard.INTERPRETATION_DONE, offset
+                    return
+                if isinstance(item, Exception):
+                    break
+                state.token_sent()
+                yield sse('token', {'position': position, 'offset': offset, 'text': item},
+                          f'{position}:{offset + len(item)}')
+                offset += len(item)
+        finally:
+            relay.detach()
+        # Generation failed: the job was rescheduled or the card marked failed
+        await _refresh(reading_card)
+        offset = 0
+
+
+async def _refresh(reading_card):
+    row = await ReadingCard.objects.filter(id=reading_card.id).values(
+        'interpretation', 'interpretation_status',
+    ).afirst()
+    if row is None:
+        reading_card.interpretation_status = ReadingCard.INTERPRETATION_FAILED
+        return
+    reading_card.interpretation = row['interpretation']
+    reading_card.interpretation_status = row['interpretation_status']
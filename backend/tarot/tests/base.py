@@ -0,0 +1,35 @@
+"""Shared fixtures for the database-backed tests."""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from ..catalog import bump_catalog_version
+from ..models import Deck, Spread
+
+# Readings drawn inline: the pool's refill threads would outlive each test
+no_shuffle_pool = override_settings(TAROT_SHUFFLE_POOL={'ENABLED': False})
+
+
+class SeededDeckMixin:
+    """The Rider-Waite deck and Three Card spread from seed_deck, with fresh process caches."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        call_command('seed_deck', stdout=StringIO())
+        cls.deck = Deck.objects.get(name='Rider-Waite')
+        cls.spread = Spread.objects.get(name='Three Card')
+
+    def setUp(self):
+        super().setUp()
+        # Catalogs cached by earlier tests may hold rows rolled back since
+        bump_catalog_version()
+
+    def create_reading(self, question: str = 'What should I know?') -> dict:
+        """POST /api/readings/ and return the response body."""
+        response = self.client.post('/api/readings/', {
+            'deck_id': self.deck.id, 'spread_id': self.spread.id, 'question': question,
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()
@@ -0,0 +1,115 @@
+"""
+POST /api/readings/batch/: validation, response shape and chunked inserts.
+
+Usage:
+    docker compose exec backend python manage.py test tarot.tests.test_batch
+"""
+from unittest import mock
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from ..models import Reading, ReadingCard
+from .base import SeededDeckMixin, no_shuffle_pool
+
+URL = '/api/readings/batch/'
+
+
+@no_shuffle_pool
+class ReadingBatchTests(SeededDeckMixin, APITestCase):
+    def items(self, count: int) -> list[dict]:
+        return [
+            {'deck_id': self.deck.id, 'spread_id': self.spread.id, 'question': f'Question {i}'}
+            for i in range(count)
+        ]
+
+    def test_results_are_compact_and_in_request_order(self):
+        response = self.client.post(URL, self.items(3), format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        results = response.json()
+        readings = Reading.objects.in_bulk([result['id'] for result in results])
+        self.assertEqual(
+            [readings[result['id']].question for result in results],
+            ['Question 0', 'Question 1', 'Question 2'],
+        )
+        for result in results:
+            self.assertEqual(set(result), {'id', 'cards'})
+            self.assertEqual([card['position_number'] for card in result['cards']], [1, 2, 3])
+            stored = {
+                reading_card.position.position_number: reading_card
+                for reading_card in ReadingCard.objects.filter(reading_id=result['id'])
+                .select_related('position')
+            }
+            for card in result['cards']:
+                self.assertEqual(set(card), {'card_id', 'position_number', 'is_reversed'})
+                self.assertEqual(stored[card['position_number']].card_id, card['card_id'])
+                self.assertEqual(stored[card['position_number']].is_reversed, card['is_reversed'])
+
+    def test_errors_are_reported_per_item(self):
+        items = self.items(3)
+        items[1]['deck_id'] = 999999
+        items[2]['spread_id'] = 999999
+        response = self.client.post(URL, items, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), [
+            {}, {'deck_id': ['Deck not found.']}, {'spread_id': ['Spread not found.']},
+        ])
+        self.assertFalse(Reading.objects.exists())
+
+    def test_field_errors_are_reported_per_item(self):
+        items = self.items(2)
+        items[1]['question'] = ''
+        response = self.client.post(URL, items, format='json')
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()
+        self.assertEqual(errors[0], {})
+        self.assertIn('question', errors[1])
+        self.assertFalse(Reading.objects.exists())
+
+    def test_empty_batch_is_rejected(self):
+        response = self.client.post(URL, [], format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_body_must_be_a_list(self):
+        response = self.client.post(URL, self.items(1)[0], format='json')
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(TAROT_READING_BATCH_MAX=2)
+    def test_oversized_batch_is_rejected(self):
+        response = self.client.post(URL, self.items(3), format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Reading.objects.exists())
+
+    @override_settings(TAROT_READING_BATCH_CHUNK=2)
+    def test_chunks_commit_separately(self):
+        bulk_create = ReadingCard.objects.bulk_create
+        calls = []
+
+        def fail_second_chunk(objs, *args, **kwargs):
+            calls.append(objs)
+            if len(calls) == 2:
+                raise RuntimeError('Insert failed')
+            return bulk_create(objs, *args, **kwargs)
+
+        with mock.patch.object(ReadingCard.objects, 'bulk_create', side_effect=fail_second_chunk):
+            with self.assertRaises(RuntimeError):
+                self.client.post(URL, self.items(3), format='json')
+        # The first chunk's two readings stay; the second's is rolled back
+        self.assertEqual(
+            sorted(Reading.objects.values_list('question', flat=True)),
+            ['Question 0', 'Question 1'],
+        )
+        self.assertEqual(ReadingCard.objects.count(), 6)
+
+    def test_queries_do_not_grow_with_the_batch(self):
+        # Load the deck catalog first, so both batches find it cached
+        self.client.post(URL, self.items(1), format='json')
+        counts = []
+        for size in (1, 5):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(URL, self.items(size), format='json')
+            self.assertEqual(response.status_code, 201)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
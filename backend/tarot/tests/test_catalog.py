@@ -0,0 +1,31 @@
+"""
+The deck catalog cache's version (tarot/catalog.py).
+
+Usage:
+    docker compose exec backend python manage.py test tarot.tests.test_catalog
+"""
+from django.test import SimpleTestCase, override_settings
+
+from ..catalog import shared_version_enabled
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+REDIS = {'default': {
+    'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+    'LOCATION': 'redis://localhost:6379',
+}}
+
+
+class SharedVersionTests(SimpleTestCase):
+    @override_settings(CACHES=LOCMEM, TAROT_CATALOG_CACHE={})
+    def test_off_by_default_with_a_local_cache(self):
+        self.assertFalse(shared_version_enabled())
+
+    @override_settings(CACHES=REDIS, TAROT_CATALOG_CACHE={})
+    def test_on_by_default_with_a_shared_cache(self):
+        self.assertTrue(shared_version_enabled())
+
+    @override_settings(CACHES=REDIS, TAROT_CATALOG_CACHE={'SHARED_VERSION': False})
+    def test_setting_overrides(self):
+        self.assertFalse(shared_version_enabled())
+        with self.settings(CACHES=LOCMEM, TAROT_CATALOG_CACHE={'SHARED_VERSION': True}):
+            self.assertTrue(shared_version_enabled())
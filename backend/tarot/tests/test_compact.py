@@ -0,0 +1,114 @@
+"""
+The compact reading format (?format=compact) and sparse fieldsets (?fields=)
+on GET /api/readings/<id>/.
+
+Usage:
+    docker compose exec backend python manage.py test tarot.tests.test_compact
+"""
+from rest_framework.test import APITestCase
+
+from ..models import Card, ReadingCard, ReadingSnapshot
+from ..renderers import CompactJSONRenderer
+from .base import SeededDeckMixin, no_shuffle_pool
+
+
+@no_shuffle_pool
+class CompactReadingTests(SeededDeckMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.reading = self.create_reading()
+        self.url = f'/api/readings/{self.reading["id"]}/'
+
+    def assert_compact(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], CompactJSONRenderer.media_type)
+        data = response.json()
+        self.assertEqual(data['deck'], self.deck.id)
+        self.assertEqual(data['spread'], self.spread.id)
+        self.assertEqual(data['question'], self.reading['question'])
+        self.assertEqual(
+            [(card['id'], card['card'], card['position'], card['is_reversed']) for card in data['cards']],
+            [
+                (card['id'], card['card']['id'], card['position']['id'], card['is_reversed'])
+                for card in self.reading['cards']
+            ],
+        )
+
+    def test_format_parameter(self):
+        self.assert_compact(self.client.get(self.url, {'format': 'compact'}))
+
+    def test_accept_header(self):
+        self.assert_compact(self.client.get(self.url, HTTP_ACCEPT=CompactJSONRenderer.media_type))
+
+    def test_rendered_without_its_snapshot(self):
+        ReadingSnapshot.objects.all().delete()
+        self.assert_compact(self.client.get(self.url, {'format': 'compact'}))
+
+    def test_full_format_by_default(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json(), self.reading)
+
+    def test_ids_resolve_against_the_deck_cards(self):
+        response = self.client.get(f'/api/decks/{self.deck.id}/cards/')
+        self.assertEqual(response.status_code, 200)
+        cards = {card['id']: card for card in response.json()}
+        self.assertEqual(len(cards), Card.objects.filter(deck=self.deck).count())
+        compact = self.client.get(self.url, {'format': 'compact'}).json()
+        for card, full in zip(compact['cards'], self.reading['cards']):
+            self.assertEqual(cards[card['card']], full['card'])
+
+
+@no_shuffle_pool
+class SparseFieldsTests(SeededDeckMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.reading = self.create_reading()
+        self.url = f'/api/readings/{self.reading["id"]}/'
+
+    def test_top_level_fields(self):
+        response = self.client.get(self.url, {'fields': 'id,question'})
+        self.assertEqual(response.json(), {'id': self.reading['id'], 'question': self.reading['question']})
+
+    def test_nested_card_fields(self):
+        data = self.client.get(self.url, {'fields': 'id,cards.card'}).json()
+        self.assertEqual(set(data), {'id', 'cards'})
+        self.assertEqual(data['cards'], [{'card': card['card']} for card in self.reading['cards']])
+
+    def test_naming_a_nested_field_keeps_all_of_it(self):
+        data = self.client.get(self.url, {'fields': 'cards'}).json()
+        self.assertEqual(data, {'cards': self.reading['cards']})
+
+    def test_compact_fields(self):
+        data = self.client.get(self.url, {'format': 'compact', 'fields': 'cards.card,cards.is_reversed'}).json()
+        self.assertEqual(data, {'cards': [
+            {'card': card['card']['id'], 'is_reversed': card['is_reversed']}
+            for card in self.reading['cards']
+        ]})
+
+    def test_redrawn_reading_fields(self):
+        ReadingCard.objects.filter(reading_id=self.reading['id']).delete()
+        data = self.client.get(self.url, {'fields': 'cards.is_reversed'}).json()
+        self.assertEqual(data['cards'], [
+            {'is_reversed': card['is_reversed']} for card in self.reading['cards']
+        ])
+
+    def test_deeply_nested_fields(self):
+        data = self.client.get(self.url, {'fields': 'cards.card.name,spread.positions.name'}).json()
+        self.assertEqual(data, {
+            'spread': {'positions': [
+                {'name': position['name']} for position in self.reading['spread']['positions']
+            ]},
+            'cards': [{'card': {'name': card['card']['name']}} for card in self.reading['cards']],
+        })
+
+    def test_unknown_fields_are_rejected(self):
+        for fields in ('nope', 'cards.nope', 'cards.card.nope', 'id.nope', 'deck.name.nope'):
+            with self.subTest(fields=fields):
+                response = self.client.get(self.url, {'fields': fields})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {'fields': [f'Unknown field "{fields}".']})
+
+    def test_compact_ids_have_no_fields(self):
+        response = self.client.get(self.url, {'format': 'compact', 'fields': 'cards.card.name'})
+        self.assertEqual(response.status_code, 400)
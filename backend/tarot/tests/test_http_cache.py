@@ -0,0 +1,127 @@
+"""
+ETags, Cache-Control and 304s on the reading and catalog endpoints
+(tarot/http_cache.py).
+
+Usage:
+    docker compose exec backend python manage.py test tarot.tests.test_http_cache
+"""
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from ..http_cache import IMMUTABLE, NO_CACHE, REVALIDATE
+from ..models import Card
+from .base import SeededDeckMixin, no_shuffle_pool
+
+QUEUE_ON = {'ENABLED': True}
+
+
+@no_shuffle_pool
+class ReadingETagTests(SeededDeckMixin, APITestCase):
+    def test_finished_reading_is_immutable(self):
+        reading = self.create_reading()
+        response = self.client.get(f'/api/readings/{reading["id"]}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], IMMUTABLE)
+        self.assertTrue(response.has_header('ETag'))
+
+    def test_matching_etag_is_answered_without_queries(self):
+        reading = self.create_reading()
+        etag = self.client.get(f'/api/readings/{reading["id"]}/')['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(f'/api/readings/{reading["id"]}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response['Cache-Control'], IMMUTABLE)
+
+    def test_weak_etag_matches(self):
+        reading = self.create_reading()
+        etag = self.client.get(f'/api/readings/{reading["id"]}/')['ETag']
+        response = self.client.get(f'/api/readings/{reading["id"]}/', HTTP_IF_NONE_MATCH=f'W/{etag}')
+        self.assertEqual(response.status_code, 304)
+
+    def test_representations_have_different_etags(self):
+        reading = self.create_reading()
+        url = f'/api/readings/{reading["id"]}/'
+        etags = {
+            self.client.get(url)['ETag'],
+            self.client.get(url, {'format': 'compact'})['ETag'],
+            self.client.get(url, {'fields': 'id'})['ETag'],
+        }
+        self.assertEqual(len(etags), 3)
+
+    def test_stale_etag_gets_the_reading(self):
+        reading = self.create_reading()
+        response = self.client.get(f'/api/readings/{reading["id"]}/', HTTP_IF_NONE_MATCH='"something-else"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['id'], reading['id'])
+
+    def test_star_matches_a_finished_reading(self):
+        reading = self.create_reading()
+        for url in (f'/api/readings/{reading["id"]}/', f'/api/async/readings/{reading["id"]}/'):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='*').status_code, 304)
+
+    def test_star_on_a_missing_reading_is_not_found(self):
+        for url in ('/api/readings/999999/', '/api/async/readings/999999/'):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='*').status_code, 404)
+
+    @override_settings(TAROT_INTERPRETATION_QUEUE=QUEUE_ON)
+    def test_pending_reading_is_not_cached(self):
+        reading = self.create_reading()
+        self.assertEqual(reading['interpretation_status'], 'pending')
+        for url in (f'/api/readings/{reading["id"]}/', f'/api/async/readings/{reading["id"]}/'):
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH='*')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['Cache-Control'], NO_CACHE)
+                self.assertFalse(response.has_header('ETag'))
+
+
+@no_shuffle_pool
+class CatalogETagTests(SeededDeckMixin, APITestCase):
+    urls = ('/api/decks/', '/api/spreads/', '/api/catalog/')
+
+    def test_revalidation_costs_no_query(self):
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response['Cache-Control'], REVALIDATE)
+                with self.assertNumQueries(0):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+                self.assertEqual(response.status_code, 304)
+
+    def test_deck_cards_revalidate(self):
+        url = f'/api/decks/{self.deck.id}/cards/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_committed_edit_changes_the_etags(self):
+        etags = {url: self.client.get(url)['ETag'] for url in self.urls}
+        card = Card.objects.filter(deck=self.deck).first()
+        card.meaning_upright = 'Rewritten.'
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            card.save()
+        self.assertTrue(callbacks)
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_edit_bumps_the_version_only_on_commit(self):
+        etag = self.client.get('/api/decks/')['ETag']
+        with self.captureOnCommitCallbacks(execute=False):
+            self.deck.save()
+            # Still inside the transaction: other connections can't see the edit yet
+            self.assertEqual(self.client.get('/api/decks/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_catalog_varies_on_encoding(self):
+        response = self.client.get('/api/catalog/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        not_modified = self.client.get(
+            '/api/catalog/', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertIn('Accept-Encoding', not_modified['Vary'])
+        identity = self.client.get('/api/catalog/', HTTP_ACCEPT_ENCODING='identity')
+        self.assertNotEqual(identity['ETag'], response['ETag'])
@@ -0,0 +1,56 @@
+"""
+Interpretation cache keys (tarot/interpretation_cache.py).
+
+Usage:
+    docker compose exec backend python manage.py test tarot.tests.test_interpretation_cache
+"""
+from django.test import SimpleTestCase
+
+from ..interpretation_cache import cache_key
+from ..models import Card, Reading, ReadingCard, SpreadPosition
+
+
+class CacheKeyTests(SimpleTestCase):
+    def reading_card(self, question='Will it rain?', is_reversed=False, **card_fields):
+        card = Card(**{
+            'id': 1, 'name': 'The Star', 'number': 17, 'arcana': Card.ARCANA_MAJOR,
+            'keywords_upright': ['hope', 'renewal'], 'keywords_reversed': ['despair'],
+            'meaning_upright': 'Hope.', 'meaning_reversed': 'Despair.', **card_fields,
+        })
+        position = SpreadPosition(id=2, position_number=1, name='Past', description='What was.')
+        return ReadingCard(
+            card=card, position=position, is_reversed=is_reversed,
+            reading=Reading(question=question),
+        )
+
+    def test_question_is_normalised(self):
+        self.assertEqual(
+            cache_key(self.reading_card('Will it rain?'), 'v1'),
+            cache_key(self.reading_card('  will IT rain '), 'v1'),
+        )
+
+    def test_card_text_in_the_prompt_changes_the_key(self):
+        key = cache_key(self.reading_card(), 'v1')
+        for changed in (
+            self.reading_card(meaning_upright='Hope, rewritten.'),
+            self.reading_card(keywords_upright=['hope']),
+        ):
+            self.assertNotEqual(cache_key(changed, 'v1'), key)
+
+    def test_text_for_the_other_orientation_does_not(self):
+        self.assertEqual(
+            cache_key(self.reading_card(), 'v1'),
+            cache_key(self.reading_card(meaning_reversed='Despair, rewritten.'), 'v1'),
+        )
+
+    def test_position_text_changes_the_key(self):
+        reading_card = self.reading_card()
+        key = cache_key(reading_card, 'v1')
+        reading_card.position.description = 'What came before.'
+        self.assertNotEqual(cache_key(reading_card, 'v1'), key)
+        reading_card.position.description = 'What was.'
+        reading_card.position.thematic_note = 'Look back.'
+        self.assertNotEqual(cache_key(reading_card, 'v1'), key)
+
+    def test_version_changes_the_key(self):
+        self.assertNotEqual(cache_key(self.reading_card(), 'v1'), cache_key(self.reading_card(), 'v2'))
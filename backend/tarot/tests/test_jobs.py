@@ -0,0 +1,98 @@
+"""
+The interpretation queue (tarot/jobs.py): claiming, leases and retries.
+
+Usage:
+    docker compose exec backend python manage.py test tarot.tests.test_jobs
+"""
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ..jobs import claim_card_job, claim_jobs, run_job
+from ..models import InterpretationJob, ReadingCard
+from ..readings import create_readings
+from .base import SeededDeckMixin
+
+QUEUE = {'ENABLED': True, 'MAX_ATTEMPTS': 2, 'RETRY_DELAY': 5, 'LEASE': 300}
+
+
+@override_settings(TAROT_INTERPRETATION_QUEUE=QUEUE, TAROT_INTERPRETATION_CACHE={'ENABLED': False})
+class ClaimJobsTests(SeededDeckMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        [self.reading] = create_readings([{'deck': self.deck, 'spread': self.spread, 'question': 'Q?'}])
+        self.long_ago = timezone.now() - timedelta(hours=1)
+
+    def expire_leases(self, attempts: int):
+        """As if every job's worker died on attempt `attempts`."""
+        InterpretationJob.objects.update(
+            status=InterpretationJob.STATUS_RUNNING,
+            attempts=attempts,
+            locked_until=timezone.now() - timedelta(seconds=1),
+            updated_at=self.long_ago,
+        )
+
+    def test_claims_pending_jobs(self):
+        jobs = claim_jobs(limit=10)
+        self.assertEqual(len(jobs), 3)
+        for job in InterpretationJob.objects.all():
+            self.assertEqual(job.status, InterpretationJob.STATUS_RUNNING)
+            self.assertEqual(job.attempts, 1)
+            self.assertIsNotNone(job.locked_until)
+
+    def test_expired_lease_with_attempts_left_is_claimed_again(self):
+        self.expire_leases(attempts=1)
+        jobs = claim_jobs(limit=10)
+        self.assertEqual(len(jobs), 3)
+        for job in InterpretationJob.objects.all():
+            self.assertEqual(job.attempts, 2)
+            self.assertGreater(job.updated_at, self.long_ago)
+
+    def test_expired_lease_on_last_attempt_fails_the_card(self):
+        self.expire_leases(attempts=2)
+        self.assertEqual(claim_jobs(limit=10), [])
+        for job in InterpretationJob.objects.all():
+            self.assertEqual(job.status, InterpretationJob.STATUS_FAILED)
+            self.assertEqual(job.attempts, 2)
+            self.assertIsNone(job.locked_until)
+            self.assertGreater(job.updated_at, self.long_ago)
+        self.assertEqual(
+            set(ReadingCard.objects.values_list('interpretation_status', flat=True)),
+            {ReadingCard.INTERPRETATION_FAILED},
+        )
+        # Nothing left to lease, now or later
+        self.assertEqual(claim_jobs(limit=10), [])
+
+    def test_claim_card_job_fails_a_job_out_of_attempts(self):
+        self.expire_leases(attempts=2)
+        card = ReadingCard.objects.filter(reading=self.reading).first()
+        self.assertIsNone(claim_card_job(card.id))
+        card.refresh_from_db()
+        self.assertEqual(card.interpretation_status, ReadingCard.INTERPRETATION_FAILED)
+
+    def test_failed_attempt_is_retried_then_fails_the_card(self):
+        def crash(reading_card):
+            raise RuntimeError('interpreter crashed')
+
+        [job] = claim_jobs()
+        self.assertFalse(run_job(job, crash))
+        job.refresh_from_db()
+        self.assertEqual(job.status, InterpretationJob.STATUS_PENDING)
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertEqual(job.last_error, 'RuntimeError: interpreter crashed')
+
+        job = claim_card_job(job.reading_card_id)
+        self.assertEqual(job.attempts, 2)
+        self.assertFalse(run_job(job, crash))
+        job.refresh_from_db()
+        self.assertEqual(job.status, InterpretationJob.STATUS_FAILED)
+        self.assertEqual(job.reading_card.interpretation_status, ReadingCard.INTERPRETATION_FAILED)
+
+    def test_completed_job_stores_the_interpretation(self):
+        [job] = claim_jobs()
+        self.assertTrue(run_job(job, lambda reading_card: 'The tower falls.'))
+        card = ReadingCard.objects.get(id=job.reading_card_id)
+        self.assertEqual(card.interpretation, 'The tower falls.')
+        self.assertEqual(card.interpretation_status, ReadingCard.INTERPRETATION_DONE)
+        self.assertEqual(InterpretationJob.objects.get(id=job.id).status, InterpretationJob.STATUS_DONE)
@@ -0,0 +1,43 @@
+"""
+The shuffle pool's refill threads (tarot/pool.py).
+
+Usage:
+    docker compose exec backend python manage.py test tarot.tests.test_pool
+"""
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from ..pool import ShufflePool
+
+
+class ShufflePoolTests(SimpleTestCase):
+    def wait_for_stock(self, pool, deck_id: int, ready: int):
+        deadline = time.monotonic() + 10
+        while pool.stats()['decks'][deck_id]['ready'] < ready:
+            self.assertLess(time.monotonic(), deadline, 'The pool was never refilled')
+            time.sleep(0.01)
+
+    def test_refill_error_leaves_the_worker_running(self):
+        pool = ShufflePool(size=4, low_water=2, refill_threads=1)
+        with mock.patch('tarot.pool.plan_full_shuffle', side_effect=RuntimeError('boom')), \
+                self.assertLogs('tarot.pool', 'ERROR'):
+            self.assertIsNone(pool.take(1, 78))
+            deadline = time.monotonic() + 10
+            while pool._pending:
+                self.assertLess(time.monotonic(), deadline, 'The refill never finished')
+                time.sleep(0.01)
+        worker, = pool._workers
+        self.assertTrue(worker.is_alive())
+        self.assertIsNone(pool.take(1, 78))
+        self.wait_for_stock(pool, 1, 4)
+
+    def test_dead_workers_are_replaced(self):
+        pool = ShufflePool(size=4, low_water=2, refill_threads=1)
+        dead = mock.Mock(is_alive=mock.Mock(return_value=False))
+        pool._workers = [dead]
+        pool.take(1, 78)
+        self.assertNotIn(dead, pool._workers)
+        self.assertEqual(len(pool._workers), 1)
+        self.wait_for_stock(pool, 1, 4)
@@ -0,0 +1,263 @@
+"""
+Seeded checks of the shuffle engines (tarot/shuffle.py, tarot/batch_shuffle.py),
+and of the buffered system generator (tarot/rng.py).
+
+Every test draws from fixed seeds, so each run sees the same numbers. The
+statistical tests use two-sample chi-square homogeneity tests and fail only
+below p = 0.001.
+
+Usage:
+    docker compose exec backend python manage.py test tarot.tests.test_shuffle
+"""
+import os
+import random
+from unittest import skipIf, skipUnless
+
+from django.test import SimpleTestCase
+
+from ..management.commands.analyze_shuffle import _chi_square_p
+from ..rng import BufferedSystemRandom
+from ..shuffle import (
+    RIFFLE_GSR,
+    RIFFLE_WEIGHTED,
+    SHUFFLE_VERSION_FULL_PLAN,
+    SHUFFLE_VERSION_TOP_K,
+    DeckChangedError,
+    PackedDeck,
+    deck_fingerprint,
+    draw_seeded,
+    full_shuffle,
+    plan_full_shuffle,
+    trace_top,
+)
+
+try:
+    import numpy as np
+
+    from ..batch_shuffle import batch_full_shuffle, batch_riffle
+except ImportError:
+    np = None
+
+SIGNIFICANCE = 0.001
+
+
+def _homogeneity_p(first: dict, second: dict) -> float:
+    """p-value that two tallies of the same categories come from one distribution."""
+    total_first, total_second = sum(first.values()), sum(second.values())
+    total = total_first + total_second
+    statistic = 0.0
+    categories = set(first) | set(second)
+    for category in categories:
+        count = first.get(category, 0) + second.get(category, 0)
+        for observed, sample_total in ((first.get(category, 0), total_first),
+                                       (second.get(category, 0), total_second)):
+            expected = count * sample_total / total
+            statistic += (observed - expected) ** 2 / expected
+    return _chi_square_p(statistic, len(categories) - 1)
+
+
+def _tally(samples) -> dict:
+    counts = {}
+    for sample in samples:
+        counts[sample] = counts.get(sample, 0) + 1
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# The dict-based ritual as it was before ShufflePlan, with the global random
+# module swapped for an injected rng. The weighted riffle must still draw the
+# same numbers, so seeded shuffles match it card for card.
+# ---------------------------------------------------------------------------
+
+def _reference_overhand(deck: list[dict], rng: random.Random) -> list[dict]:
+    source = list(deck)
+    destination: list[dict] = []
+    while source:
+        chunk_size = rng.randint(3, 12)
+        chunk = source[:chunk_size]
+        source = source[chunk_size:]
+        if rng.random() < 0.20:
+            chunk = [
+                {'card_id': c['card_id'], 'is_reversed': not c['is_reversed']}
+                for c in reversed(chunk)
+            ]
+        destination = chunk + destination
+    return destination
+
+
+def _reference_riffle(deck: list[dict], rng: random.Random) -> list[dict]:
+    if len(deck) < 4:
+        return list(deck)
+    split = max(1, min(len(deck) - 1, len(deck) // 2 + rng.randint(-5, 5)))
+    left = list(deck[:split])
+    right = list(deck[split:])
+    result: list[dict] = []
+    while left and right:
+        if rng.random() < len(left) / (len(left) + len(right)):
+            result.append(left.pop(0))
+        else:
+            result.append(right.pop(0))
+    result.extend(left)
+    result.extend(right)
+    return result
+
+
+def _reference_cut(deck: list[dict], rng: random.Random) -> list[dict]:
+    if len(deck) < 4:
+        return list(deck)
+    cut_point = rng.randint(int(len(deck) * 0.35), int(len(deck) * 0.65))
+    return deck[cut_point:] + deck[:cut_point]
+
+
+def _reference_full_shuffle(deck: list[dict], rng: random.Random) -> list[dict]:
+    result = list(deck)
+    for _ in range(5):
+        result = _reference_overhand(result, rng)
+    for _ in range(2):
+        result = _reference_riffle(result, rng)
+    result = _reference_cut(result, rng)
+    for _ in range(2):
+        result = _reference_overhand(result, rng)
+    return _reference_cut(result, rng)
+
+
+class FullShuffleTests(SimpleTestCase):
+    def test_matches_dict_algorithm_for_a_seed(self):
+        for n in (1, 3, 4, 5, 22, 78, 100):
+            deck = [{'card_id': card_id, 'is_reversed': False} for card_id in range(1, n + 1)]
+            for seed in range(20):
+                with self.subTest(n=n, seed=seed):
+                    expected = _reference_full_shuffle(deck, random.Random(seed))
+                    self.assertEqual(full_shuffle(deck, rng=random.Random(seed)), expected)
+                    packed = full_shuffle(PackedDeck.from_ids(range(1, n + 1)), rng=random.Random(seed))
+                    self.assertEqual(packed.to_dicts(), expected)
+
+    def test_draw_seeded_replays_the_full_plan(self):
+        deck = PackedDeck.from_ids(range(1, 79))
+        for seed in range(20):
+            shuffled = full_shuffle(deck, rng=random.Random(seed))
+            self.assertEqual(draw_seeded(deck, 10, seed, SHUFFLE_VERSION_FULL_PLAN), shuffled[:10])
+
+    def test_draw_seeded_refuses_a_changed_deck(self):
+        deck = PackedDeck.from_ids(range(1, 79))
+        fingerprint = deck_fingerprint(deck)
+        self.assertEqual(
+            draw_seeded(deck, 3, 7, SHUFFLE_VERSION_TOP_K, fingerprint),
+            draw_seeded(deck, 3, 7, SHUFFLE_VERSION_TOP_K),
+        )
+        changed = {
+            'card removed': PackedDeck.from_ids(range(1, 78)),
+            'card replaced': PackedDeck.from_ids([*range(1, 78), 79]),
+            'cards reordered': PackedDeck.from_ids([2, 1, *range(3, 79)]),
+        }
+        for change, changed_deck in changed.items():
+            with self.subTest(change=change):
+                with self.assertRaises(DeckChangedError):
+                    draw_seeded(changed_deck, 3, 7, SHUFFLE_VERSION_TOP_K, fingerprint)
+
+
+class RiffleModeTests(SimpleTestCase):
+    """The weighted and GSR riffles should leave the ritual's output distributed alike."""
+    shuffles = 10_000
+
+    def _ritual_tallies(self, riffle: str, seed: int) -> tuple[dict, dict]:
+        rng = random.Random(seed)
+        top_card, first_card_slot = {}, {}
+        for _ in range(self.shuffles):
+            moves = plan_full_shuffle(78, riffle, rng).moves
+            top_card[moves[0] >> 1] = top_card.get(moves[0] >> 1, 0) + 1
+            slot = next(slot for slot, move in enumerate(moves) if move >> 1 == 0)
+            first_card_slot[slot] = first_card_slot.get(slot, 0) + 1
+        return top_card, first_card_slot
+
+    def test_top_slot_and_position_distributions_match(self):
+        weighted_top, weighted_slot = self._ritual_tallies(RIFFLE_WEIGHTED, seed=0)
+        gsr_top, gsr_slot = self._ritual_tallies(RIFFLE_GSR, seed=100)
+        self.assertGreater(_homogeneity_p(weighted_top, gsr_top), SIGNIFICANCE)
+        self.assertGreater(_homogeneity_p(weighted_slot, gsr_slot), SIGNIFICANCE)
+
+
+class TraceTopTests(SimpleTestCase):
+    """trace_top(n, k) should draw like plan_full_shuffle(n).moves[:k]."""
+
+    def _compare(self, n: int, k: int, riffle: str, samples: int, seed: int):
+        rng = random.Random(seed)
+        planned = _tally(tuple(plan_full_shuffle(n, riffle, rng).moves[:k]) for _ in range(samples))
+        traced = _tally(tuple(trace_top(n, k, riffle, rng)) for _ in range(samples))
+        self.assertGreater(_homogeneity_p(planned, traced), SIGNIFICANCE)
+
+    def test_joint_top_two_on_a_small_deck(self):
+        for riffle in (RIFFLE_WEIGHTED, RIFFLE_GSR):
+            with self.subTest(riffle=riffle):
+                self._compare(8, 2, riffle, samples=20_000, seed=1)
+
+    def test_top_card_and_orientation_on_a_full_deck(self):
+        self._compare(78, 1, RIFFLE_WEIGHTED, samples=10_000, seed=2)
+
+    def test_tiny_decks(self):
+        for n in (1, 2, 3):
+            with self.subTest(n=n):
+                self._compare(n, n, RIFFLE_WEIGHTED, samples=2_000, seed=3)
+
+    def test_moves_are_distinct_sources(self):
+        rng = random.Random(4)
+        for _ in range(1_000):
+            sources = [move >> 1 for move in trace_top(78, 10, rng=rng)]
+            self.assertEqual(len(set(sources)), 10)
+
+
+@skipIf(np is None, 'NumPy is not installed')
+class BatchShuffleTests(SimpleTestCase):
+    def assertPermutations(self, cards, card_ids):
+        broken = np.flatnonzero((np.sort(cards, axis=1) != card_ids).any(axis=1))
+        self.assertEqual(broken.size, 0, f'{broken.size} decks are not permutations of the deck')
+
+    def test_every_deck_is_a_permutation(self):
+        card_ids = np.arange(1, 79)
+        rng = np.random.default_rng(5)
+        for riffle in (RIFFLE_WEIGHTED, RIFFLE_GSR):
+            with self.subTest(riffle=riffle):
+                for _ in range(5):
+                    cards, _ = batch_full_shuffle(card_ids, 50_000, riffle, rng)
+                    self.assertPermutations(cards, card_ids)
+
+    def test_riffle_with_tied_keys(self):
+        class TiedKeys:
+            """Generator whose uniform draws take only four values, so most tie."""
+            def __init__(self, rng):
+                self.rng = rng
+
+            def random(self, size, dtype=np.float64):
+                return (self.rng.integers(0, 4, size) / 4).astype(dtype)
+
+            def __getattr__(self, name):
+                return getattr(self.rng, name)
+
+        card_ids = np.arange(78)
+        cards = np.broadcast_to(card_ids, (1_000, 78)).copy()
+        reversed = np.zeros(cards.shape, dtype=bool)
+        for riffle in (RIFFLE_WEIGHTED, RIFFLE_GSR):
+            with self.subTest(riffle=riffle):
+                shuffled, _ = batch_riffle(cards, reversed, TiedKeys(np.random.default_rng(6)), riffle)
+                self.assertPermutations(shuffled, card_ids)
+
+
+@skipUnless(hasattr(os, 'fork'), 'needs os.fork')
+class BufferedSystemRandomTests(SimpleTestCase):
+    def test_forked_child_discards_the_buffer(self):
+        rng = BufferedSystemRandom()
+        rng.getrandbits(64)  # fill the buffer
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                os.close(read_fd)
+                os.write(write_fd, rng.randbytes(64))
+            finally:
+                os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd, 'rb') as pipe:
+            child_bytes = pipe.read()
+        os.waitpid(pid, 0)
+        self.assertEqual(len(child_bytes), 64)
+        self.assertNotEqual(child_bytes, rng.randbytes(64))
@@ -0,0 +1,132 @@
+"""
+Reading snapshots (tarot/snapshots.py): when they are written, what they
+hold, and the snapshot_readings command.
+
+Usage:
+    docker compose exec backend python manage.py test tarot.tests.test_snapshots
+"""
+import json
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from ..jobs import claim_jobs, run_job
+from ..models import Reading, ReadingCard, ReadingSnapshot
+from ..readings import interpret_stub
+from ..serializers import CompactReadingSerializer, ReadingSerializer
+from ..snapshots import SNAPSHOT_VERSION
+from .base import SeededDeckMixin, no_shuffle_pool
+
+
+def live_data(reading_id: int, serializer_class) -> dict:
+    reading = Reading.objects.get(pk=reading_id)
+    return json.loads(JSONRenderer().render(serializer_class(reading).data))
+
+
+@no_shuffle_pool
+class ReadingSnapshotTests(SeededDeckMixin, APITestCase):
+    def test_written_at_creation(self):
+        reading = self.create_reading()
+        snapshot = ReadingSnapshot.objects.get(reading_id=reading['id'])
+        self.assertEqual(snapshot.version, SNAPSHOT_VERSION)
+        self.assertEqual(json.loads(snapshot.body), reading)
+        self.assertEqual(json.loads(snapshot.body), live_data(reading['id'], ReadingSerializer))
+        self.assertEqual(
+            json.loads(snapshot.compact_body), live_data(reading['id'], CompactReadingSerializer),
+        )
+
+    def test_served_as_stored(self):
+        reading = self.create_reading()
+        snapshot = ReadingSnapshot.objects.get(reading_id=reading['id'])
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/readings/{reading["id"]}/')
+        self.assertEqual(response.content.decode(), snapshot.body)
+        response = self.client.get(f'/api/readings/{reading["id"]}/', {'format': 'compact'})
+        self.assertEqual(response.content.decode(), snapshot.compact_body)
+
+    def test_outdated_version_is_ignored(self):
+        reading = self.create_reading()
+        ReadingSnapshot.objects.filter(reading_id=reading['id']).update(
+            version=SNAPSHOT_VERSION - 1, body='{}',
+        )
+        self.assertEqual(self.client.get(f'/api/readings/{reading["id"]}/').json(), reading)
+
+    @override_settings(TAROT_READING_SNAPSHOTS=False)
+    def test_disabled(self):
+        reading = self.create_reading()
+        self.assertFalse(ReadingSnapshot.objects.exists())
+        self.assertEqual(self.client.get(f'/api/readings/{reading["id"]}/').json(), reading)
+
+    @override_settings(TAROT_PERSIST_READING_CARDS=False)
+    def test_not_written_for_readings_without_card_rows(self):
+        reading = self.create_reading()
+        self.assertFalse(ReadingCard.objects.exists())
+        self.assertFalse(ReadingSnapshot.objects.exists())
+        # The redraw from the seed gives the same cards
+        self.assertEqual(self.client.get(f'/api/readings/{reading["id"]}/').json(), reading)
+
+    @override_settings(TAROT_PERSIST_READING_CARDS=False)
+    def test_batch_readings_without_card_rows(self):
+        response = self.client.post('/api/readings/batch/', [
+            {'deck_id': self.deck.id, 'spread_id': self.spread.id, 'question': 'Which way?'},
+        ], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(ReadingSnapshot.objects.exists())
+
+    @override_settings(
+        TAROT_INTERPRETATION_QUEUE={'ENABLED': True},
+        TAROT_INTERPRETATION_CACHE={'ENABLED': False},
+    )
+    def test_written_when_the_last_interpretation_finishes(self):
+        reading = self.create_reading()
+        self.assertEqual(reading['interpretation_status'], 'pending')
+        self.assertFalse(ReadingSnapshot.objects.exists())
+        jobs = claim_jobs(limit=10)
+        self.assertEqual(len(jobs), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            run_job(jobs[0], interpret_stub)
+        self.assertFalse(ReadingSnapshot.objects.exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for job in jobs[1:]:
+                run_job(job, interpret_stub)
+        snapshot = ReadingSnapshot.objects.get(reading_id=reading['id'])
+        body = json.loads(snapshot.body)
+        self.assertEqual(body['interpretation_status'], 'done')
+        self.assertEqual(body, live_data(reading['id'], ReadingSerializer))
+
+
+@no_shuffle_pool
+class SnapshotReadingsCommandTests(SeededDeckMixin, APITestCase):
+    def call(self, *args) -> str:
+        stdout = StringIO()
+        call_command('snapshot_readings', *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_backfills_missing_snapshots(self):
+        readings = [self.create_reading(f'Question {i}') for i in range(3)]
+        ReadingSnapshot.objects.all().delete()
+        self.call('--batch-size', '2')
+        self.assertEqual(
+            set(ReadingSnapshot.objects.values_list('reading_id', flat=True)),
+            {reading['id'] for reading in readings},
+        )
+        self.assertIn('All 3 snapshots match.', self.call('--check'))
+
+    def test_check_reports_mismatches(self):
+        reading = self.create_reading()
+        ReadingSnapshot.objects.filter(reading_id=reading['id']).update(body='{}')
+        with self.assertRaisesMessage(CommandError, f'readings {reading["id"]}'):
+            self.call('--check')
+        self.call('--rewrite')
+        self.call('--check')
+
+    @override_settings(TAROT_PERSIST_READING_CARDS=False)
+    def test_skips_readings_without_card_rows(self):
+        self.create_reading()
+        self.call()
+        self.assertFalse(ReadingSnapshot.objects.exists())
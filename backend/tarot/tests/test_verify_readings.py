@@ -0,0 +1,43 @@
+"""
+The verify_readings command.
+
+Usage:
+    docker compose exec backend python manage.py test tarot.tests.test_verify_readings
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+
+from ..models import ReadingCard, ReadingSnapshot
+from .base import SeededDeckMixin, no_shuffle_pool
+
+
+@no_shuffle_pool
+class VerifyReadingsTests(SeededDeckMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.readings = [self.create_reading(f'Question {i}') for i in range(5)]
+
+    def call(self, *args) -> str:
+        stdout = StringIO()
+        call_command('verify_readings', *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_every_batch_is_checked(self):
+        self.assertIn('5 verified, 0 mismatched', self.call('--batch-size', '2'))
+
+    def test_limit_spans_batches(self):
+        self.assertIn('3 verified, 0 mismatched', self.call('--batch-size', '2', '--limit', '3'))
+
+    def test_prune(self):
+        self.call('--batch-size', '2', '--prune')
+        self.assertFalse(ReadingCard.objects.exists())
+        ReadingSnapshot.objects.all().delete()
+        for reading in self.readings:
+            redrawn = self.client.get(f'/api/readings/{reading["id"]}/').json()
+            # Redrawn cards have no row, so no id
+            self.assertEqual([card.pop('id') for card in redrawn['cards']], [None] * 3)
+            for card in reading['cards']:
+                del card['id']
+            self.assertEqual(redrawn, reading)
@@ -1,9 +1,28 @@
 from django.urls import path
-from .views import DeckListView, SpreadListView, ReadingCreateView, ReadingDetailView
+from . import async_views
+from .views import (
+    DeckListView,
+    DeckCardListView,
+    CatalogView,
+    SpreadListView,
+    ReadingCreateView,
+    ReadingBatchCreateView,
+    ReadingDetailView,
+    ShufflePoolStatsView,
+    InterpretationCacheStatsView,
+)
 
 urlpatterns = [
     path('decks/', DeckListView.as_view(), name='deck-list'),
+    path('decks/<int:pk>/cards/', DeckCardListView.as_view(), name='deck-card-list'),
+    path('catalog/', CatalogView.as_view(), name='catalog'),
     path('spreads/', SpreadListView.as_view(), name='spread-list'),
     path('readings/', ReadingCreateView.as_view(), name='reading-create'),
+    path('readings/batch/', ReadingBatchCreateView.as_view(), name='reading-batch-create'),
     path('readings/<int:pk>/', ReadingDetailView.as_view(), name='reading-detail'),
+    path('readings/<int:pk>/stream/', async_views.reading_stream, name='reading-stream'),
+    path('async/readings/', async_views.reading_create, name='reading-create-async'),
+    path('async/readings/<int:pk>/', async_views.reading_detail, name='reading-detail-async'),
+    path('shuffle-pool/', ShufflePoolStatsView.as_view(), name='shuffle-pool-stats'),
+    path('interpretation-cache/', InterpretationCacheStatsView.as_view(), name='interpretation-cache-stats'),
 ]
@@ -1,27 +1,113 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.exceptions import APIException
 from rest_framework.generics import ListAPIView, RetrieveAPIView
 from rest_framework.views import APIView
+from rest_framework.settings import api_settings
 from rest_framework.response import Response
 from rest_framework import status
 
-from .models import Deck, Card, Spread, Reading, ReadingCard
+from .models import Deck, Card, Spread, Reading
+from .renderers import CompactJSONRenderer
 from .serializers import (
     DeckSerializer,
+    CardSerializer,
     SpreadSerializer,
     ReadingSerializer,
+    CompactReadingSerializer,
     ReadingCreateSerializer,
+    ReadingBatchItemSerializer,
+    parse_fields,
 )
-from .shuffle import build_deck, full_shuffle
+from .catalog import catalog_version_tag, get_deck_catalog
+from .catalog_document import IDENTITY, available_encodings, get_catalog_document
+from .fast_serializers import compact_reading_data, deck_data, reading_data, spread_data
+from .http_cache import (
+    IMMUTABLE,
+    NO_CACHE,
+    REVALIDATE,
+    CatalogETagMixin,
+    if_none_match,
+    make_etag,
+    not_modified,
+    preferred_encoding,
+    request_variant,
+    set_cache_headers,
+)
+from .interpretation_cache import get_interpretation_cache
+from .pool import get_shuffle_pool
+from .readings import (
+    create_readings,
+    drawn_cards_for,
+    save_reading,
+    shuffle_for_reading,
+)
+from .shuffle import DeckChangedError
+from .snapshots import SNAPSHOT_VERSION, get_snapshot_body, is_finished
+
 
+class DeckChanged(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "This reading's deck has changed since it was drawn, so its cards can't be redrawn."
+    default_code = 'deck_changed'
 
-class DeckListView(ListAPIView):
+
+class DeckListView(CatalogETagMixin, ListAPIView):
+    etag_name = 'decks'
     queryset = Deck.objects.all()
     serializer_class = DeckSerializer
 
+    def list(self, request, *args, **kwargs):
+        return Response([deck_data(deck) for deck in self.filter_queryset(self.get_queryset())])
+
+
+class DeckCardListView(CatalogETagMixin, ListAPIView):
+    """
+    GET /api/decks/<id>/cards/
+    Every card in the deck, for resolving the card ids in compact readings.
+    """
+    serializer_class = CardSerializer
+
+    def get_etag_name(self):
+        return f'deck-{self.kwargs["pk"]}-cards'
+
+    def get_queryset(self):
+        return Card.objects.filter(deck_id=self.kwargs['pk']).order_by('id')
+
 
-class SpreadListView(ListAPIView):
+class CatalogView(APIView):
+    """
+    GET /api/catalog/
+    Every deck, spread and card in one document, built once per catalog
+    version and held precompressed (see tarot/catalog_document.py). Sent
+    with the best Content-Encoding the client accepts.
+    """
+
+    def get(self, request):
+        encoding = preferred_encoding(request, available_encodings())
+        etag = make_etag('catalog', catalog_version_tag(), encoding)
+        if if_none_match(request, etag):
+            response = not_modified(etag, REVALIDATE)
+        else:
+            document = get_catalog_document()
+            response = HttpResponse(document.bodies[encoding], content_type='application/json')
+            if encoding != IDENTITY:
+                response['Content-Encoding'] = encoding
+            set_cache_headers(response, make_etag('catalog', document.version, encoding), REVALIDATE)
+        # The 304 too: caches key the stored variant on the encoding
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
+
+
+class SpreadListView(CatalogETagMixin, ListAPIView):
+    etag_name = 'spreads'
     queryset = Spread.objects.prefetch_related('positions').all()
     serializer_class = SpreadSerializer
 
+    def list(self, request, *args, **kwargs):
+        return Response([spread_data(spread) for spread in self.filter_queryset(self.get_queryset())])
+
 
 class ReadingCreateView(APIView):
     """
@@ -29,7 +115,15 @@ class ReadingCreateView(APIView):
     Body: { deck_id, spread_id, question }
 
     Shuffles the deck, draws cards for the spread, generates stub
-    interpretations, persists everything, and returns the full reading.
+    interpretations, persists everything in one transaction (the cards in
+    a single bulk insert), and returns the full reading serialized from
+    the objects just built.
+
+    The seed the cards were drawn with is stored on the reading. With
+    TAROT_PERSIST_READING_CARDS off, no ReadingCard rows are written and
+    the detail view redraws the cards from that seed instead. Decks
+    shuffled with the system CSPRNG have no seed, so their cards are
+    always written.
     """
 
     def post(self, request):
@@ -38,73 +132,156 @@ class ReadingCreateView(APIView):
             return Response(create_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
         data = create_serializer.validated_data
-        deck = Deck.objects.get(id=data['deck_id'])
-        spread = Spread.objects.prefetch_related('positions').get(id=data['spread_id'])
+        deck = data['deck']
+        spread = data['spread']
+
+        catalog = get_deck_catalog(deck.id)
+        reading = Reading(deck=deck, spread=spread, question=data['question'])
+        drawn = shuffle_for_reading(reading, catalog, get_shuffle_pool())
+        save_reading(reading, catalog, drawn)
+
+        return Response(reading_data(reading), status=status.HTTP_201_CREATED)
+
+
+class ReadingBatchCreateView(APIView):
+    """
+    POST /api/readings/batch/
+    Body: [{ deck_id, spread_id, question }, ...]
+
+    Creates many readings at once: each distinct deck and spread is looked
+    up once, and the rows are written with bulk inserts in chunked
+    transactions. Returns compact results, in request order:
 
-        # Build and shuffle the deck
-        cards = list(deck.cards.all())
-        shuffled = full_shuffle(build_deck(cards))
+        [{ id, cards: [{ card_id, position_number, is_reversed }, ...] }, ...]
 
-        # Map card_id → Card object for quick lookup
-        card_map = {card.id: card for card in cards}
+    Fetch a reading's detail endpoint for its full cards and interpretations.
+    """
 
-        # Draw one card per spread position
-        positions = list(spread.positions.all())  # already ordered by position_number
-        drawn = shuffled[:spread.num_cards]
+    def post(self, request):
+        batch_serializer = ReadingBatchItemSerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=settings.TAROT_READING_BATCH_MAX,
+        )
+        if not batch_serializer.is_valid():
+            return Response(batch_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        # Persist
-        reading = Reading.objects.create(
-            deck=deck,
-            spread=spread,
-            question=data['question'],
+        readings = create_readings(
+            batch_serializer.validated_data,
+            chunk_size=settings.TAROT_READING_BATCH_CHUNK,
         )
+        results = [
+            {
+                'id': reading.id,
+                'cards': [
+                    {
+                        'card_id': reading_card.card_id,
+                        'position_number': reading_card.position.position_number,
+                        'is_reversed': reading_card.is_reversed,
+                    }
+                    for reading_card in reading.drawn_cards
+                ],
+            }
+            for reading in readings
+        ]
+        return Response(results, status=status.HTTP_201_CREATED)
+
+
+class ShufflePoolStatsView(APIView):
+    """
+    GET /api/shuffle-pool/
+    Hit/miss counters and stock levels for the pre-shuffled deck pool.
+    """
+
+    def get(self, request):
+        pool = get_shuffle_pool()
+        if pool is None:
+            return Response({'enabled': False})
+        return Response({'enabled': True, **pool.stats()})
+
 
-        for position, drawn_card in zip(positions, drawn):
-            card_obj = card_map[drawn_card['card_id']]
-            is_reversed = drawn_card['is_reversed']
-            interpretation = _stub_interpretation(card_obj, position, is_reversed)
-            ReadingCard.objects.create(
-                reading=reading,
-                card=card_obj,
-                position=position,
-                is_reversed=is_reversed,
-                interpretation=interpretation,
-            )
+class InterpretationCacheStatsView(APIView):
+    """
+    GET /api/interpretation-cache/
+    Hit/miss counters for this process's interpretation cache.
+    """
 
-        reading_serializer = ReadingSerializer(reading)
-        return Response(reading_serializer.data, status=status.HTTP_201_CREATED)
+    def get(self, request):
+        cache = get_interpretation_cache()
+        if cache is None:
+            return Response({'enabled': False})
+        return Response({'enabled': True, **cache.stats()})
 
 
 class ReadingDetailView(RetrieveAPIView):
+    """
+    GET /api/readings/<id>/
+    ?format=compact (or Accept: application/vnd.tarot.compact+json) gives
+    cards and positions by id; ?fields=id,cards.card returns only the named
+    fields. Finished readings are served from their snapshot (see
+    tarot/snapshots.py), with an ETag and Cache-Control: immutable (see
+    tarot/http_cache.py).
+    """
     queryset = Reading.objects.prefetch_related(
         'cards__card',
         'cards__position',
     ).select_related('deck', 'spread')
     serializer_class = ReadingSerializer
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, CompactJSONRenderer]
 
+    def is_compact(self) -> bool:
+        return self.request.accepted_renderer.format == CompactJSONRenderer.format
 
-# ---------------------------------------------------------------------------
-# Interpretation stub
-# ---------------------------------------------------------------------------
+    def get_queryset(self):
+        if self.is_compact():
+            # Only ids are rendered, so the cards' rows are all that's needed
+            return Reading.objects.prefetch_related('cards')
+        return super().get_queryset()
 
-def _stub_interpretation(card, position, is_reversed: bool) -> str:
-    """
-    Template-based interpretation stored at reading creation time.
-    Replaced by LLM output in Phase 6.
-    """
-    orientation = 'reversed' if is_reversed else 'upright'
-    keywords = card.keywords_reversed if is_reversed else card.keywords_upright
-    meaning = card.meaning_reversed if is_reversed else card.meaning_upright
-    keyword_str = ', '.join(keywords[:3]) if keywords else ''
-
-    parts = [
-        f"{card.name} appears {orientation} in the {position.name} position "
-        f"— {position.description.lower().rstrip('.')}.",
-    ]
-    if keyword_str:
-        parts.append(f"Key themes: {keyword_str}.")
-    parts.append(meaning)
-    if position.thematic_note:
-        parts.append(position.thematic_note)
-
-    return ' '.join(parts)
+    def get_serializer_class(self):
+        return CompactReadingSerializer if self.is_compact() else ReadingSerializer
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = parse_fields(self.request.query_params.get('fields'))
+        return context
+
+    def get_object(self):
+        reading = super().get_object()
+        try:
+            drawn_cards_for(reading)
+        except DeckChangedError:
+            raise DeckChanged()
+        return reading
+
+    def retrieve(self, request, *args, **kwargs):
+        pk = self.kwargs['pk']
+        etag = make_etag('reading', pk, SNAPSHOT_VERSION, request_variant(request))
+        if if_none_match(request, etag, exists=False):
+            # Only finished readings are given an ETag, and they never change
+            return not_modified(etag, IMMUTABLE)
+
+        fields = request.query_params.get('fields')
+        renderer = request.accepted_renderer
+        if not fields and renderer.get_indent(request.accepted_media_type, {}) is None:
+            # Finished readings are served as stored, in one primary-key lookup
+            body = get_snapshot_body(pk, compact=self.is_compact())
+            if body is not None:
+                if if_none_match(request, etag):
+                    return not_modified(etag, IMMUTABLE)
+                response = HttpResponse(body, content_type=renderer.media_type)
+                return set_cache_headers(response, etag, IMMUTABLE)
+
+        reading = self.get_object()
+        if fields:
+            data = self.get_serializer(reading).data
+        elif self.is_compact():
+            data = compact_reading_data(reading)
+        else:
+            data = reading_data(reading)
+        if is_finished(reading):
+            if if_none_match(request, etag):
+                return not_modified(etag, IMMUTABLE)
+            return set_cache_headers(Response(data), etag, IMMUTABLE)
+        return set_cache_headers(Response(data), None, NO_CACHE)
@@ -7,7 +7,7 @@ interface CardSlotProps {
 }
 
 export default function CardSlot({ readingCard, isFlipped, onFlip }: CardSlotProps) {
-  const { card, position, is_reversed, interpretation } = readingCard
+  const { card, position, is_reversed, interpretation, interpretation_status } = readingCard
   const keywords = is_reversed ? card.keywords_reversed : card.keywords_upright
 
   return (
@@ -89,7 +89,9 @@ export default function CardSlot({ readingCard, isFlipped, onFlip }: CardSlotPro
           isFlipped ? 'opacity-100' : 'opacity-0 pointer-events-none'
         }`}
       >
-        {interpretation}
+        {interpretation_status === 'pending' && 'The cards are still speaking…'}
+        {interpretation_status === 'failed' && 'This interpretation could not be generated.'}
+        {interpretation_status === 'done' && interpretation}
       </div>
 
     </div>
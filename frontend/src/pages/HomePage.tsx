@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react'
 import { useNavigate } from 'react-router-dom'
-import { fetchDecks, fetchSpreads } from '../services/api'
+import { fetchCatalog } from '../services/api'
 import type { Deck, Spread } from '../types/api'
 
 export default function HomePage() {
@@ -14,8 +14,8 @@ export default function HomePage() {
   const [error, setError] = useState('')
 
   useEffect(() => {
-    Promise.all([fetchDecks(), fetchSpreads()])
-      .then(([d, s]) => {
+    fetchCatalog()
+      .then(({ decks: d, spreads: s }) => {
         setDecks(d)
         setSpreads(s)
         if (d.length > 0) setDeckId(d[0].id)
@@ -25,6 +25,15 @@ export default function ReadingPage() {
       })
   }, [id])
 
+  // Interpretations may still be in the background queue — check back
+  useEffect(() => {
+    if (!reading || reading.interpretation_status !== 'pending') return
+    const timer = setTimeout(() => {
+      fetchReading(reading.id).then(setReading).catch(() => {})
+    }, 2000)
+    return () => clearTimeout(timer)
+  }, [reading])
+
   const flipCard = (positionNumber: number) => {
     setFlipped(prev => new Set(prev).add(positionNumber))
   }
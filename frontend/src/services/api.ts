@@ -1,4 +1,4 @@
-import type { Deck, Spread, Reading } from '../types/api'
+import type { Catalog, Deck, Spread, Reading } from '../types/api'
 
 const BASE = '/api'
 
@@ -11,6 +11,10 @@ async function request<T>(path: string, options?: RequestInit): Promise<T> {
   return res.json() as Promise<T>
 }
 
+export function fetchCatalog(): Promise<Catalog> {
+  return request('/catalog/')
+}
+
 export function fetchDecks(): Promise<Deck[]> {
   return request('/decks/')
 }
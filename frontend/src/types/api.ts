@@ -34,12 +34,22 @@ export interface Spread {
   positions: SpreadPosition[]
 }
 
+export interface Catalog {
+  decks: Deck[]
+  spreads: Spread[]
+  // Each deck's cards, keyed by deck id
+  cards: Record<string, Card[]>
+}
+
+export type InterpretationStatus = 'pending' | 'done' | 'failed'
+
 export interface ReadingCard {
   id: number
   card: Card
   position: SpreadPosition
   is_reversed: boolean
   interpretation: string
+  interpretation_status: InterpretationStatus
 }
 
 export interface Reading {
@@ -48,5 +58,6 @@ export interface Reading {
   spread: Spread
   question: string
   created_at: string
+  interpretation_status: InterpretationStatus
   cards: ReadingCard[]
 }